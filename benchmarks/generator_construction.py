@@ -0,0 +1,50 @@
+"""
+Measures the cost of constructing generators.
+
+Construction should be flat: the per-generator cost must not grow with the number of generators built, and must
+not depend on the size of the settings tree. Run from the repository root:
+
+    python benchmarks/generator_construction.py
+"""
+import argparse
+import time
+
+from skyframe.runnables.generators import AudioGenerator, EmbeddingsGenerator, ModerationGenerator, TextGenerator
+
+GENERATORS = [TextGenerator, EmbeddingsGenerator, ModerationGenerator, AudioGenerator]
+
+
+def measure(generator_cls, count: int) -> float:
+    """
+    Returns the mean construction time in microseconds over count constructions.
+    """
+    start = time.perf_counter()
+    for _ in range(count):
+        generator_cls()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=[100, 1_000, 10_000])
+    parser.add_argument('--max-growth', type=float, default=3.0,
+                        help='Fail if the cost at the largest count exceeds the cost at the smallest by this factor.')
+    args = parser.parse_args()
+
+    failed = False
+    for generator_cls in GENERATORS:
+        # The first construction resolves the settings of the class.
+        generator_cls()
+        costs = [measure(generator_cls, count) for count in args.counts]
+        row = '  '.join(f'{count:>6}: {cost:8.1f} us' for count, cost in zip(args.counts, costs))
+        print(f'{generator_cls.__name__:<22} {row}')
+        if costs[-1] > costs[0] * args.max_growth:
+            print(f'  construction cost of {generator_cls.__name__} grows with the number of generators')
+            failed = True
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Measures the cost of importing the framework.
+
+Each statement runs in a fresh interpreter under 'python -X importtime'. The benchmark fails if a statement
+imports a provider SDK or another heavy dependency, or takes longer than the budget. Run from the repository root:
+
+    python benchmarks/import_time.py
+"""
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+STATEMENTS = [
+    'import skyframe',
+    'from skyframe import Message, Conversation',
+    'from skyframe import TextGenerator',
+    'from skyframe import Pipeline',
+]
+
+# Dependencies that must only be imported once a service or feature that needs them is used.
+HEAVY_MODULES = [
+    'openai',
+    'anthropic',
+    'elevenlabs',
+    'aiohttp',
+    'numpy',
+    'torch',
+    'transformers',
+    'tiktoken',
+    'devtools',
+]
+
+
+def measure(statement: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Imports statement in a fresh interpreter.
+
+    :return: The total import time and the cumulative import time of each module, in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True, text=True, check=True
+    )
+
+    cumulative: Dict[str, int] = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        level = len(name) - len(name.lstrip())
+        name = name.strip()
+        cumulative[name] = int(cumulative_us)
+        if level == 1:
+            total += int(cumulative_us)
+    return total, cumulative
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('statements', nargs='*', default=STATEMENTS)
+    parser.add_argument('--budget', type=float, default=1.0,
+                        help='Fail if a statement takes longer than this many seconds to import.')
+    parser.add_argument('--top', type=int, default=5, help='The number of slowest modules to show per statement.')
+    args = parser.parse_args()
+
+    failed = False
+    for statement in args.statements:
+        total, cumulative = measure(statement)
+        print(f'{statement:<45} {total / 1e6:6.3f} s')
+
+        top: List[Tuple[str, int]] = sorted(
+            ((name, us) for name, us in cumulative.items() if name.startswith('skyframe')),
+            key=lambda item: item[1], reverse=True
+        )[:args.top]
+        for name, us in top:
+            print(f'    {name:<60} {us / 1e3:8.1f} ms')
+
+        heavy = [name for name in HEAVY_MODULES if name in cumulative]
+        if heavy:
+            print(f'  imports heavy dependencies: {", ".join(heavy)}')
+            failed = True
+        if total > args.budget * 1e6:
+            print(f'  exceeds the import budget of {args.budget} s')
+            failed = True
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,43 +1,126 @@
-# Agents
-from .runnables.agents import Agent, Tool
-
-# Prompting
-from .prompting import prompt_manager, prompts
-from .prompting.models import Prompt, EvaluablePrompt, PromptMessage
-
-# Models
-from .models import Message, TMessage, MessageChunk, MessageRole, Conversation, ConversationMixin, UIDMixin, CreatedAtMixin, UpdatedAtMixin, TokenUsage
-
-# Runnables
-from .runnables import Runnable, TRunnable
-from .runnables.models import RunnableMetadata, RunnableParams, BaseAsyncCallback, RunInfo, RunContext
-
-# Generators
-from .runnables.generators.text import TextGenerator
-from .runnables.generators.audio import AudioGenerator
-from .runnables.generators.embeddings import EmbeddingsGenerator
-from .runnables.generators.moderation import ModerationGenerator
-from .runnables.generators.speech_to_text import SpeechToTextGenerator
-
-# Pipeline
-from .runnables.pipeline import Pipeline
-
-# Settings
-from .settings import SkyFrameworkSettings, framework_settings
-
-# Utils
-from .utils import (
-    get_duplicates, get_duplicate_counts, has_index,
-    audio_file_to_wav, CustomTempFile, CreateWavFile,
-    find_nonexistent_keys, change_key,
-    get_framework_path, get_framework_data_path, get_project_path_str, get_project_path,
-    get_parent_dir_path, get_file_path, get_file_content, get_data_path_str, get_data_path,
-    weighted_average,
-    StopwatchContext,
-    find_project_root,
-    BaseSkyLogger, FrameworkLogger, logger,
-    add_tab_to_each_line
-)
+from typing import TYPE_CHECKING
+
+from ._lazy import lazy_exports
+
+# Exports are imported on first access (PEP 562), so 'import skyframe' does not load every generator, the
+# prompt files, the settings or the provider SDKs up front.
+_exports = {
+    # Agents
+    'Agent': '.runnables.agents',
+    'Tool': '.runnables.agents',
+
+    # Prompting
+    'prompt_manager': '.prompting',
+    'prompts': '.prompting',
+    'Prompt': '.prompting.models',
+    'EvaluablePrompt': '.prompting.models',
+    'PromptMessage': '.prompting.models',
+
+    # Models
+    'Message': '.models',
+    'TMessage': '.models',
+    'MessageChunk': '.models',
+    'MessageRole': '.models',
+    'Conversation': '.models',
+    'ConversationMixin': '.models',
+    'UIDMixin': '.models',
+    'CreatedAtMixin': '.models',
+    'UpdatedAtMixin': '.models',
+    'TokenUsage': '.models',
+
+    # Runnables
+    'Runnable': '.runnables',
+    'TRunnable': '.runnables',
+    'RunnableMetadata': '.runnables.models',
+    'RunnableParams': '.runnables.models',
+    'BaseAsyncCallback': '.runnables.models',
+    'RunInfo': '.runnables.models',
+    'RunContext': '.runnables.models',
+
+    # Generators
+    'TextGenerator': '.runnables.generators.text',
+    'AudioGenerator': '.runnables.generators.audio',
+    'EmbeddingsGenerator': '.runnables.generators.embeddings',
+    'ModerationGenerator': '.runnables.generators.moderation',
+    'SpeechToTextGenerator': '.runnables.generators.speech_to_text',
+
+    # Pipeline
+    'Pipeline': '.runnables.pipeline',
+
+    # Settings
+    'SkyFrameworkSettings': '.settings',
+    'framework_settings': '.settings',
+
+    # Utils
+    'get_duplicates': '.utils',
+    'get_duplicate_counts': '.utils',
+    'has_index': '.utils',
+    'audio_file_to_wav': '.utils',
+    'CustomTempFile': '.utils',
+    'CreateWavFile': '.utils',
+    'find_nonexistent_keys': '.utils',
+    'change_key': '.utils',
+    'get_framework_path': '.utils',
+    'get_framework_data_path': '.utils',
+    'get_project_path_str': '.utils',
+    'get_project_path': '.utils',
+    'get_parent_dir_path': '.utils',
+    'get_file_path': '.utils',
+    'get_file_content': '.utils',
+    'get_data_path_str': '.utils',
+    'get_data_path': '.utils',
+    'weighted_average': '.utils',
+    'StopwatchContext': '.utils',
+    'find_project_root': '.utils',
+    'BaseSkyLogger': '.utils',
+    'FrameworkLogger': '.utils',
+    'logger': '.utils',
+    'add_tab_to_each_line': '.utils',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
+
+if TYPE_CHECKING:
+    # Agents
+    from .runnables.agents import Agent, Tool
+
+    # Prompting
+    from .prompting import prompt_manager, prompts
+    from .prompting.models import Prompt, EvaluablePrompt, PromptMessage
+
+    # Models
+    from .models import Message, TMessage, MessageChunk, MessageRole, Conversation, ConversationMixin, UIDMixin, CreatedAtMixin, UpdatedAtMixin, TokenUsage
+
+    # Runnables
+    from .runnables import Runnable, TRunnable
+    from .runnables.models import RunnableMetadata, RunnableParams, BaseAsyncCallback, RunInfo, RunContext
+
+    # Generators
+    from .runnables.generators.text import TextGenerator
+    from .runnables.generators.audio import AudioGenerator
+    from .runnables.generators.embeddings import EmbeddingsGenerator
+    from .runnables.generators.moderation import ModerationGenerator
+    from .runnables.generators.speech_to_text import SpeechToTextGenerator
+
+    # Pipeline
+    from .runnables.pipeline import Pipeline
+
+    # Settings
+    from .settings import SkyFrameworkSettings, framework_settings
+
+    # Utils
+    from .utils import (
+        get_duplicates, get_duplicate_counts, has_index,
+        audio_file_to_wav, CustomTempFile, CreateWavFile,
+        find_nonexistent_keys, change_key,
+        get_framework_path, get_framework_data_path, get_project_path_str, get_project_path,
+        get_parent_dir_path, get_file_path, get_file_content, get_data_path_str, get_data_path,
+        weighted_average,
+        StopwatchContext,
+        find_project_root,
+        BaseSkyLogger, FrameworkLogger, logger,
+        add_tab_to_each_line
+    )
 
 __all__ = [
     # Agents
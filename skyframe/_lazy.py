@@ -0,0 +1,27 @@
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Returns the module __getattr__ and __dir__ (PEP 562) of a package whose exports are imported on first access.
+
+    :param package: The __name__ of the package.
+    :param exports: Maps each exported name to the module it is defined in, relative to the package.
+    :return: The __getattr__ and __dir__ functions to assign in the package.
+    """
+    module = importlib.import_module(package)
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        value = getattr(importlib.import_module(module_name, package), name)
+        # Cache the value on the package so __getattr__ only runs on first access.
+        setattr(module, name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted({*vars(module), *exports})
+
+    return __getattr__, __dir__
@@ -3,6 +3,7 @@ from typing import List, Any, Dict, Optional, Union
 from pydantic import Field, model_validator
 
 from skyframe.models import TokenUsage
+from skyframe.runnables.tracing import trace_span
 from skyframe.utils import StopwatchContext
 from skyframe.utils import change_key
 from .assertions import *
@@ -66,24 +67,26 @@ class EvalTest(BaseResolvable[InputResult, TestResult]):
         elif input.latency_ms is not None:
             input_latency_ms += input.latency_ms
 
-        async with StopwatchContext() as sw:
-            for assertion in assertions:
-                assertion_result = await assertion.resolve_async(input)
-                assertion_results.append(assertion_result)
+        with trace_span('eval_test', **{'skyframe.evaluation.test': self.name}):
+            async with StopwatchContext() as sw:
+                for assertion in assertions:
+                    with trace_span('eval_assertion', **{'skyframe.evaluation.assertion': assertion.type}):
+                        assertion_result = await assertion.resolve_async(input)
+                    assertion_results.append(assertion_result)
 
-                total_weight += assertion.weight
-                total_score += assertion_result.score * assertion.weight
+                    total_weight += assertion.weight
+                    total_score += assertion_result.score * assertion.weight
 
-                if assertion.metric is not None:
-                    named_scores.setdefault(assertion.metric, 0)
-                    named_scores[assertion.metric] += assertion_result.score
+                    if assertion.metric is not None:
+                        named_scores.setdefault(assertion.metric, 0)
+                        named_scores[assertion.metric] += assertion_result.score
 
-                if assertion_result.token_usage is not None:
-                    token_usage += assertion_result.token_usage
+                    if assertion_result.token_usage is not None:
+                        token_usage += assertion_result.token_usage
 
-                if not assertion_result.passed:
-                    all_pass = False
-                    failed_reason = assertion_result.reason
+                    if not assertion_result.passed:
+                        all_pass = False
+                        failed_reason = assertion_result.reason
 
         final_score = (total_score / total_weight) if total_weight > 0 else 0
         final_reason = "All assertions passed" if all_pass else failed_reason
@@ -3,6 +3,7 @@ from typing import Optional, List, Dict, Any, Tuple
 
 from pydantic import Field, model_validator
 
+from skyframe.runnables.tracing import trace_span
 from skyframe.utils import change_key, StopwatchContext
 from .assertions import BaseAssertion
 from .base_resolvable import BaseResolvable
@@ -62,8 +63,9 @@ class Evaluation(BaseResolvable[asyncio.Semaphore, EvaluationResult]):
 
         tasks = [process_test(test_index, test) for test_index, test in enumerate(self.tests)]
 
-        async with StopwatchContext() as sw:
-            await asyncio.gather(*tasks)
+        with trace_span('evaluation', **{'skyframe.evaluation.name': self.name}):
+            async with StopwatchContext() as sw:
+                await asyncio.gather(*tasks)
 
         for summary in test_summaries:
             combined = GradedResult.combine(*summary.test_results)
@@ -1,3 +1,4 @@
 from .base import FrameworkException
 from .conversion import ConversionException
 from .generation import GenerationException
+from .pipeline import PipelineException
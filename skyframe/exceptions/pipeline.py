@@ -0,0 +1,21 @@
+from typing import Optional
+
+from .base import FrameworkException
+
+
+class PipelineException(FrameworkException):
+    message: str
+    node_name: Optional[str] = None
+    inner_exception: Optional[Exception] = None
+
+    def __init__(
+            self,
+            *,
+            message: str,
+            node_name: Optional[str] = None,
+            inner_exception: Optional[Exception] = None,
+    ):
+        self.message = message
+        self.node_name = node_name
+        self.inner_exception = inner_exception
+        super().__init__(message)
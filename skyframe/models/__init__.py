@@ -2,6 +2,7 @@ from .message import Message, TMessage, MessageChunk, MessageRole
 from .conversation import Conversation, ConversationMixin
 from .base import UIDMixin, CreatedAtMixin, UpdatedAtMixin
 from .token_usage import TokenUsage
+from .stream_timings import StreamTimings, StreamTimer
 
 __all__ = [
     "Message",
@@ -13,5 +14,7 @@ __all__ = [
     "UIDMixin",
     "CreatedAtMixin",
     "UpdatedAtMixin",
-    "TokenUsage"
+    "TokenUsage",
+    "StreamTimings",
+    "StreamTimer",
 ]
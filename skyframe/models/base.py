@@ -1,9 +1,9 @@
 from abc import ABC
 from datetime import datetime
-from typing import Any, List, TypeVar
+from typing import Any, Dict, List, Optional, TypeVar
 from uuid import uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class UIDMixin(BaseModel):
@@ -28,6 +28,49 @@ class BaseParams(BaseModel, ABC):
 
     _TParams = TypeVar('_TParams', bound='BaseParams')
 
+    _dict: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    """ The cached result of to_dict. Cleared whenever a param is set or a copy is made with updated values. """
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith('_'):
+            self._dict = None
+
+    def model_copy(self: _TParams, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> _TParams:
+        # model_copy writes the updated values to __dict__ directly, so the cached dict has to be dropped here.
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            copied._dict = None
+        return copied
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the params that are not None as a dict, like model_dump(exclude_none=True).
+
+        The dict is built once and reused until a param is set, and copies made by merge start from it, so
+        converting the same params for every request is cheap. The dict is shared and must not be modified.
+        """
+        if self._dict is None:
+            self._dict = self.model_dump(exclude_none=True)
+        return self._dict
+
+    def get_overrides(self) -> Dict[str, Any]:
+        """
+        Returns the params that were explicitly set to a value other than their default or None.
+        These are the values merge applies on top of other params.
+        """
+        overrides = {}
+        for name in self.model_fields_set:
+            value = getattr(self, name)
+            if value is not None and value != self.model_fields[name].get_default(call_default_factory=True):
+                overrides[name] = value
+        return overrides
+
+    def _merge_dict(self, merged: 'BaseParams', overrides: Dict[str, Any]) -> None:
+        # Apply the overrides as a delta to the cached dict instead of dumping the merged params again.
+        if self._dict is not None:
+            merged._dict = {**self._dict, **merged.model_dump(include=set(overrides), exclude_none=True)}
+
     def try_set(self, **kwargs: Any) -> List[str]:  # Returns a list of used keys
         used: List[str] = []
 
@@ -52,10 +95,9 @@ class BaseParams(BaseModel, ABC):
         if other is None:
             return new_model
 
-        for k, v in other.model_dump(exclude_unset=True, exclude_defaults=True, exclude_none=True).items():
-            if k == 'stop':
-                new_model.add_stop(v)
-            else:
-                setattr(new_model, k, v)
+        overrides = other.get_overrides()
+        for k, v in overrides.items():
+            setattr(new_model, k, v)
 
+        self._merge_dict(new_model, overrides)
         return new_model
@@ -53,7 +53,8 @@ class Message(UIDMixin, CreatedAtMixin):
     @computed_field
     @property
     def content(self) -> str:
-        return self._content
+        # Private attributes are resolved through BaseModel.__getattr__, which is slow on this hot path.
+        return self.__pydantic_private__['_content']
 
     @content.setter
     def content(self, value: str) -> None:
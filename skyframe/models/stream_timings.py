@@ -0,0 +1,124 @@
+import time
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+# Upper bounds (in milliseconds) of the inter-chunk gap histogram buckets.
+GAP_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+def _empty_histogram() -> Dict[str, int]:
+    histogram = {str(bound): 0 for bound in GAP_BUCKETS_MS}
+    histogram['+Inf'] = 0
+    return histogram
+
+
+class StreamTimings(BaseModel):
+    """
+    Timing information of a streamed generation. All durations are in seconds, measured from when the request
+    was sent to the service.
+    """
+
+    request_sent_at: float
+    """ The Unix timestamp of when the request was sent to the service. """
+
+    time_to_first_chunk: Optional[float] = Field(default=None)
+    """ Seconds until the first chunk of any kind arrived (time to first byte). """
+
+    time_to_first_token: Optional[float] = Field(default=None)
+    """ Seconds until the first chunk with content (text or audio) arrived. """
+
+    total_time: Optional[float] = Field(default=None)
+    """ Seconds until the stream ended. """
+
+    chunk_count: int = Field(default=0)
+    """ The number of chunks received. """
+
+    content_chunk_count: int = Field(default=0)
+    """ The number of chunks that had content. """
+
+    max_inter_chunk_gap: Optional[float] = Field(default=None)
+    """ The longest pause between two consecutive chunks. """
+
+    mean_inter_chunk_gap: Optional[float] = Field(default=None)
+    """ The average pause between two consecutive chunks. """
+
+    inter_chunk_gap_histogram: Dict[str, int] = Field(default_factory=_empty_histogram)
+    """ Counts of the pauses between consecutive chunks, keyed by bucket upper bound in milliseconds. """
+
+    completion_tokens: Optional[int] = Field(default=None)
+    """ The number of generated tokens, if the service reported usage. """
+
+    tokens_per_second: Optional[float] = Field(default=None)
+    """ Generated tokens per second after the first token. Falls back to content chunks per second if the
+    service did not report usage. """
+
+
+class StreamTimer:
+    """
+    Records StreamTimings while a stream is consumed. Create it right before the request is sent, call chunk for
+    every chunk and finish once the stream ends.
+    """
+
+    def __init__(self):
+        self._request_sent_at = time.time()
+        self._start = time.perf_counter()
+        self._first_chunk: Optional[float] = None
+        self._first_token: Optional[float] = None
+        self._last_chunk: Optional[float] = None
+        self._gap_total = 0.0
+        self._gap_max: Optional[float] = None
+        self._gap_count = 0
+        self._histogram = _empty_histogram()
+        self._chunk_count = 0
+        self._content_chunk_count = 0
+
+    def chunk(self, has_content: bool) -> None:
+        now = time.perf_counter()
+        self._chunk_count += 1
+        if self._first_chunk is None:
+            self._first_chunk = now
+        if has_content:
+            self._content_chunk_count += 1
+            if self._first_token is None:
+                self._first_token = now
+
+        if self._last_chunk is not None:
+            gap = now - self._last_chunk
+            self._gap_total += gap
+            self._gap_count += 1
+            self._gap_max = gap if self._gap_max is None else max(self._gap_max, gap)
+            self._histogram[self._get_bucket(gap)] += 1
+        self._last_chunk = now
+
+    @staticmethod
+    def _get_bucket(gap: float) -> str:
+        gap_ms = gap * 1000
+        for bound in GAP_BUCKETS_MS:
+            if gap_ms <= bound:
+                return str(bound)
+        return '+Inf'
+
+    def finish(self, completion_tokens: Optional[int] = None) -> StreamTimings:
+        end = time.perf_counter()
+
+        tokens_per_second = None
+        if self._first_token is not None:
+            generation_time = end - self._first_token
+            count = completion_tokens if completion_tokens is not None else self._content_chunk_count
+            if generation_time > 0:
+                tokens_per_second = count / generation_time
+
+        return StreamTimings(
+            request_sent_at=self._request_sent_at,
+            time_to_first_chunk=self._first_chunk - self._start if self._first_chunk is not None else None,
+            time_to_first_token=self._first_token - self._start if self._first_token is not None else None,
+            total_time=end - self._start,
+            chunk_count=self._chunk_count,
+            content_chunk_count=self._content_chunk_count,
+            max_inter_chunk_gap=self._gap_max,
+            mean_inter_chunk_gap=self._gap_total / self._gap_count if self._gap_count else None,
+            inter_chunk_gap_histogram=dict(self._histogram),
+            completion_tokens=completion_tokens,
+            tokens_per_second=tokens_per_second,
+        )
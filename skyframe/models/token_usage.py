@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -8,6 +8,11 @@ class TokenUsage(BaseModel):
     prompt: int = Field(default=0, ge=0)
     completion: int = Field(default=0, ge=0)
 
+    cache_read: int = Field(default=0, ge=0)
+    """ Prompt tokens that were read from the provider's prompt cache. Included in prompt. """
+    cache_write: int = Field(default=0, ge=0)
+    """ Prompt tokens that were written to the provider's prompt cache. Included in prompt. """
+
     total_cost: float = Field(default=0, ge=0)
     prompt_cost: float = Field(default=0, ge=0)
     completion_cost: float = Field(default=0, ge=0)
@@ -17,6 +22,8 @@ class TokenUsage(BaseModel):
             total=self.total + other.total,
             prompt=self.prompt + other.prompt,
             completion=self.completion + other.completion,
+            cache_read=self.cache_read + other.cache_read,
+            cache_write=self.cache_write + other.cache_write,
 
             total_cost=self.total_cost + other.total_cost,
             prompt_cost=self.prompt_cost + other.prompt_cost,
@@ -27,6 +34,8 @@ class TokenUsage(BaseModel):
         self.total += other.total
         self.prompt += other.prompt
         self.completion += other.completion
+        self.cache_read += other.cache_read
+        self.cache_write += other.cache_write
 
         self.total_cost += other.total_cost
         self.prompt_cost += other.prompt_cost
@@ -43,7 +52,21 @@ class TokenUsage(BaseModel):
             usage += u
         return usage
 
-    def calculate_cost(self, cost_per_input_token: float, cost_per_output_token: float):
-        self.prompt_cost = self.prompt * cost_per_input_token
+    def calculate_cost(
+            self,
+            cost_per_input_token: float,
+            cost_per_output_token: float,
+            cost_per_cache_read_token: Optional[float] = None,
+            cost_per_cache_write_token: Optional[float] = None,
+    ):
+        if cost_per_cache_read_token is None:
+            cost_per_cache_read_token = cost_per_input_token
+        if cost_per_cache_write_token is None:
+            cost_per_cache_write_token = cost_per_input_token
+
+        uncached = self.prompt - self.cache_read - self.cache_write
+        self.prompt_cost = uncached * cost_per_input_token \
+            + self.cache_read * cost_per_cache_read_token \
+            + self.cache_write * cost_per_cache_write_token
         self.completion_cost = self.completion * cost_per_output_token
         self.total_cost = self.prompt_cost + self.completion_cost
@@ -1,6 +1,17 @@
-from .manager import prompt_manager, prompts
+from . import manager
+from .manager import get_prompt_manager, get_prompts
+
+
+def __getattr__(name: str):
+    # Created on first access, see manager.__getattr__.
+    if name in ('prompt_manager', 'prompts'):
+        return getattr(manager, name)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
 
 __all__ = [
     "prompt_manager",
-    "prompts"
+    "prompts",
+    "get_prompt_manager",
+    "get_prompts",
 ]
@@ -1,8 +1,6 @@
 import glob
 from pathlib import Path
-from typing import Dict, List, Tuple
-
-import yaml
+from typing import Any, Dict, List, Optional, Tuple
 
 from skyframe.utils import logger
 from .models import PromptStructure, EvaluablePrompt
@@ -106,6 +104,7 @@ class PromptManager:
     @staticmethod
     def _load_yaml_file(file_path: str):
         """Loads a YAML file."""
+        import yaml
         with open(file_path, 'r') as file:
             return yaml.safe_load(file)
 
@@ -176,13 +175,39 @@ class PromptManager:
         return result
 
 
-try:
-    prompt_manager = PromptManager()
-    prompts = PromptStructure.model_validate(prompt_manager.prompt_dict, from_attributes=True)
-    f = 'a'
-except Exception as e:
-    logger.error(f"Error loading prompt manager: {e}")
-    raise e
+_prompt_manager: Optional[PromptManager] = None
+_prompts: Optional[PromptStructure] = None
+
+
+def get_prompt_manager() -> PromptManager:
+    """
+    Returns the prompt manager, loading the prompt files on first use.
+    """
+    global _prompt_manager, _prompts
+    if _prompt_manager is None:
+        try:
+            prompt_manager = PromptManager()
+            _prompts = PromptStructure.model_validate(prompt_manager.prompt_dict, from_attributes=True)
+            _prompt_manager = prompt_manager
+        except Exception as e:
+            logger.error(f"Error loading prompt manager: {e}")
+            raise e
+    return _prompt_manager
+
+
+def get_prompts() -> PromptStructure:
+    get_prompt_manager()
+    return _prompts
+
+
+def __getattr__(name: str) -> Any:
+    # prompt_manager and prompts are created on first access (PEP 562), so importing the package does not
+    # read every prompt file.
+    if name == 'prompt_manager':
+        return get_prompt_manager()
+    if name == 'prompts':
+        return get_prompts()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 # loggers.evaluation.info(pprint.pformat(prompt_manager._prompt_dict, indent=4))
 
 
@@ -1,8 +1,43 @@
-from .agents import Agent, Tool, ConversationMemory, ConversationSummaryMemory, AgentParams
-from .base import Runnable, TRunnable
-from .generators import AudioGenerator, ModerationGenerator, SpeechToTextGenerator, TextGenerator, EmbeddingsGenerator
-from .models import RunnableMetadata, RunnableParams, BaseAsyncCallback, RunInfo, RunContext
-from .pipeline import Pipeline
+from typing import TYPE_CHECKING
+
+from skyframe._lazy import lazy_exports
+
+# Imported on first access (PEP 562), so using one generator does not import the agents, the pipeline or the
+# other generators and their provider SDKs.
+_exports = {
+    'Agent': '.agents',
+    'Tool': '.agents',
+    'ConversationMemory': '.agents',
+    'ConversationSummaryMemory': '.agents',
+    'AgentParams': '.agents',
+    'Runnable': '.base',
+    'TRunnable': '.base',
+    'AudioGenerator': '.generators',
+    'ModerationGenerator': '.generators',
+    'SpeechToTextGenerator': '.generators',
+    'TextGenerator': '.generators',
+    'EmbeddingsGenerator': '.generators',
+    'RunnableMetadata': '.models',
+    'RunnableParams': '.models',
+    'BaseAsyncCallback': '.models',
+    'RunInfo': '.models',
+    'RunContext': '.models',
+    'Pipeline': '.pipeline',
+    'TracingCallback': '.tracing',
+    'trace_span': '.tracing',
+    'get_tracer': '.tracing',
+    'set_tracer': '.tracing',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
+
+if TYPE_CHECKING:
+    from .agents import Agent, Tool, ConversationMemory, ConversationSummaryMemory, AgentParams
+    from .base import Runnable, TRunnable
+    from .generators import AudioGenerator, ModerationGenerator, SpeechToTextGenerator, TextGenerator, EmbeddingsGenerator
+    from .models import RunnableMetadata, RunnableParams, BaseAsyncCallback, RunInfo, RunContext
+    from .pipeline import Pipeline
+    from .tracing import TracingCallback, trace_span, get_tracer, set_tracer
 
 __all__ = [
     "Agent",
@@ -22,5 +57,9 @@ __all__ = [
     "BaseAsyncCallback",
     "RunInfo",
     "RunContext",
-    "Pipeline"
+    "Pipeline",
+    "TracingCallback",
+    "trace_span",
+    "get_tracer",
+    "set_tracer",
 ]
@@ -2,7 +2,6 @@ import asyncio
 from typing import Optional, Callable, AsyncIterator, AsyncGenerator, Any, Generator, List
 from uuid import UUID, uuid4
 
-from devtools import debug
 from pydantic import Field, ConfigDict, model_validator, PrivateAttr
 
 from skyframe.models.message import Message, MessageChunk
@@ -16,6 +15,7 @@ from ..generators.audio.models import MessageAudio, MessageAudioChunk
 from ..generators.text import TextGenerator
 from ..generators.text.models import TextGenerationRequest, TextResponse, TextGenerationParams
 from skyframe.runnables.models.run_info import RunContext
+from skyframe.runnables.tracing import run_scope
 
 
 # @evaluatable
@@ -90,6 +90,7 @@ class Agent(Runnable):
         yield -1
 
     # @evaluate_async(eval_func_name='_eval_run')
+    @run_scope
     async def run_async(
             self,
             request: Optional[TextGenerationRequest] = None,
@@ -107,12 +108,14 @@ class Agent(Runnable):
             buffer = self.memory.load()
 
             if self.runnable_params.verbose:
+                from devtools import debug
                 debug(self, request=request)
 
             text_response: TextResponse = await self.text_generator.run_async(buffer)
             message = Message.from_ai(content=text_response.content)
 
             if self.runnable_params.verbose:
+                from devtools import debug
                 debug(message)
 
             if audio_callback:
@@ -138,6 +141,7 @@ class Agent(Runnable):
         return message
 
     # @evaluate_async('_eval_run')
+    @run_scope
     async def run_async_stream(
             self,
             request: Optional[TextGenerationRequest] = None,
@@ -157,6 +161,7 @@ class Agent(Runnable):
             buffer = self.memory.load()
 
             if self.runnable_params.verbose:
+                from devtools import debug
                 debug(self, request=request)
 
             text_gen = self.text_generator.run_stream(buffer)
@@ -244,6 +249,7 @@ class Agent(Runnable):
                 break
             yield text_content
 
+    @run_scope
     async def _eval_run(self, *args, **kwargs):
         run_ctx = self._begin_run(parent_run_id=kwargs.get('run_id', None), eval_run=True)
 
@@ -8,6 +8,7 @@ from skyframe.utils import logger
 from ..memory import ConversationMemory
 from ...generators.text import TextGenerator
 from ...generators.text.models import TextGenerationRequest
+from ...tracing import trace_span
 from skyframe.prompting.models import Prompt
 from skyframe.models import Message, MessageRole
 
@@ -115,7 +116,8 @@ class ConversationSummaryMemory(ConversationMemory):
                         break
                 buffer_tokens = self.get_token_count()
 
-            self.moving_summary_buffer = self.predict_new_summary(pruned_messages, self.moving_summary_buffer)
+            with trace_span('memory_summarization', **{'skyframe.memory.pruned_messages': len(pruned_messages)}):
+                self.moving_summary_buffer = self.predict_new_summary(pruned_messages, self.moving_summary_buffer)
             insert_index = 1 if self[0].is_from(MessageRole.system) else 0
             self.insert(insert_index, Message.from_summary(self.moving_summary_buffer))
             buffer_tokens = self.get_token_count()
@@ -1,19 +1,26 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional, TypeVar
+from typing import Any, ClassVar, List, Optional, TypeVar
 from uuid import uuid4, UUID
 
 from pydantic import BaseModel, Field
 from typing_extensions import Unpack
 
-from skyframe.utils import logger
+from .bulk import BulkInputs, BulkRun
+from .callback_queue import get_callback_queue
+from .models.callback import run_callback_hooks
 from .models.params import RunnableParams
 from .models.run_info import RunInfo, RunContext
+from .tracing import current_run_id, get_tracer
 
 
 class Runnable(BaseModel, ABC):
     process_id: Optional[str] = Field(default=None)
     runnable_params: RunnableParams = Field(default_factory=RunnableParams)
 
+    accepts_stream_input: ClassVar[bool] = False
+    """ Whether run_stream accepts an async iterator as its request. Pipeline stages pass such runnables the
+    output of the stage before them as a stream, and wait for the whole value for any other runnable. """
 
     def try_set(self, **data: Any) -> List[str]:
         return self.runnable_params.try_set(**data)
@@ -37,19 +44,65 @@ class Runnable(BaseModel, ABC):
     def run(self, **kwargs: Any) -> Any:
         pass
 
+    def map_async(
+            self,
+            inputs: BulkInputs,
+            *,
+            concurrency: int = 8,
+            ordered: bool = False,
+            max_retries: int = 0,
+            retry_backoff: float = 0.5,
+    ) -> BulkRun:
+        """
+        Runs the runnable for every input, with at most concurrency runs in flight.
+        Dict inputs are passed to run_async as keyword arguments, anything else as the first argument.
+
+        :param inputs: An iterable or async iterable of inputs, e.g. an async generator reading a JSONL file.
+        :param concurrency: The maximum number of runs in flight.
+        :param ordered: Whether results are yielded in input order instead of as they finish.
+        :param max_retries: The number of times a failed input is retried.
+        :param retry_backoff: Seconds before the first retry, doubled for every retry after it.
+        :return: An async iterable of a BulkItemResult per input. Its stats are set once iteration has finished.
+        """
+        async def call(item: Any) -> Any:
+            if isinstance(item, dict):
+                return await self.run_async(**item)
+            return await self.run_async(item)
+
+        return BulkRun(
+            call,
+            inputs,
+            concurrency=concurrency,
+            ordered=ordered,
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+            name=f'{type(self).__name__}.map_async',
+        )
+
     def _begin_run(
             self,
             *,
             run_id: UUID = None,
             parent_run_id: UUID = None,
+            nested: bool = True,
             **kwargs
     ) -> RunContext:
+        """
+        Creates the context of a new run. Call it from a method decorated with run_scope.
+
+        :param nested: Whether runs started while this run executes are nested under it. False for runs that are
+            started side by side, e.g. the runs of a batch.
+        """
+        # Runs started inside another run are nested under it without threading parent_run_id by hand.
         run_info = RunInfo(
             process_id=self.process_id,
             run_id=run_id or uuid4(),
-            parent_run_id=parent_run_id or None,
+            parent_run_id=parent_run_id or current_run_id.get(),
             runnable_params=self.runnable_params,
         )
+        if nested:
+            # run_scope resets this once the run method returns or raises.
+            current_run_id.set(run_info.run_id)
         run_ctx: RunContext = {
             'info': run_info,
             **kwargs
@@ -57,23 +110,28 @@ class Runnable(BaseModel, ABC):
         return run_ctx
 
     async def _invoke_callback_async(self, name: str, **kwargs: Unpack[RunContext]) -> None:
-        try:
-            if self.runnable_params.callbacks:
-                for callback in self.runnable_params.callbacks:
-                    func = getattr(callback, name, None)
-                    if not func or not callable(func) or not hasattr(callback, name):
-                        logger.error(f"Callback {callback} does not have method {name}")
-                        continue
-
-                    await func(**kwargs)
-                    if 'start' in name:
-                        await callback.on_any_start(callback_name=name, **kwargs)
-                    elif 'error' in name:
-                        await callback.on_any_error(callback_name=name, **kwargs)
-                    elif 'end' in name:
-                        await callback.on_any_end(callback_name=name, **kwargs)
-        except Exception as e:
-            logger.exception(f"Error invoking callback {name}: {e}")
+        callbacks = self.runnable_params.callbacks
+        tracer = get_tracer()
+        if tracer is not None:
+            callbacks = [tracer, *callbacks] if callbacks else [tracer]
+        if not callbacks:
+            return
+
+        calls = []
+        for callback in callbacks:
+            hooks = callback.get_hooks(name)
+            if not hooks:
+                continue
+            if callback.delivery == 'background':
+                calls.append(get_callback_queue(callback).put(name, hooks, kwargs))
+            else:
+                calls.append(run_callback_hooks(callback, hooks, name, kwargs))
+
+        # Different callbacks are independent, so they are awaited concurrently.
+        if len(calls) == 1:
+            await calls[0]
+        elif calls:
+            await asyncio.gather(*calls)
 
 
 TRunnable = TypeVar("TRunnable", bound=Runnable)
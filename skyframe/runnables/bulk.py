@@ -0,0 +1,161 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Iterable, List, Optional, Set, Union
+
+from skyframe.utils import logger
+from .models.bulk import BulkItemResult, BulkStats
+
+BulkInputs = Union[Iterable[Any], AsyncIterable[Any]]
+
+
+async def _iterate(inputs: BulkInputs) -> AsyncIterator[Any]:
+    if hasattr(inputs, '__aiter__'):
+        async for item in inputs:
+            yield item
+    else:
+        for item in inputs:
+            yield item
+
+
+def _percentile(latencies: List[float], percentile: float) -> float:
+    return latencies[min(int(len(latencies) * percentile), len(latencies) - 1)]
+
+
+class BulkRun:
+    """
+    Calls a function for every input with a bounded number of calls in flight, and yields the results as they
+    finish. Inputs are read lazily, so an async generator over a large file is never loaded at once.
+
+    Iterate the run to get a BulkItemResult per input. Failed inputs are retried and, if every attempt fails,
+    yielded with their error instead of raising. Once iteration has finished, stats holds the throughput and
+    latency percentiles of the run. Stopping iteration early cancels the calls in flight.
+
+    :param call: Called with one input.
+    :param inputs: An iterable or async iterable of inputs.
+    :param concurrency: The maximum number of inputs in flight.
+    :param ordered: Whether results are yielded in input order. Results that finish early are held back, but
+        still count towards concurrency, so memory stays bounded.
+    :param max_retries: The number of times a failed input is retried.
+    :param retry_backoff: Seconds before the first retry, doubled for every retry after it.
+    :param name: Identifies the run in the log.
+    """
+
+    def __init__(
+            self,
+            call: Callable[[Any], Awaitable[Any]],
+            inputs: BulkInputs,
+            *,
+            concurrency: int = 8,
+            ordered: bool = False,
+            max_retries: int = 0,
+            retry_backoff: float = 0.5,
+            name: str = 'bulk run',
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.call = call
+        self.inputs = inputs
+        self.concurrency = concurrency
+        self.ordered = ordered
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.name = name
+        self.stats: Optional[BulkStats] = None
+        self._latencies: List[float] = []
+
+    async def _run_item(self, index: int, item: Any) -> BulkItemResult:
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                output = await self.call(item)
+                return BulkItemResult(index=index, input=item, output=output, attempts=attempt,
+                                      latency=time.perf_counter() - start)
+            except Exception as e:
+                if attempt > self.max_retries:
+                    logger.warning(f"{self.name}: input {index} failed after {attempt} attempts: {type(e).__name__}: {e}")
+                    return BulkItemResult(index=index, input=item, error=e, attempts=attempt,
+                                          latency=time.perf_counter() - start)
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+
+    def _record(self, result: BulkItemResult, stats: BulkStats) -> BulkItemResult:
+        stats.count += 1
+        stats.retries += result.attempts - 1
+        if result.ok:
+            stats.succeeded += 1
+        else:
+            stats.failed += 1
+        self._latencies.append(result.latency)
+        return result
+
+    def _finish(self, stats: BulkStats, start: float) -> None:
+        stats.total_time = time.perf_counter() - start
+        stats.throughput = stats.count / stats.total_time if stats.total_time > 0 else 0
+        if self._latencies:
+            latencies = sorted(self._latencies)
+            stats.latency_mean = sum(latencies) / len(latencies)
+            stats.latency_p50 = _percentile(latencies, 0.5)
+            stats.latency_p90 = _percentile(latencies, 0.9)
+            stats.latency_p99 = _percentile(latencies, 0.99)
+            stats.latency_max = latencies[-1]
+        self.stats = stats
+        logger.info(f"{self.name}: {stats}")
+
+    async def __aiter__(self) -> AsyncIterator[BulkItemResult]:
+        stats = BulkStats()
+        self._latencies = []
+        start = time.perf_counter()
+        inputs = _iterate(self.inputs)
+        index = 0
+        exhausted = False
+        # In ordered mode the window is in input order; otherwise it is the set of running tasks.
+        window: Deque[asyncio.Task] = deque()
+        running: Set[asyncio.Task] = set()
+
+        async def fill() -> None:
+            nonlocal index, exhausted
+            while not exhausted and len(window) + len(running) < self.concurrency:
+                try:
+                    item = await inputs.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    return
+                task = asyncio.ensure_future(self._run_item(index, item))
+                index += 1
+                if self.ordered:
+                    window.append(task)
+                else:
+                    running.add(task)
+
+        try:
+            await fill()
+            while window or running:
+                if self.ordered:
+                    result = await window[0]
+                    window.popleft()
+                    await fill()
+                    yield self._record(result, stats)
+                    continue
+
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                await fill()
+                for task in sorted(done, key=lambda t: t.result().index):
+                    yield self._record(task.result(), stats)
+        finally:
+            pending = [*window, *running]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            await inputs.aclose()
+            self._finish(stats, start)
+
+    async def collect(self) -> List[BulkItemResult]:
+        """
+        Runs every input and returns the results in input order.
+        """
+        results = [result async for result in self]
+        results.sort(key=lambda result: result.index)
+        return results
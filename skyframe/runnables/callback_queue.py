@@ -0,0 +1,135 @@
+import asyncio
+import weakref
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from skyframe.settings import framework_settings
+from skyframe.utils import logger
+from .models.callback import BaseAsyncCallback, CallbackHooks, run_callback_hooks
+
+
+def _is_final(name: str) -> bool:
+    # End and error events finish a run, so the events queued before them have to be delivered first.
+    return 'end' in name or 'error' in name
+
+
+class _QueuedEvent:
+    __slots__ = ('name', 'hooks', 'kwargs', 'sequence')
+
+    def __init__(self, name: str, hooks: CallbackHooks, kwargs: Dict[str, Any], sequence: int):
+        self.name = name
+        self.hooks = hooks
+        self.kwargs = kwargs
+        self.sequence = sequence
+
+    @property
+    def run_id(self) -> Any:
+        info = self.kwargs.get('info')
+        return getattr(info, 'run_id', None)
+
+
+class CallbackQueue:
+    """
+    A bounded queue of events for one callback with background delivery, drained in order by a worker task.
+
+    The worker only runs while there are events to deliver, so idle queues hold no tasks.
+    """
+
+    def __init__(self, callback: BaseAsyncCallback):
+        settings = framework_settings.runnables.callbacks
+        self.callback = callback
+        self.queue_size = callback.queue_size or settings.queue_size
+        self.overflow = callback.overflow or settings.overflow
+        self.flush_timeout = settings.flush_timeout
+        self.dropped = 0
+        self._events: Deque[_QueuedEvent] = deque()
+        self._changed = asyncio.Event()
+        self._sequence = 0
+        self._delivered = 0
+        self._worker: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _wait_changed(self) -> None:
+        await self._changed.wait()
+
+    def _make_room(self, name: str, run_id: Any) -> bool:
+        if self.overflow == 'drop_oldest':
+            for event in self._events:
+                if not _is_final(event.name):
+                    self._events.remove(event)
+                    self.dropped += 1
+                    return True
+        elif self.overflow == 'coalesce_chunks' and name.endswith('_chunk'):
+            kept = deque(event for event in self._events if event.name != name or event.run_id != run_id)
+            if len(kept) < len(self._events):
+                self.dropped += len(self._events) - len(kept)
+                self._events = kept
+                return True
+        return False
+
+    async def put(self, name: str, hooks: CallbackHooks, kwargs: Dict[str, Any]) -> None:
+        """
+        Queues an event. Returns once it is queued, or for end and error events, once it has been delivered.
+        """
+        run_id = getattr(kwargs.get('info'), 'run_id', None)
+        while len(self._events) >= self.queue_size:
+            if not self._make_room(name, run_id):
+                await self._wait_changed()
+
+        self._sequence += 1
+        event = _QueuedEvent(name, hooks, kwargs, self._sequence)
+        self._events.append(event)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._deliver())
+        self._notify()
+
+        if _is_final(name):
+            await self.flush(event.sequence)
+
+    async def _deliver(self) -> None:
+        while self._events:
+            event = self._events.popleft()
+            self._notify()
+            await run_callback_hooks(self.callback, event.hooks, event.name, event.kwargs)
+            self._delivered = event.sequence
+            self._notify()
+
+    async def flush(self, sequence: Optional[int] = None) -> None:
+        """
+        Waits until every event up to sequence (by default every queued event) has been delivered.
+        """
+        if sequence is None:
+            sequence = self._sequence
+
+        async def wait() -> None:
+            while self._delivered < sequence:
+                await self._wait_changed()
+
+        try:
+            await asyncio.wait_for(wait(), self.flush_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Callback {type(self.callback).__name__} did not deliver its queued events within "
+                f"{self.flush_timeout} seconds. {len(self._events)} events are still queued."
+            )
+
+
+def get_callback_queue(callback: BaseAsyncCallback) -> CallbackQueue:
+    """
+    Returns the queue of a callback with background delivery for the running event loop.
+    """
+    # asyncio primitives belong to the loop they are used on, so each callback has one queue per loop.
+    queues: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, CallbackQueue]' = callback._queues
+    if queues is None:
+        queues = callback._queues = weakref.WeakKeyDictionary()
+    loop = asyncio.get_running_loop()
+    queue = queues.get(loop)
+    if queue is None:
+        queue = queues[loop] = CallbackQueue(callback)
+    return queue
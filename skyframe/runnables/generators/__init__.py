@@ -1,8 +1,24 @@
-from .audio import AudioGenerator
-from .moderation import ModerationGenerator
-from .speech_to_text import SpeechToTextGenerator
-from .text import TextGenerator
-from .embeddings import EmbeddingsGenerator
+from typing import TYPE_CHECKING
+
+from skyframe._lazy import lazy_exports
+
+# Imported on first access (PEP 562), so importing one generator does not import the others.
+_exports = {
+    'AudioGenerator': '.audio',
+    'ModerationGenerator': '.moderation',
+    'SpeechToTextGenerator': '.speech_to_text',
+    'TextGenerator': '.text',
+    'EmbeddingsGenerator': '.embeddings',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
+
+if TYPE_CHECKING:
+    from .audio import AudioGenerator
+    from .moderation import ModerationGenerator
+    from .speech_to_text import SpeechToTextGenerator
+    from .text import TextGenerator
+    from .embeddings import EmbeddingsGenerator
 
 __all__ = [
     "AudioGenerator",
@@ -1,16 +1,23 @@
+import asyncio
 from typing import TypeVar, AsyncGenerator, List, AsyncIterator, Any, ClassVar
 from uuid import UUID
 
+from pydantic import Field
+
 from skyframe.exceptions import GenerationException
+from skyframe.models.stream_timings import StreamTimer
 from skyframe.runnables.models import RunContext
+from skyframe.runnables.tracing import run_scope
 from .models import (
     AudioGenerationParams,
     AudioGenerationRequest,
     AudioResponse,
     AudioResponseChunk,
+    AudioResponseAccumulator,
 )
 from .services import BaseAudioGenerationService, get_audio_generation_service
 from ..base import BaseGenerator
+from ..resilience import aclose_stream
 
 TGenerationService = TypeVar("TGenerationService", bound=BaseAudioGenerationService)
 
@@ -21,6 +28,13 @@ class AudioGenerator(BaseGenerator[AudioGenerationParams]):
 
     generator_name: ClassVar[str] = "audio"
 
+    # run_stream speaks text as it arrives when given an async iterator of strings.
+    accepts_stream_input: ClassVar[bool] = True
+
+    accumulate_stream: bool = Field(default=True)
+    """ Whether run_stream assembles the full audio for the end callbacks. If False, the end callbacks
+    receive response=None and no audio is kept in memory while streaming. """
+
     def cleanup(self):
         del self.generation_params
         super().cleanup()
@@ -42,6 +56,7 @@ class AudioGenerator(BaseGenerator[AudioGenerationParams]):
                 inner_exception=e,
             )
 
+    @run_scope
     async def run_async(
         self,
         request: str,
@@ -71,6 +86,7 @@ class AudioGenerator(BaseGenerator[AudioGenerationParams]):
 
         return response
 
+    @run_scope
     async def run_stream(
         self,
         request: AudioGenerationRequest,
@@ -82,6 +98,8 @@ class AudioGenerator(BaseGenerator[AudioGenerationParams]):
             "on_audio_generation_start", request=request, **run_ctx
         )
 
+        timer = StreamTimer()
+
         try:
             if isinstance(request, str):
                 generator = generation_service.generate_stream_output(
@@ -101,19 +119,37 @@ class AudioGenerator(BaseGenerator[AudioGenerationParams]):
                 message=f"Error while generating audio stream: {e}", inner_exception=e
             )
 
-        chunks: List[AudioResponseChunk] = []
+        accumulator = AudioResponseAccumulator() if self.accumulate_stream else None
 
-        async for chunk in generator:
-            chunks.append(chunk)
+        try:
+            async for chunk in generator:
+                if accumulator is not None:
+                    accumulator.add(chunk)
+                timer.chunk(bool(chunk.audio))
+                await self._invoke_callback_async(
+                    "on_audio_generation_chunk", chunk=chunk, **run_ctx
+                )
+                yield chunk
+        except Exception as e:
             await self._invoke_callback_async(
-                "on_audio_generation_chunk", chunk=chunk, **run_ctx
+                "on_audio_generation_error", error=e, **run_ctx
             )
-            yield chunk
+            raise
+        except (GeneratorExit, asyncio.CancelledError):
+            # The consumer stopped iterating or was cancelled. End the run, so it is not left open.
+            await aclose_stream(generator)
+            await self._invoke_callback_async(
+                "on_audio_generation_end", response=None, timings=timer.finish(), abandoned=True, **run_ctx
+            )
+            raise
 
-        response = AudioResponse.from_chunks(chunks)
+        timings = timer.finish()
+        response = accumulator.build() if accumulator is not None else None
+        if response is not None:
+            response.timings = timings
 
         await self._invoke_callback_async(
-            "on_audio_generation_end", response=response, **run_ctx
+            "on_audio_generation_end", response=response, timings=timings, **run_ctx
         )
 
     def _begin_run(
@@ -1,4 +1,4 @@
 from .generation_params import AudioGenerationParams
 from .request import AudioGenerationRequest
-from .response import AudioResponse, AudioResponseChunk, NormalizedAlignment
+from .response import AudioResponse, AudioResponseChunk, AudioResponseAccumulator, NormalizedAlignment
 from .message_audio import MessageAudio, MessageAudioChunk
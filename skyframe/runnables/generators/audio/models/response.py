@@ -3,6 +3,7 @@ from typing import Optional, List
 from pydantic import BaseModel, Field
 
 from skyframe.models.base import UIDMixin, CreatedAtMixin
+from skyframe.models.stream_timings import StreamTimings
 
 
 class NormalizedAlignment(BaseModel):
@@ -54,6 +55,9 @@ class AudioResponse(UIDMixin, CreatedAtMixin):
     normalized_alignment: Optional[NormalizedAlignment] = Field(default=None)
     """Alignment information for the generated audio given the input normalized text sequence."""
 
+    timings: Optional[StreamTimings] = Field(default=None)
+    """Timing information of the stream the response was built from. Only set for streamed responses."""
+
     @classmethod
     def from_chunks(
             cls,
@@ -66,14 +70,37 @@ class AudioResponse(UIDMixin, CreatedAtMixin):
         if not chunks or len(chunks) == 0:
             raise ValueError("Cannot create an AudioResponse from an empty list of chunks.")
 
-        audio = ''
-        normalized_alignment = chunks[0].normalized_alignment or None
-
+        accumulator = AudioResponseAccumulator()
         for chunk in chunks:
-            if chunk.audio:
-                audio += chunk.audio
+            accumulator.add(chunk)
+        return accumulator.build()
+
+
+class AudioResponseAccumulator:
+    """
+    Builds an AudioResponse from a stream of chunks as they arrive.
+
+    The base64 audio parts are joined once at the end, so building is linear in the length of the audio, and
+    chunk objects can be dropped as soon as they have been added.
+    """
+
+    def __init__(self):
+        self.normalized_alignment: Optional[NormalizedAlignment] = None
+        self._audio: List[str] = []
+        self._has_chunks = False
+
+    def add(self, chunk: AudioResponseChunk) -> None:
+        if not self._has_chunks:
+            self.normalized_alignment = chunk.normalized_alignment or None
+            self._has_chunks = True
+        if chunk.audio:
+            self._audio.append(chunk.audio)
+
+    def build(self) -> AudioResponse:
+        if not self._has_chunks:
+            raise ValueError("Cannot create an AudioResponse from an empty list of chunks.")
 
-        return cls(
-            audio=audio,
-            normalized_alignment=normalized_alignment,
-        )
\ No newline at end of file
+        return AudioResponse(
+            audio=''.join(self._audio),
+            normalized_alignment=self.normalized_alignment,
+        )
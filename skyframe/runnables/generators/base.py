@@ -1,43 +1,93 @@
+import copy
 from abc import ABC
-from typing import TypeVar, Generic, Any, ClassVar, Self
+from typing import TypeVar, Generic, Any, ClassVar, Dict, Optional, Self, Tuple, Type
 
-from devtools import debug
-from pydantic import Field, model_validator
+from pydantic import BaseModel, Field, model_validator
 
+from .resilience import ResiliencePolicy
 from ..base import Runnable
 from ..models.params import BaseParams
 from ...settings import framework_settings
 
 TParams = TypeVar("TParams", bound=BaseParams)
 
+# The settings object, service name and a copy of the generation params each generator class last read.
+_generator_defaults: Dict[Type['BaseGenerator'], Tuple[Any, Optional[str], Dict[str, Any]]] = {}
+
 
 class BaseGenerator(Runnable, ABC, Generic[TParams]):
     service_name: str = Field(default="UNSET")
     generation_params: TParams
 
+    coalesce_requests: bool = Field(default=False)
+    """ If True, concurrent identical requests share a single call to the generation service. """
+
     # Class variable to be enforced in subclasses
     generator_name: ClassVar[str]
 
+    generation_params_cls: ClassVar[Optional[Type[BaseModel]]] = None
+    """ The params class of the generator, resolved from the generation_params annotation. """
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        annotation = cls.model_fields['generation_params'].annotation
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            cls.generation_params_cls = annotation
+
     def __new__(cls, *args, **kwargs):
         # Ensure that subclasses have defined generator_name
         if not hasattr(cls, 'generator_name') or cls.generator_name == "UNSET":
             raise TypeError("Subclasses of BaseGenerator must define a 'generator_name' class variable")
         return super().__new__(cls)
 
+    def _get_resilience_policy(self, *keys: str) -> ResiliencePolicy:
+        """
+        Returns the retry, timeout and hedging policy for calls to this generator's services.
+
+        :param keys: Identify the service (and model) the policy is for. Hedging latencies are tracked per keys.
+        """
+        settings = getattr(framework_settings.runnables.generators, self.generator_name).resilience
+        return ResiliencePolicy(settings, '/'.join([self.generator_name, *keys]))
+
+    @classmethod
+    def _get_defaults(cls) -> Tuple[str, Dict[str, Any]]:
+        """
+        Returns the service name and generation params from the generator's settings.
+
+        The params are copied once and reused while the settings still hold the same service name and equal
+        params, so changes made to the settings at runtime, including in-place edits of the params dict, apply
+        to the generators created after them.
+        """
+        settings = getattr(framework_settings.runnables.generators, cls.generator_name)
+        generation_params = settings.generation_params or {}
+        cached = _generator_defaults.get(cls)
+        if cached is None or cached[0] is not settings or cached[1] != settings.service_name \
+                or cached[2] != generation_params:
+            cached = (settings, settings.service_name, copy.deepcopy(generation_params))
+            _generator_defaults[cls] = cached
+        return cached[1] or "UNSET", cached[2]
+
     @model_validator(mode='before')
     @classmethod
     def validate_load_settings(cls, data: Any) -> Self:
         # Use the class-level generator_name
         if not cls.generator_name or cls.generator_name == "UNSET":
             raise ValueError("Subclasses of BaseGenerator must define a 'generator_name' class variable")
+        if not isinstance(data, dict):
+            return data
 
-        generator_settings = framework_settings.runnables.generators.model_dump().get(cls.generator_name)
-        debug(generator_settings)
+        service_name, params = cls._get_defaults()
 
-        tparams_cls = cls.__pydantic_core_schema__.get('schema').get('schema').get('fields').get(
-            'generation_params').get('schema').get('cls')
+        # Values passed to the constructor take precedence over the settings.
+        if data.get('service_name') in (None, "UNSET"):
+            data['service_name'] = service_name
 
-        data['service_name'] = generator_settings.get('service_name', "UNSET") or "UNSET"
-        data['generation_params'] = tparams_cls.model_validate(generator_settings.get('generation_params', {}))
-        debug(data)
+        # Validating the settings dict gives every generator its own params, and is cheaper than a deep copy.
+        generation_params = data.get('generation_params')
+        params_cls = cls.generation_params_cls
+        if params_cls is not None and generation_params is None:
+            data['generation_params'] = params_cls.model_validate(params)
+        elif params_cls is not None and isinstance(generation_params, dict):
+            data['generation_params'] = params_cls.model_validate({**params, **generation_params})
         return data
@@ -0,0 +1,162 @@
+import asyncio
+import importlib
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TYPE_CHECKING
+
+from skyframe.settings.runnables.generators.http_client import HttpClientSettings
+from skyframe.utils import logger
+
+if TYPE_CHECKING:
+    from anthropic import Anthropic, AsyncAnthropic
+    from openai import AsyncOpenAI, OpenAI
+
+_env_loaded: bool = False
+_lock = threading.Lock()
+
+# Sync clients are shared by the whole process.
+_sync_clients: Dict[Hashable, Any] = {}
+# Async clients own connections bound to the event loop they were first used on, so they are cached per loop.
+_async_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, Any]]' = weakref.WeakKeyDictionary()
+
+
+def _load_env() -> None:
+    global _env_loaded
+    if _env_loaded:
+        return
+    from dotenv import load_dotenv
+    load_dotenv()
+    _env_loaded = True
+
+
+def _settings_key(settings: HttpClientSettings) -> Tuple:
+    return (
+        settings.max_connections,
+        settings.max_keepalive_connections,
+        settings.keepalive_expiry,
+        settings.http2,
+        settings.timeout,
+        settings.max_retries,
+    )
+
+
+def _http_client_kwargs(http_client_cls: type, settings: HttpClientSettings) -> Dict[str, Any]:
+    # The SDK default clients subclass whichever httpx distribution the SDK is built on,
+    # so Limits must come from that same module.
+    httpx = importlib.import_module(http_client_cls.__mro__[1].__module__.partition('.')[0])
+
+    http2 = settings.http2
+    if http2:
+        try:
+            importlib.import_module('h2')
+        except ImportError:
+            logger.warning("HTTP/2 was requested but the 'h2' package is not installed. Falling back to HTTP/1.1.")
+            http2 = False
+
+    return {
+        'limits': httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+        'http2': http2,
+    }
+
+
+def _client_kwargs(settings: HttpClientSettings, retried_by_policy: bool) -> Dict[str, Any]:
+    """
+    :param retried_by_policy: Whether calls made with the client are retried by a generator's ResiliencePolicy.
+        The SDK does not retry them by default then, so retries are not nested.
+    """
+    kwargs = {}
+    if settings.timeout is not None:
+        kwargs['timeout'] = settings.timeout
+    if settings.max_retries is not None:
+        kwargs['max_retries'] = settings.max_retries
+    elif retried_by_policy:
+        kwargs['max_retries'] = 0
+    return kwargs
+
+
+def _get_or_create_sync(key: Hashable, factory: Callable[[], Any]) -> Any:
+    client = _sync_clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            _load_env()
+            client = factory()
+            _sync_clients[key] = client
+        return client
+
+
+def _get_or_create_async(key: Hashable, factory: Callable[[], Any]) -> Any:
+    try:
+        loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if loop is None:
+        # No running loop yet, so there is nothing to bind the pool to. Build a throwaway client.
+        _load_env()
+        return factory()
+
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            _load_env()
+            client = factory()
+            clients[key] = client
+        return client
+
+
+def get_openai_client(settings: HttpClientSettings) -> 'AsyncOpenAI':
+    """
+    Returns the pooled AsyncOpenAI client for the running event loop and the given pool settings.
+    """
+    def create() -> 'AsyncOpenAI':
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+        http_client = DefaultAsyncHttpxClient(**_http_client_kwargs(DefaultAsyncHttpxClient, settings))
+        return AsyncOpenAI(api_key=os.environ.get('OPENAI_API_KEY'), http_client=http_client, **_client_kwargs(settings, True))
+
+    return _get_or_create_async(('openai', _settings_key(settings)), create)
+
+
+def get_openai_client_sync(settings: HttpClientSettings) -> 'OpenAI':
+    """
+    Returns the pooled OpenAI client for the given pool settings.
+    """
+    def create() -> 'OpenAI':
+        from openai import OpenAI, DefaultHttpxClient
+        http_client = DefaultHttpxClient(**_http_client_kwargs(DefaultHttpxClient, settings))
+        return OpenAI(api_key=os.environ.get('OPENAI_API_KEY'), http_client=http_client, **_client_kwargs(settings, False))
+
+    return _get_or_create_sync(('openai', _settings_key(settings)), create)
+
+
+def get_anthropic_client(settings: HttpClientSettings) -> 'AsyncAnthropic':
+    """
+    Returns the pooled AsyncAnthropic client for the running event loop and the given pool settings.
+    """
+    def create() -> 'AsyncAnthropic':
+        from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+        http_client = DefaultAsyncHttpxClient(**_http_client_kwargs(DefaultAsyncHttpxClient, settings))
+        return AsyncAnthropic(http_client=http_client, **_client_kwargs(settings, True))
+
+    return _get_or_create_async(('anthropic', _settings_key(settings)), create)
+
+
+def get_anthropic_client_sync(settings: HttpClientSettings) -> 'Anthropic':
+    """
+    Returns the pooled Anthropic client for the given pool settings.
+    """
+    def create() -> 'Anthropic':
+        from anthropic import Anthropic, DefaultHttpxClient
+        http_client = DefaultHttpxClient(**_http_client_kwargs(DefaultHttpxClient, settings))
+        return Anthropic(http_client=http_client, **_client_kwargs(settings, False))
+
+    return _get_or_create_sync(('anthropic', _settings_key(settings)), create)
@@ -0,0 +1,233 @@
+import asyncio
+import hashlib
+import json
+import weakref
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Generic, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+def get_request_key(service_name: str, request: Any, generation_params: Optional[BaseModel] = None) -> str:
+    """
+    Returns a stable hash of a generation request, its params and the service that handles it.
+    """
+    params = generation_params.model_dump(mode='json', exclude_none=True) if generation_params is not None else None
+    if isinstance(request, BaseModel):
+        request = request.model_dump(mode='json')
+    dumped = json.dumps(
+        {'service': service_name, 'params': params, 'request': request},
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(dumped.encode('utf-8')).hexdigest()
+
+
+class _Call(Generic[T]):
+    def __init__(self, task: 'asyncio.Task[T]'):
+        self.task = task
+        self.waiters = 0
+
+
+class _Stream(Generic[T]):
+    def __init__(self, max_replay_chunks: Optional[int]):
+        self.chunks: Deque[T] = deque()
+        self.max_replay_chunks = max_replay_chunks
+        # Whether the buffer still holds every chunk from the start, so new consumers can join.
+        self.replayable = True
+        # The number of chunks dropped from the front of chunks after every consumer received them.
+        self.offset = 0
+        # The index of the next chunk of each consumer.
+        self.positions: Dict[object, int] = {}
+        self.started = asyncio.Event()
+        self.changed = asyncio.Event()
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.pump: Optional[asyncio.Task] = None
+
+    def append(self, chunk: T) -> None:
+        self.chunks.append(chunk)
+        if self.replayable and self.max_replay_chunks is not None and len(self.chunks) > self.max_replay_chunks:
+            self.replayable = False
+            self.trim()
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def finish(self) -> None:
+        self.done = True
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def trim(self) -> None:
+        if self.replayable:
+            return
+        consumed = min(self.positions.values(), default=self.offset + len(self.chunks))
+        while self.offset < consumed:
+            self.chunks.popleft()
+            self.offset += 1
+
+    def leave(self, consumer: object) -> None:
+        del self.positions[consumer]
+        if not self.positions and not self.done and self.pump is not None:
+            self.pump.cancel()
+        else:
+            self.trim()
+
+
+class RequestCoalescer(Generic[T]):
+    """
+    Shares one upstream call between concurrent identical requests (single-flight).
+
+    The first caller for a key starts the call on its own task and later callers with the same key wait on it.
+    A call is only shared while it is in flight; once it finishes the next caller starts a new one.
+    If every waiter is cancelled, the upstream call is cancelled too.
+
+    Streams are pumped by a single task into a replay buffer, so callers that join late still receive every
+    chunk from the start. Once a stream has more chunks than max_replay_chunks, chunks are dropped from the
+    buffer as soon as every consumer has received them, and callers that arrive after that start a new stream.
+    The pump is cancelled once all consumers have stopped iterating.
+    """
+
+    def __init__(self):
+        # asyncio primitives belong to the loop they are used on, so in-flight calls are tracked per loop.
+        self._calls: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _Call]]' = weakref.WeakKeyDictionary()
+        self._streams: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _Stream]]' = weakref.WeakKeyDictionary()
+
+    def in_flight(self) -> int:
+        loop = asyncio.get_running_loop()
+        return len(self._calls.get(loop, {})) + len(self._streams.get(loop, {}))
+
+    async def run(
+            self,
+            key: str,
+            factory: Callable[[], Awaitable[T]],
+            copy: Optional[Callable[[T], T]] = None,
+    ) -> T:
+        """
+        Awaits the in-flight call for key, starting it with factory if there is none.
+
+        :param key: The canonical key of the request.
+        :param factory: Starts the upstream call. Only called by the first caller.
+        :param copy: If set, callers that joined an in-flight call receive copy(result) instead of the shared result.
+        :return: The result of the shared call.
+        """
+        calls = self._calls.setdefault(asyncio.get_running_loop(), {})
+
+        call = calls.get(key)
+        joined = call is not None
+        if call is None:
+            call = _Call(asyncio.ensure_future(factory()))
+            calls[key] = call
+
+            def remove(_: asyncio.Future) -> None:
+                if calls.get(key) is call:
+                    del calls[key]
+
+            call.task.add_done_callback(remove)
+
+        call.waiters += 1
+        try:
+            result = await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+        return copy(result) if joined and copy is not None else result
+
+    async def stream(
+            self,
+            key: str,
+            factory: Callable[[], Awaitable[AsyncIterator[T]]],
+            max_replay_chunks: Optional[int] = 256,
+    ) -> AsyncIterator[T]:
+        """
+        Joins the in-flight stream for key, starting it with factory if there is none.
+
+        Errors raised while opening the stream are raised here. Errors raised mid-stream are raised to every
+        consumer once it has received the chunks that came before the error.
+
+        :param key: The canonical key of the request.
+        :param factory: Opens the upstream stream. Only called by the first caller.
+        :param max_replay_chunks: The number of chunks kept for callers that join late. None keeps every chunk
+            until the stream ends. Only used by the first caller.
+        :return: An iterator over every chunk of the shared stream, starting from the first one.
+            Chunk objects are shared between consumers.
+        """
+        streams = self._streams.setdefault(asyncio.get_running_loop(), {})
+
+        stream = streams.get(key)
+        if stream is None or not stream.replayable:
+            stream = _Stream(max_replay_chunks)
+            streams[key] = stream
+            stream.pump = asyncio.ensure_future(self._pump(stream, factory))
+
+            def remove(_: asyncio.Future) -> None:
+                if streams.get(key) is stream:
+                    del streams[key]
+
+            stream.pump.add_done_callback(remove)
+
+        # Registered before waiting rather than when iteration starts, so the pump is not cancelled and the chunks
+        # this caller has not received yet are not dropped in the meantime.
+        consumer = object()
+        stream.positions[consumer] = 0
+        try:
+            await stream.started.wait()
+            if stream.error is not None and not stream.chunks:
+                raise stream.error
+        except BaseException:
+            stream.leave(consumer)
+            raise
+
+        return self._consume(stream, consumer)
+
+    @staticmethod
+    async def _pump(stream: _Stream[T], factory: Callable[[], Awaitable[AsyncIterator[T]]]) -> None:
+        try:
+            iterator = await factory()
+        except BaseException as e:
+            stream.error = e
+            stream.finish()
+            stream.started.set()
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        stream.started.set()
+        try:
+            async for chunk in iterator:
+                stream.append(chunk)
+        except Exception as e:
+            stream.error = e
+        except asyncio.CancelledError:
+            stream.error = asyncio.CancelledError()
+            raise
+        finally:
+            stream.finish()
+            aclose = getattr(iterator, 'aclose', None)
+            if aclose is not None:
+                await aclose()
+
+    @staticmethod
+    async def _consume(stream: _Stream[T], consumer: object) -> AsyncIterator[T]:
+        index = 0
+        try:
+            while True:
+                if index < stream.offset + len(stream.chunks):
+                    chunk = stream.chunks[index - stream.offset]
+                    index += 1
+                    stream.positions[consumer] = index
+                    stream.trim()
+                    yield chunk
+                elif stream.done:
+                    if stream.error is not None:
+                        raise stream.error
+                    return
+                else:
+                    await stream.changed.wait()
+        finally:
+            stream.leave(consumer)
@@ -3,12 +3,16 @@ from uuid import UUID
 
 from skyframe.exceptions.generation import GenerationException
 from skyframe.runnables.models.run_info import RunContext
+from skyframe.runnables.tracing import run_scope
 from .models import EmbeddingsGenerationParams, EmbeddingsResponse, EmbeddingsGenerationRequest
 from .services import BaseEmbeddingsGenerationService, get_embeddings_generation_service
 from ..base import BaseGenerator
+from ..coalescing import RequestCoalescer, get_request_key
 
 TGenerationService = TypeVar("TGenerationService", bound=BaseEmbeddingsGenerationService)
 
+embeddings_request_coalescer: RequestCoalescer = RequestCoalescer()
+
 
 class EmbeddingsGenerator(BaseGenerator[EmbeddingsGenerationParams]):
     # service_name: str = Field(default=_DEFAULT_SERVICE_NAME)
@@ -37,6 +41,7 @@ class EmbeddingsGenerator(BaseGenerator[EmbeddingsGenerationParams]):
                 inner_exception=e
             )
 
+    @run_scope
     def run(
             self,
             request: EmbeddingsGenerationRequest,
@@ -65,6 +70,29 @@ class EmbeddingsGenerator(BaseGenerator[EmbeddingsGenerationParams]):
 
         return response
 
+    async def _generate(
+            self,
+            request: EmbeddingsGenerationRequest,
+            generation_params: EmbeddingsGenerationParams,
+            generation_service: BaseEmbeddingsGenerationService,
+    ) -> EmbeddingsResponse:
+        policy = self._get_resilience_policy(self.service_name, str(generation_params.model))
+
+        async def generate() -> EmbeddingsResponse:
+            return await policy.run(
+                lambda: generation_service.run_async(request=request, generation_params=generation_params)
+            )
+
+        if not self.coalesce_requests:
+            return await generate()
+
+        return await embeddings_request_coalescer.run(
+            get_request_key(self.service_name, request, generation_params),
+            generate,
+            copy=lambda response: response.model_copy(deep=True)
+        )
+
+    @run_scope
     async def run_async(
             self,
             request: EmbeddingsGenerationRequest,
@@ -75,21 +103,18 @@ class EmbeddingsGenerator(BaseGenerator[EmbeddingsGenerationParams]):
         context = self._begin_run(generation_params=generation_params)
         generation_service = self._get_generation_service()
 
-        self._invoke_callback('on_embeddings_generation_start', request=request, **context)
+        await self._invoke_callback_async('on_embeddings_generation_start', request=request, **context)
 
         try:
-            response = await generation_service.run_async(
-                request=request,
-                generation_params=generation_params
-            )
+            response = await self._generate(request, generation_params, generation_service)
         except Exception as e:
-            self._invoke_callback('on_embeddings_generation_error', exception=e, **context)
+            await self._invoke_callback_async('on_embeddings_generation_error', error=e, **context)
             raise GenerationException(
                 message='Error while generating embeddings',
                 inner_exception=e
             )
 
-        self._invoke_callback('on_embeddings_generation_end', response=response, **context)
+        await self._invoke_callback_async('on_embeddings_generation_end', response=response, **context)
 
         return response
 
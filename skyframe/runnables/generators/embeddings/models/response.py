@@ -5,8 +5,6 @@ from pydantic import BaseModel, Field
 
 from skyframe.models import TokenUsage
 
-import numpy as np
-
 
 class EmbeddingsResponse(BaseModel):
     """
@@ -44,6 +42,8 @@ class EmbeddingsResponse(BaseModel):
         if not other and len(self.data) < 2:
             raise ValueError("Cannot compare similarity between one embedding.")
 
+        import numpy as np
+
         a = np.array(self.data[0])
         b = np.array(other.data[0] if other else self.data[1])
 
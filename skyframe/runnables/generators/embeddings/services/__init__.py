@@ -1,6 +1,14 @@
+from typing import TYPE_CHECKING
+
 from .base import BaseEmbeddingsGenerationService
 from .get import get_embeddings_generation_service
-from .openai import *
+from skyframe._lazy import lazy_exports
+
+# Services import their provider SDK, so they are imported on first access (PEP 562).
+__getattr__, __dir__ = lazy_exports(__name__, {'OpenAiEmbeddingsGenerationService': '.openai'})
+
+if TYPE_CHECKING:
+    from .openai import OpenAiEmbeddingsGenerationService
 
 __all__ = [
     'BaseEmbeddingsGenerationService',
@@ -1,12 +1,20 @@
 from typing import TypeVar
 from .base import BaseEmbeddingsGenerationService
+from ...registry import ServiceRegistry
 
 TEmbeddingsGenerationService = TypeVar("TEmbeddingsGenerationService", bound=BaseEmbeddingsGenerationService)
 
 
-def get_embeddings_generation_service(service_name: str) -> TEmbeddingsGenerationService:
+def _create_embeddings_generation_service(service_name: str) -> BaseEmbeddingsGenerationService:
     if service_name == 'openai':
         from .openai import OpenAiEmbeddingsGenerationService
         return OpenAiEmbeddingsGenerationService()
 
-    raise NotImplementedError(f'Embedding Generation service: {service_name} is not implemented')
\ No newline at end of file
+    raise NotImplementedError(f'Embedding Generation service: {service_name} is not implemented')
+
+
+embeddings_generation_services: ServiceRegistry[BaseEmbeddingsGenerationService] = ServiceRegistry(_create_embeddings_generation_service)
+
+
+def get_embeddings_generation_service(service_name: str) -> TEmbeddingsGenerationService:
+    return embeddings_generation_services.get(service_name)
@@ -1,29 +1,30 @@
-import os
-
-from dotenv import load_dotenv
 from openai import AsyncOpenAI, OpenAI
 from openai.types import CreateEmbeddingResponse
 
+from skyframe.settings import framework_settings
 from skyframe.utils import logger
 from ..base import BaseEmbeddingsGenerationService
 from .converter import OpenAiEmbeddingsGenerationConverter
+from ....clients import get_openai_client, get_openai_client_sync
 from ...models import EmbeddingsGenerationRequest, EmbeddingsGenerationParams, EmbeddingsResponse
 
 
 class OpenAiEmbeddingsGenerationService(BaseEmbeddingsGenerationService):
-    client: AsyncOpenAI
-    client_sync: OpenAI
     converter: OpenAiEmbeddingsGenerationConverter
     default_model: str = 'text-embedding-3-small'
 
     def __init__(self):
         super().__init__()
-        load_dotenv()
-        api_key = os.environ.get('OPENAI_API_KEY')
-        self.client = AsyncOpenAI(api_key=api_key)
-        self.client_sync = OpenAI(api_key=api_key)
         self.converter = OpenAiEmbeddingsGenerationConverter()
 
+    @property
+    def client(self) -> AsyncOpenAI:
+        return get_openai_client(framework_settings.runnables.generators.embeddings.http_client)
+
+    @property
+    def client_sync(self) -> OpenAI:
+        return get_openai_client_sync(framework_settings.runnables.generators.embeddings.http_client)
+
     @staticmethod
     def calculate_cost(
             token_count: int,
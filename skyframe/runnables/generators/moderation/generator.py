@@ -4,13 +4,17 @@ from uuid import UUID
 from pydantic import Field
 
 from skyframe.runnables.models import RunContext
+from skyframe.runnables.tracing import run_scope
 from skyframe.exceptions import GenerationException
 from .models import ModerationGenerationParams, ModerationResponse
 from .services import BaseModerationService, get_moderation_service
 from ..base import BaseGenerator
+from ..coalescing import RequestCoalescer, get_request_key
 
 TGenerationService = TypeVar("TGenerationService", bound=BaseModerationService)
 
+moderation_request_coalescer: RequestCoalescer = RequestCoalescer()
+
 
 class ModerationGenerator(BaseGenerator[ModerationGenerationParams]):
     service_names: List[str] = Field(default_factory=lambda: ['openai', 'transformers'])
@@ -32,6 +36,7 @@ class ModerationGenerator(BaseGenerator[ModerationGenerationParams]):
                 inner_exception=e
             )
 
+    @run_scope
     def run(
             self,
             request: str
@@ -57,6 +62,28 @@ class ModerationGenerator(BaseGenerator[ModerationGenerationParams]):
 
         return response
 
+    async def _run_services(self, request: str) -> ModerationResponse:
+        generation_services = self._get_generation_services()
+
+        response = ModerationResponse(model='', flagged=False)
+        for service_name, generation_service in zip(self.service_names, generation_services):
+            policy = self._get_resilience_policy(service_name)
+            response += await policy.run(
+                lambda service=generation_service: service.run_async(request=request, generation_params=self.generation_params)
+            )
+        return response
+
+    async def _generate(self, request: str) -> ModerationResponse:
+        if not self.coalesce_requests:
+            return await self._run_services(request)
+
+        return await moderation_request_coalescer.run(
+            get_request_key(','.join(self.service_names), request, self.generation_params),
+            lambda: self._run_services(request),
+            copy=lambda response: response.model_copy(deep=True)
+        )
+
+    @run_scope
     async def run_async(
             self,
             request: str
@@ -66,11 +93,7 @@ class ModerationGenerator(BaseGenerator[ModerationGenerationParams]):
         await self._invoke_callback_async('on_moderation_generation_start', request=request, **context)
 
         try:
-            generation_services = self._get_generation_services()
-
-            response = ModerationResponse(model='', flagged=False)
-            for generation_service in generation_services:
-                response += await generation_service.run_async(request=request, generation_params=self.generation_params)
+            response = await self._generate(request)
         except Exception as e:
             await self._invoke_callback_async('on_moderation_generation_error', error=e, **context)
             raise GenerationException(
@@ -1,16 +1,24 @@
 from typing import TypeVar
 
 from .base import BaseModerationService
+from ...registry import ServiceRegistry
 
 TModerationService = TypeVar("TModerationService", bound=BaseModerationService)
 
 
-def get_moderation_service(service_name: str) -> TModerationService:
+def _create_moderation_service(service_name: str) -> BaseModerationService:
     if service_name == 'openai':
         from .openai import OpenaiModerationService
         return OpenaiModerationService()
     elif service_name == 'transformers':
         from .transformers import TransformersModerationService
         return TransformersModerationService()
-    
-    raise NotImplementedError(f'Moderation service: {service_name} is not implemented')
\ No newline at end of file
+
+    raise NotImplementedError(f'Moderation service: {service_name} is not implemented')
+
+
+moderation_services: ServiceRegistry[BaseModerationService] = ServiceRegistry(_create_moderation_service)
+
+
+def get_moderation_service(service_name: str) -> TModerationService:
+    return moderation_services.get(service_name)
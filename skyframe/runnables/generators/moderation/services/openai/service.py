@@ -1,29 +1,30 @@
-import os
-
-from dotenv import load_dotenv
 from openai import AsyncOpenAI, OpenAI
 from openai.types import ModerationCreateResponse
 
+from skyframe.settings import framework_settings
 from skyframe.utils import logger
 from .converter import OpenaiModerationConverter
 from ..base import BaseModerationService
+from ....clients import get_openai_client, get_openai_client_sync
 from ...models import ModerationResponse, ModerationGenerationParams
 
 
 class OpenaiModerationService(BaseModerationService):
-    client: AsyncOpenAI
-    client_sync: OpenAI
     converter: OpenaiModerationConverter
     default_model: str = 'text-moderation-stable'
 
     def __init__(self):
         super().__init__()
-        load_dotenv()
-        api_key = os.environ.get('OPENAI_API_KEY')
-        self.client = AsyncOpenAI(api_key=api_key)
-        self.client_sync = OpenAI(api_key=api_key)
         self.converter = OpenaiModerationConverter()
 
+    @property
+    def client(self) -> AsyncOpenAI:
+        return get_openai_client(framework_settings.runnables.generators.moderation.http_client)
+
+    @property
+    def client_sync(self) -> OpenAI:
+        return get_openai_client_sync(framework_settings.runnables.generators.moderation.http_client)
+
     def run(
             self,
             request: str,
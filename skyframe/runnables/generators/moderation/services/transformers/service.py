@@ -1,7 +1,7 @@
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import threading
 from pathlib import Path
-from typing import List
+from typing import List, Any, Dict
 
 import torch
 from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
@@ -19,6 +19,8 @@ class TransformersModerationService(BaseModerationService):
     def __init__(self):
         super().__init__()
         self.converter = TransformersModerationConverter()
+        self._classifiers: Dict[str, Any] = {}
+        self._classifiers_lock = threading.Lock()
 
     def run(
             self,
@@ -50,9 +52,8 @@ class TransformersModerationService(BaseModerationService):
 
         model_path = Path(get_project_path_str()) / "transformer_models" / "models" / self.default_model
 
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            transformer_response = await loop.run_in_executor(executor, self._classify_sync, request, str(model_path))
+        loop = asyncio.get_running_loop()
+        transformer_response = await loop.run_in_executor(None, self._classify_sync, request, str(model_path))
 
         logger.dev_debug(transformer_response)
 
@@ -62,21 +63,29 @@ class TransformersModerationService(BaseModerationService):
 
         return response
 
-    @staticmethod
-    def _classify_sync(query: str, model_path: str) -> List:
-        tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=True)
-        model = AutoModelForSequenceClassification.from_pretrained(model_path, local_files_only=True)
-
-        classifier = pipeline(
-            'text-classification',
-            model=model,
-            tokenizer=tokenizer,
-            truncation=True,
-            max_length=512,
-            #device=torch.device("cuda" if torch.cuda.is_available() else "cpu"),
-            device=torch.device("cpu"),
-        )
+    def _get_classifier(self, model_path: str) -> Any:
+        # Loading the model dominates the cost of a call, so each model is loaded once per service.
+        with self._classifiers_lock:
+            classifier = self._classifiers.get(model_path)
+            if classifier is None:
+                tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=True)
+                model = AutoModelForSequenceClassification.from_pretrained(model_path, local_files_only=True)
+
+                classifier = pipeline(
+                    'text-classification',
+                    model=model,
+                    tokenizer=tokenizer,
+                    truncation=True,
+                    max_length=512,
+                    #device=torch.device("cuda" if torch.cuda.is_available() else "cpu"),
+                    device=torch.device("cpu"),
+                )
+                self._classifiers[model_path] = classifier
+            return classifier
+
+    def _classify_sync(self, query: str, model_path: str) -> List:
+        classifier = self._get_classifier(model_path)
 
         result = classifier(query)
 
-        return result
\ No newline at end of file
+        return result
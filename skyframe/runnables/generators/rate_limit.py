@@ -0,0 +1,229 @@
+import asyncio
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Mapping, Optional
+
+from skyframe.settings import framework_settings
+from skyframe.settings.runnables.generators.rate_limit import RateLimit, RateLimitSettings
+from skyframe.utils import logger
+from .registry import ServiceRegistry
+
+_DURATION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a reset header into seconds from now.
+    OpenAI sends durations ('1s', '6m0s', '20ms'), Anthropic sends RFC 3339 timestamps.
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    matches = _DURATION_PATTERN.findall(value)
+    if matches:
+        return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in matches)
+
+    try:
+        return max(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp() - time.time(), 0)
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """
+    A per-minute budget that refills continuously.
+
+    Reservations are taken immediately and may push the balance below zero; the caller then waits until the
+    debt has refilled. This keeps waiters in arrival order without a queue.
+    """
+
+    def __init__(self, per_minute: Optional[int]):
+        self.per_minute = per_minute
+        self.balance = float(per_minute or 0)
+        self._updated_at = time.monotonic()
+
+    @property
+    def is_limited(self) -> bool:
+        return self.per_minute is not None
+
+    def _refill(self, now: float) -> None:
+        if self.per_minute is not None:
+            rate = self.per_minute / 60
+            self.balance = min(self.balance + (now - self._updated_at) * rate, self.per_minute)
+        self._updated_at = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Takes amount from the bucket and returns the seconds until the balance is no longer negative.
+        """
+        if self.per_minute is None:
+            return 0
+        self._refill(now)
+        # A single reservation larger than the whole budget could never be satisfied, so it waits for a full bucket.
+        self.balance -= min(amount, self.per_minute)
+        if self.balance >= 0:
+            return 0
+        return -self.balance / (self.per_minute / 60)
+
+    def refund(self, amount: float, now: float) -> None:
+        if self.per_minute is None:
+            return
+        self._refill(now)
+        self.balance = min(self.balance + amount, self.per_minute)
+
+    def set_limit(self, per_minute: int, now: float) -> None:
+        self._refill(now)
+        if self.per_minute is None:
+            self.balance = float(per_minute)
+        self.per_minute = per_minute
+        self.balance = min(self.balance, per_minute)
+
+    def set_remaining(self, remaining: int, now: float) -> None:
+        # The provider's view includes other clients sharing the key, so only ever lower the local balance.
+        self._refill(now)
+        self.balance = min(self.balance, float(remaining))
+
+
+class RateLimitLease:
+    """
+    A reservation taken from a RateLimiter for one request. Report the outcome of the request back through it.
+    """
+
+    def __init__(self, limiter: 'RateLimiter', tokens: int):
+        self.limiter = limiter
+        self.tokens = tokens
+
+    def reconcile(self, used_tokens: Optional[int]) -> None:
+        """
+        Corrects the up-front token estimate with the tokens the request actually used.
+        """
+        if used_tokens is None:
+            return
+        self.limiter.refund_tokens(self.tokens - used_tokens)
+        self.tokens = used_tokens
+
+    def release(self) -> None:
+        """
+        Returns the reserved tokens, for requests that failed before the provider processed them.
+        """
+        self.limiter.refund_tokens(self.tokens)
+        self.tokens = 0
+
+    def update(self, headers: Optional[Mapping[str, str]]) -> None:
+        self.limiter.update_from_headers(headers)
+
+    def rate_limited(self, headers: Optional[Mapping[str, str]] = None) -> None:
+        self.limiter.on_rate_limited(headers)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute token buckets for one provider and model.
+    """
+
+    def __init__(self, name: str, limit: RateLimit, settings: RateLimitSettings):
+        self.name = name
+        self.settings = settings
+        self.requests = TokenBucket(limit.requests_per_minute)
+        self.tokens = TokenBucket(limit.tokens_per_minute)
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def limits_tokens(self) -> bool:
+        """
+        Whether token estimates matter. If not, callers can skip counting prompt tokens.
+        """
+        return self.tokens.is_limited
+
+    async def acquire(self, tokens: int = 0) -> RateLimitLease:
+        """
+        Waits until the request and its estimated tokens fit in the budget, then returns the lease for them.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(
+                self.requests.reserve(1, now),
+                self.tokens.reserve(tokens, now),
+                self._paused_until - now,
+            )
+        if wait > 0:
+            logger.debug(f"Rate limiter '{self.name}' is delaying a request by {wait:.2f} seconds")
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # The request is never sent, so its reservation goes back to the requests queued behind it.
+                with self._lock:
+                    now = time.monotonic()
+                    self.requests.refund(1, now)
+                    self.tokens.refund(min(tokens, self.tokens.per_minute or 0), now)
+                raise
+        return RateLimitLease(self, tokens)
+
+    def refund_tokens(self, tokens: int) -> None:
+        if tokens == 0:
+            return
+        with self._lock:
+            self.tokens.refund(tokens, time.monotonic())
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        if headers is None or not self.settings.adapt_from_headers:
+            return
+
+        # OpenAI uses x-ratelimit-{limit,remaining}-{requests,tokens}, Anthropic anthropic-ratelimit-{requests,tokens}-*.
+        with self._lock:
+            now = time.monotonic()
+            for kind, bucket in (('requests', self.requests), ('tokens', self.tokens)):
+                limit = _parse_int(headers.get(f'x-ratelimit-limit-{kind}') or headers.get(f'anthropic-ratelimit-{kind}-limit'))
+                remaining = _parse_int(headers.get(f'x-ratelimit-remaining-{kind}') or headers.get(f'anthropic-ratelimit-{kind}-remaining'))
+                if limit is not None and limit > 0:
+                    bucket.set_limit(limit, now)
+                if remaining is not None and bucket.is_limited:
+                    bucket.set_remaining(remaining, now)
+
+    def on_rate_limited(self, headers: Optional[Mapping[str, str]] = None) -> None:
+        """
+        Pauses the limiter after a 429 so queued requests back off together instead of retrying into the limit.
+        """
+        retry_after = None
+        if headers is not None:
+            retry_after = _parse_reset(headers.get('retry-after')) \
+                or _parse_reset(headers.get('x-ratelimit-reset-requests')) \
+                or _parse_reset(headers.get('x-ratelimit-reset-tokens'))
+        if retry_after is None:
+            retry_after = self.settings.default_retry_after
+
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        self.update_from_headers(headers)
+        logger.warning(f"Rate limiter '{self.name}' was rate limited by the provider. Pausing for {retry_after:.2f} seconds.")
+
+
+def _create_rate_limiter(name: str) -> RateLimiter:
+    settings = framework_settings.runnables.generators.text.rate_limit
+    provider, _, model = name.partition('/')
+    return RateLimiter(name, settings.get_limit(provider, model), settings)
+
+
+rate_limiters: ServiceRegistry[RateLimiter] = ServiceRegistry(_create_rate_limiter)
+
+
+def get_rate_limiter(provider: str, model: str) -> RateLimiter:
+    """
+    Returns the rate limiter shared by every request to the given provider and model.
+    """
+    return rate_limiters.get(f'{provider}/{model}')
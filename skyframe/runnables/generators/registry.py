@@ -0,0 +1,39 @@
+import threading
+from typing import Callable, Dict, Generic, List, TypeVar
+
+TService = TypeVar("TService")
+
+
+class ServiceRegistry(Generic[TService]):
+    """
+    A process-wide cache of generation services.
+
+    Each service is built once per service name by the factory and then reused, so the provider clients (and
+    their connection pools) it holds live for the lifetime of the process instead of a single call.
+
+    :raises NotImplementedError: If the factory does not know the service name. Failures are never cached.
+    """
+
+    def __init__(self, factory: Callable[[str], TService]):
+        self._factory = factory
+        self._services: Dict[str, TService] = {}
+        self._lock = threading.Lock()
+
+    def get(self, service_name: str) -> TService:
+        service = self._services.get(service_name)
+        if service is not None:
+            return service
+
+        with self._lock:
+            service = self._services.get(service_name)
+            if service is None:
+                service = self._factory(service_name)
+                self._services[service_name] = service
+            return service
+
+    def names(self) -> List[str]:
+        return list(self._services.keys())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._services.clear()
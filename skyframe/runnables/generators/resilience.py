@@ -0,0 +1,245 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, List, Optional, Tuple, TypeVar
+
+from skyframe.settings.runnables.generators.resilience import ResilienceSettings
+from skyframe.utils import logger
+from .registry import ServiceRegistry
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits, server errors and Anthropic's 'overloaded'.
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+# Provider SDK errors raised when the request never got a response. Matched by name so no SDK has to be imported.
+RETRYABLE_ERROR_NAMES = {'APIConnectionError', 'APITimeoutError'}
+
+_STREAM_END = object()
+
+
+def unwrap_error(error: BaseException) -> BaseException:
+    """
+    Returns the provider error that the framework wrapped in ConversionException or GenerationException.
+    """
+    while getattr(error, 'inner_exception', None) is not None:
+        error = error.inner_exception
+    return error
+
+
+def is_retryable(error: BaseException) -> bool:
+    error = unwrap_error(error)
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    if any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__):
+        return True
+    return getattr(error, 'status_code', None) in RETRYABLE_STATUS_CODES
+
+
+def _get_retry_after(error: BaseException) -> Optional[float]:
+    response = getattr(unwrap_error(error), 'response', None)
+    headers = getattr(response, 'headers', None)
+    if headers is None:
+        return None
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class LatencyTracker:
+    """
+    A rolling window of recent call latencies.
+    """
+
+    def __init__(self, size: int = 256):
+        self._latencies: Deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._latencies)
+
+    def add(self, latency: float) -> None:
+        self._latencies.append(latency)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        if not self._latencies:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[min(int(len(latencies) * percentile), len(latencies) - 1)]
+
+
+latency_trackers: ServiceRegistry[LatencyTracker] = ServiceRegistry(lambda name: LatencyTracker())
+
+
+class ResiliencePolicy:
+    """
+    Runs calls to a generation service with retries, per-attempt timeouts and hedging.
+
+    Retryable errors (timeouts, connection errors, 408/409/429/5xx) are retried with exponential backoff and
+    jitter. If hedging is on, a duplicate attempt is started once an attempt runs longer than the hedge delay;
+    the first attempt to succeed wins and the others are cancelled.
+
+    :param settings: The retry, timeout and hedging settings.
+    :param name: Identifies the service and model. Latencies for hedging are tracked per name.
+    """
+
+    def __init__(self, settings: ResilienceSettings, name: str):
+        self.settings = settings
+        self.name = name
+
+    def _get_backoff(self, retry: int, error: BaseException) -> float:
+        backoff = min(self.settings.initial_backoff * self.settings.backoff_multiplier ** retry, self.settings.max_backoff)
+        if self.settings.jitter:
+            backoff = random.uniform(0, backoff)
+        retry_after = _get_retry_after(error)
+        if retry_after is not None:
+            backoff = max(backoff, retry_after)
+        return backoff
+
+    def _get_hedge_delay(self, latencies: LatencyTracker) -> Optional[float]:
+        if not self.settings.hedge:
+            return None
+        if self.settings.hedge_delay is not None:
+            return self.settings.hedge_delay
+        if len(latencies) < self.settings.hedge_min_samples:
+            return None
+        return latencies.percentile(self.settings.hedge_percentile)
+
+    async def _attempt(self, factory: Callable[[], Awaitable[T]], latencies: LatencyTracker) -> T:
+        start = time.monotonic()
+        if self.settings.attempt_timeout is not None:
+            result = await asyncio.wait_for(factory(), self.settings.attempt_timeout)
+        else:
+            result = await factory()
+        latencies.add(time.monotonic() - start)
+        return result
+
+    async def _run_hedged(
+            self,
+            factory: Callable[[], Awaitable[T]],
+            latencies: LatencyTracker,
+            discard: Optional[Callable[[T], Any]],
+    ) -> T:
+        hedge_delay = self._get_hedge_delay(latencies)
+        if hedge_delay is None:
+            return await self._attempt(factory, latencies)
+
+        tasks: List[asyncio.Task] = [asyncio.ensure_future(self._attempt(factory, latencies))]
+        pending = set(tasks)
+        winner: Optional[asyncio.Task] = None
+        try:
+            while True:
+                can_hedge = len(tasks) <= self.settings.max_hedges
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=hedge_delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    logger.debug(f"'{self.name}' is slower than {hedge_delay:.2f} seconds. Sending a hedged request.")
+                    task = asyncio.ensure_future(self._attempt(factory, latencies))
+                    tasks.append(task)
+                    pending.add(task)
+                    continue
+
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        winner = task
+                        return task.result()
+
+                if not pending:
+                    # Every attempt failed. Raise the error of the first one.
+                    return tasks[0].result()
+        finally:
+            for task in tasks:
+                if task is winner:
+                    continue
+                if not task.done():
+                    task.cancel()
+                elif discard is not None and not task.cancelled() and task.exception() is None:
+                    discard(task.result())
+                # Mark the losers' errors as retrieved.
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def run(
+            self,
+            factory: Callable[[], Awaitable[T]],
+            discard: Optional[Callable[[T], Any]] = None,
+    ) -> T:
+        """
+        Runs factory() under the policy.
+
+        :param factory: Starts one attempt of the call. Called once per attempt and hedge.
+        :param discard: Called with the results of successful attempts that lost a hedge race.
+        :return: The result of the first successful attempt.
+        """
+        latencies = latency_trackers.get(self.name)
+        retry = 0
+        while True:
+            try:
+                return await self._run_hedged(factory, latencies, discard)
+            except Exception as e:
+                if retry >= self.settings.max_retries or not is_retryable(e):
+                    raise
+                backoff = self._get_backoff(retry, e)
+                retry += 1
+                logger.warning(
+                    f"'{self.name}' failed with a retryable error ({type(unwrap_error(e)).__name__}: {e}). "
+                    f"Retry {retry}/{self.settings.max_retries} in {backoff:.2f} seconds."
+                )
+                await asyncio.sleep(backoff)
+
+    async def open_stream(self, factory: Callable[[], Awaitable[AsyncIterator[T]]]) -> AsyncIterator[T]:
+        """
+        Opens a stream under the policy. An attempt succeeds once the first chunk arrives, so only failures before
+        the first chunk are retried or hedged. Errors after that are raised to the consumer.
+
+        :param factory: Opens one attempt of the stream.
+        :return: An iterator over the chunks of the winning stream.
+        """
+        def discard(result: Tuple[AsyncIterator[T], Any]) -> None:
+            asyncio.ensure_future(aclose_stream(result[0]))
+
+        iterator, first = await ResiliencePolicy(self.settings, f'{self.name}/stream').run(
+            lambda: open_stream_prefetched(factory),
+            discard
+        )
+        return resume_stream(iterator, first)
+
+
+async def open_stream_prefetched(factory: Callable[[], Awaitable[AsyncIterator[T]]]) -> Tuple[AsyncIterator[T], Any]:
+    """
+    Opens a stream and waits for its first chunk, so failures that happen before any output are raised here.
+
+    :return: The stream and its first chunk. Pass both to resume_stream to iterate the whole stream.
+    """
+    iterator = await factory()
+    try:
+        first = await iterator.__anext__()
+    except StopAsyncIteration:
+        return iterator, _STREAM_END
+    except BaseException:
+        await aclose_stream(iterator)
+        raise
+    return iterator, first
+
+
+async def aclose_stream(iterator: AsyncIterator) -> None:
+    aclose = getattr(iterator, 'aclose', None)
+    if aclose is not None:
+        try:
+            await aclose()
+        except Exception as e:
+            logger.debug(f"Error while closing a discarded stream: {e}")
+
+
+async def resume_stream(iterator: AsyncIterator[T], first: Any) -> AsyncIterator[T]:
+    try:
+        if first is _STREAM_END:
+            return
+        yield first
+        async for item in iterator:
+            yield item
+    finally:
+        await aclose_stream(iterator)
@@ -3,6 +3,7 @@ from uuid import UUID
 
 from skyframe.exceptions import GenerationException
 from skyframe.runnables.models import RunContext
+from skyframe.runnables.tracing import run_scope
 from .models import SpeechToTextGenerationParams, SpeechToTextRequest, SpeechToTextResponse, \
     SpeechToTextResponseChunk
 from .services import BaseSpeechToTextGenerationService, get_speech_to_text_generation_service
@@ -30,6 +31,7 @@ class SpeechToTextGenerator(BaseGenerator[SpeechToTextGenerationParams]):
                 inner_exception=e
             )
 
+    @run_scope
     async def run_async(
             self,
             request: SpeechToTextRequest,
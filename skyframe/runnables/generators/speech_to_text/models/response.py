@@ -1,6 +1,5 @@
 from typing import Optional, List, Dict
 
-import numpy as np
 from pydantic import BaseModel, Field
 
 
@@ -47,13 +46,13 @@ class SpeechToTextResponse(BaseModel):
 
     tokens: List[int] = Field(default_factory=list)
 
-    avg_logprob: float = Field(default=np.nan)
+    avg_logprob: float = Field(default=float('nan'))
 
-    no_speech_prob: float = Field(default=np.nan)
+    no_speech_prob: float = Field(default=float('nan'))
 
-    temperature: float = Field(default=np.nan)
+    temperature: float = Field(default=float('nan'))
 
-    compression_ratio: float = Field(default=np.nan)
+    compression_ratio: float = Field(default=float('nan'))
 
     @classmethod
     def from_chunks(
@@ -1,2 +1,12 @@
+from typing import TYPE_CHECKING
+
 from .generator import TextGenerator
+from .cache import BaseTextResponseCache, ExactTextResponseCache
 from .models import *
+from .stop_predicates import StopPredicate, stop_after_json, stop_after_matches
+from skyframe._lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {'SemanticTextResponseCache': '.cache'})
+
+if TYPE_CHECKING:
+    from .cache import SemanticTextResponseCache
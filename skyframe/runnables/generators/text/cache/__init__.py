@@ -0,0 +1,19 @@
+from typing import TYPE_CHECKING
+
+from .base import BaseTextResponseCache
+from .exact import ExactTextResponseCache
+from .key import get_text_request_key
+from skyframe._lazy import lazy_exports
+
+# The semantic cache needs numpy and the embeddings generator, so it is imported on first access (PEP 562).
+__getattr__, __dir__ = lazy_exports(__name__, {'SemanticTextResponseCache': '.semantic'})
+
+if TYPE_CHECKING:
+    from .semantic import SemanticTextResponseCache
+
+__all__ = [
+    "BaseTextResponseCache",
+    "ExactTextResponseCache",
+    "get_text_request_key",
+    "SemanticTextResponseCache",
+]
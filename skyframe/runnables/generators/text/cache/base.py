@@ -0,0 +1,56 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from skyframe.models.token_usage import TokenUsage
+from ..models import TextGenerationRequest, TextGenerationParams, TextResponse
+
+
+class BaseTextResponseCache(BaseModel, ABC):
+    """
+    Base class for caches that sit in front of a TextGenerator.
+    """
+
+    deterministic_only: bool = Field(default=False)
+    """ Only cache calls that are expected to be repeatable (temperature 0 or a fixed seed). """
+
+    def is_cacheable(self, generation_params: TextGenerationParams) -> bool:
+        if generation_params.stream:
+            return False
+        if self.deterministic_only:
+            return generation_params.temperature == 0 or generation_params.seed is not None
+        return True
+
+    @staticmethod
+    def as_cache_hit(response: TextResponse) -> TextResponse:
+        """ Returns a copy of a cached response that is marked as a cache hit and costs nothing. """
+        return response.model_copy(
+            deep=True,
+            update={'cache_hit': True, 'token_usage': TokenUsage()}
+        )
+
+    @abstractmethod
+    async def get(
+            self,
+            request: TextGenerationRequest,
+            generation_params: TextGenerationParams,
+            service_name: str,
+            default_model: Optional[str] = None,
+    ) -> Optional[TextResponse]:
+        """ Returns the cached response for the request, or None on a miss. """
+
+    @abstractmethod
+    async def set(
+            self,
+            request: TextGenerationRequest,
+            generation_params: TextGenerationParams,
+            service_name: str,
+            response: TextResponse,
+            default_model: Optional[str] = None,
+    ) -> None:
+        """ Stores the response for the request. """
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """ Removes every entry from the cache. """
@@ -0,0 +1,159 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from pydantic import Field, PrivateAttr
+
+from skyframe.utils import logger
+from .base import BaseTextResponseCache
+from .key import get_text_request_key
+from ..models import TextGenerationRequest, TextGenerationParams, TextResponse
+
+
+class ExactTextResponseCache(BaseTextResponseCache):
+    """
+    Caches text responses by an exact hash of the request, the merged generation params and the service name.
+
+    Entries live in an in-memory LRU with a TTL. If disk_path is set, entries are also written to a sqlite
+    database so hits survive restarts.
+    """
+
+    max_size: int = Field(default=1024, ge=1)
+    """ The maximum number of responses kept in memory. """
+
+    ttl_seconds: Optional[float] = Field(default=3600, gt=0)
+    """ How long a response stays valid. None keeps responses until they are evicted. """
+
+    disk_path: Optional[str] = Field(default=None)
+    """ Path of a sqlite database used as a persistent second tier. """
+
+    _entries: 'OrderedDict[str, Tuple[Optional[float], TextResponse]]' = PrivateAttr(default_factory=OrderedDict)
+    _db: Optional[sqlite3.Connection] = PrivateAttr(default=None)
+    _db_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def _expires_at(self) -> Optional[float]:
+        return time.time() + self.ttl_seconds if self.ttl_seconds is not None else None
+
+    @staticmethod
+    def _is_expired(expires_at: Optional[float]) -> bool:
+        return expires_at is not None and expires_at <= time.time()
+
+    def _get_memory(self, key: str) -> Optional[TextResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, response = entry
+        if self._is_expired(expires_at):
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return response
+
+    def _set_memory(self, key: str, response: TextResponse, expires_at: Optional[float]) -> None:
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _get_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            Path(self.disk_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.disk_path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS text_responses '
+                '(key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL)'
+            )
+            self._db.commit()
+        return self._db
+
+    def _get_disk(self, key: str) -> Optional[Tuple[Optional[float], TextResponse]]:
+        with self._db_lock:
+            db = self._get_db()
+            row = db.execute('SELECT response, expires_at FROM text_responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+
+            response_json, expires_at = row
+            if self._is_expired(expires_at):
+                db.execute('DELETE FROM text_responses WHERE key = ?', (key,))
+                db.commit()
+                return None
+
+        return expires_at, TextResponse.model_validate_json(response_json)
+
+    def _set_disk(self, key: str, response: TextResponse, expires_at: Optional[float]) -> None:
+        with self._db_lock:
+            db = self._get_db()
+            db.execute(
+                'INSERT OR REPLACE INTO text_responses (key, response, expires_at) VALUES (?, ?, ?)',
+                (key, response.model_dump_json(), expires_at)
+            )
+            db.commit()
+
+    def _clear_disk(self) -> None:
+        with self._db_lock:
+            db = self._get_db()
+            db.execute('DELETE FROM text_responses')
+            db.commit()
+
+    async def get(
+            self,
+            request: TextGenerationRequest,
+            generation_params: TextGenerationParams,
+            service_name: str,
+            default_model: Optional[str] = None,
+    ) -> Optional[TextResponse]:
+        if not self.is_cacheable(generation_params):
+            return None
+
+        key = get_text_request_key(request, generation_params, service_name, default_model)
+
+        response = self._get_memory(key)
+        if response is None and self.disk_path is not None:
+            try:
+                entry = await asyncio.to_thread(self._get_disk, key)
+            except Exception as e:
+                logger.warning(f"Failed to read from the text response cache at '{self.disk_path}': {e}")
+                entry = None
+
+            if entry is not None:
+                expires_at, response = entry
+                self._set_memory(key, response, expires_at)
+
+        if response is None:
+            return None
+
+        return self.as_cache_hit(response)
+
+    async def set(
+            self,
+            request: TextGenerationRequest,
+            generation_params: TextGenerationParams,
+            service_name: str,
+            response: TextResponse,
+            default_model: Optional[str] = None,
+    ) -> None:
+        if not self.is_cacheable(generation_params):
+            return
+
+        key = get_text_request_key(request, generation_params, service_name, default_model)
+        expires_at = self._expires_at()
+        response = response.model_copy(deep=True)
+
+        self._set_memory(key, response, expires_at)
+        if self.disk_path is not None:
+            try:
+                await asyncio.to_thread(self._set_disk, key, response, expires_at)
+            except Exception as e:
+                logger.warning(f"Failed to write to the text response cache at '{self.disk_path}': {e}")
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        if self.disk_path is not None:
+            await asyncio.to_thread(self._clear_disk)
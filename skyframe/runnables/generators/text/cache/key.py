@@ -0,0 +1,59 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from skyframe.models.message import Message, MessageRole
+from ..models import TextGenerationRequest, TextGenerationParams
+
+# Params that change how a response is delivered, not what it contains.
+_IGNORED_PARAMS = {'stream', 'prompt_caching', 'cache_prefix_messages'}
+
+
+def canonical_messages(request: TextGenerationRequest) -> List[Dict[str, Any]]:
+    """
+    Returns the request as a list of plain message dicts (role, content, author name).
+    A plain string request is treated the same as a single user message.
+    """
+    if isinstance(request, str):
+        return [{'role': MessageRole.user.value, 'content': request, 'name': None}]
+    elif isinstance(request, Message):
+        request = [request]
+    elif not isinstance(request, list):
+        raise ValueError(f"Unknown request type: {type(request)}")
+
+    return [
+        {'role': message.role.value, 'content': message.content, 'name': message.author_name or None}
+        for message in request
+    ]
+
+
+def canonical_params(
+        generation_params: TextGenerationParams,
+        default_model: Optional[str] = None,
+) -> Dict[str, Any]:
+    params = {k: v for k, v in generation_params.to_dict().items() if k not in _IGNORED_PARAMS}
+    if default_model is not None:
+        params.setdefault('model', default_model)
+    return params
+
+
+def hash_canonical(data: Any) -> str:
+    dumped = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(dumped.encode('utf-8')).hexdigest()
+
+
+def get_text_request_key(
+        request: TextGenerationRequest,
+        generation_params: TextGenerationParams,
+        service_name: str,
+        default_model: Optional[str] = None,
+) -> str:
+    """
+    Returns a stable hash of everything that determines a text generation response:
+    the messages, the merged generation params and the service that generates it.
+    """
+    return hash_canonical({
+        'service': service_name,
+        'params': canonical_params(generation_params, default_model),
+        'messages': canonical_messages(request),
+    })
@@ -0,0 +1,211 @@
+import time
+from collections import OrderedDict
+from typing import Optional, List, Tuple
+
+import numpy as np
+from pydantic import Field, PrivateAttr
+
+from skyframe.models.message import Message, MessageRole
+from .base import BaseTextResponseCache
+from .key import canonical_messages, canonical_params, hash_canonical
+from ..models import TextGenerationRequest, TextGenerationParams, TextResponse
+from ...embeddings import EmbeddingsGenerator
+
+
+class _SemanticIndex:
+    """
+    A fixed-capacity matrix of unit-length prompt embeddings and the responses they produced.
+    When full, the least recently used entry is overwritten.
+    """
+
+    def __init__(self, capacity: int, dimensions: int):
+        self.vectors = np.zeros((capacity, dimensions), dtype=np.float32)
+        self.responses: List[Optional[TextResponse]] = [None] * capacity
+        self.expires_at = np.full(capacity, np.inf, dtype=np.float64)
+        self.last_used = np.zeros(capacity, dtype=np.int64)
+        self.size = 0
+        self._clock = 0
+
+    def _touch(self, slot: int) -> None:
+        self._clock += 1
+        self.last_used[slot] = self._clock
+
+    def search(self, vector: np.ndarray, threshold: float) -> Optional[TextResponse]:
+        if self.size == 0:
+            return None
+
+        similarities = self.vectors[:self.size] @ vector
+        similarities[self.expires_at[:self.size] <= time.time()] = -np.inf
+        slot = int(np.argmax(similarities))
+        if similarities[slot] < threshold:
+            return None
+
+        self._touch(slot)
+        return self.responses[slot]
+
+    def add(self, vector: np.ndarray, response: TextResponse, expires_at: float) -> None:
+        if self.size < len(self.responses):
+            slot = self.size
+            self.size += 1
+        else:
+            slot = int(np.argmin(self.last_used))
+
+        self.vectors[slot] = vector
+        self.responses[slot] = response
+        self.expires_at[slot] = expires_at
+        self._touch(slot)
+
+
+class SemanticTextResponseCache(BaseTextResponseCache):
+    """
+    Caches text responses by the meaning of the last user turn.
+
+    The last user message is embedded with the EmbeddingsGenerator and compared (cosine similarity) against
+    previously answered prompts. Entries are isolated per namespace: a namespace is the configured namespace
+    plus the service, the generation params, the system messages and the earlier turns of the conversation, so
+    different models, params, agents or system prompts never share hits, and a follow-up such as
+    "and in French?" only matches within a conversation with the same history.
+    """
+
+    embeddings_generator: EmbeddingsGenerator = Field(default_factory=EmbeddingsGenerator)
+    """ The generator used to embed the last user turn. """
+
+    similarity_threshold: float = Field(default=0.95, ge=-1, le=1)
+    """ The minimum cosine similarity for a cached prompt to count as a hit. """
+
+    namespace: Optional[str] = Field(default=None)
+    """ An extra namespace to isolate entries by, for example an agent id. """
+
+    max_entries_per_namespace: int = Field(default=512, ge=1)
+    """ The maximum number of responses kept per namespace. The least recently used entry is evicted first. """
+
+    max_namespaces: int = Field(default=64, ge=1)
+    """ The maximum number of namespaces kept. The least recently used namespace is evicted first. """
+
+    ttl_seconds: Optional[float] = Field(default=3600, gt=0)
+    """ How long a response stays valid. None keeps responses until they are evicted. """
+
+    _indexes: 'OrderedDict[str, _SemanticIndex]' = PrivateAttr(default_factory=OrderedDict)
+    _embeddings: 'OrderedDict[str, np.ndarray]' = PrivateAttr(default_factory=OrderedDict)
+
+    @staticmethod
+    def _get_last_user_turn(request: TextGenerationRequest) -> Optional[str]:
+        if isinstance(request, str):
+            return request
+        elif isinstance(request, Message):
+            return request.content if request.is_from(MessageRole.user) else None
+        elif isinstance(request, list):
+            for message in reversed(request):
+                if message.is_from(MessageRole.user):
+                    return message.content
+        return None
+
+    def _get_namespace(
+            self,
+            request: TextGenerationRequest,
+            generation_params: TextGenerationParams,
+            service_name: str,
+            default_model: Optional[str],
+    ) -> str:
+        messages = canonical_messages(request)
+        last_user_turn = max(
+            (i for i, m in enumerate(messages) if m['role'] == MessageRole.user.value),
+            default=None
+        )
+        system_messages = [m for m in messages if m['role'] == MessageRole.system.value]
+        # The meaning of a turn depends on the turns before it, so only the last user turn is matched by
+        # similarity and the rest of the conversation must match exactly.
+        history = [
+            m for i, m in enumerate(messages)
+            if i != last_user_turn and m['role'] != MessageRole.system.value
+        ]
+        return hash_canonical({
+            'namespace': self.namespace,
+            'service': service_name,
+            'params': canonical_params(generation_params, default_model),
+            'system': system_messages,
+            'history': history,
+        })
+
+    async def _embed(self, text: str) -> np.ndarray:
+        vector = self._embeddings.get(text)
+        if vector is not None:
+            self._embeddings.move_to_end(text)
+            return vector
+
+        response = await self.embeddings_generator.run_async(text)
+        vector = np.asarray(response.embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+
+        # get and set embed the same prompt, so keep the last few vectors around.
+        self._embeddings[text] = vector
+        while len(self._embeddings) > 256:
+            self._embeddings.popitem(last=False)
+        return vector
+
+    def _lookup(
+            self,
+            request: TextGenerationRequest,
+            generation_params: TextGenerationParams,
+            service_name: str,
+            default_model: Optional[str],
+    ) -> Tuple[Optional[str], Optional[str]]:
+        if not self.is_cacheable(generation_params):
+            return None, None
+        text = self._get_last_user_turn(request)
+        if not text:
+            return None, None
+        return self._get_namespace(request, generation_params, service_name, default_model), text
+
+    async def get(
+            self,
+            request: TextGenerationRequest,
+            generation_params: TextGenerationParams,
+            service_name: str,
+            default_model: Optional[str] = None,
+    ) -> Optional[TextResponse]:
+        namespace, text = self._lookup(request, generation_params, service_name, default_model)
+        if namespace is None:
+            return None
+
+        index = self._indexes.get(namespace)
+        if index is None:
+            return None
+        self._indexes.move_to_end(namespace)
+
+        response = index.search(await self._embed(text), self.similarity_threshold)
+        if response is None:
+            return None
+
+        return self.as_cache_hit(response)
+
+    async def set(
+            self,
+            request: TextGenerationRequest,
+            generation_params: TextGenerationParams,
+            service_name: str,
+            response: TextResponse,
+            default_model: Optional[str] = None,
+    ) -> None:
+        namespace, text = self._lookup(request, generation_params, service_name, default_model)
+        if namespace is None:
+            return
+
+        vector = await self._embed(text)
+
+        index = self._indexes.get(namespace)
+        if index is None:
+            index = _SemanticIndex(self.max_entries_per_namespace, len(vector))
+            self._indexes[namespace] = index
+            while len(self._indexes) > self.max_namespaces:
+                self._indexes.popitem(last=False)
+        self._indexes.move_to_end(namespace)
+
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds is not None else np.inf
+        index.add(vector, response.model_copy(deep=True), expires_at)
+
+    async def clear(self) -> None:
+        self._indexes.clear()
+        self._embeddings.clear()
@@ -1,16 +1,29 @@
-import time
-from typing import TypeVar, AsyncGenerator, List, Any, Optional, ClassVar
+import asyncio
+from typing import TypeVar, AsyncGenerator, List, Any, Optional, ClassVar, Callable, Dict, Union
 from uuid import UUID
 
+from pydantic import Field
+
 from skyframe.exceptions.generation import GenerationException
+from skyframe.models.stream_timings import StreamTimer
+from skyframe.models.token_usage import TokenUsage
 from skyframe.runnables.models import RunContext
+from skyframe.runnables.tracing import run_scope
+from skyframe.settings import framework_settings
 from skyframe.utils import logger
-from .models import TextGenerationParams, TextGenerationRequest, TextResponse, TextResponseChunk
+from .cache import BaseTextResponseCache, get_text_request_key
+from .models import TextGenerationParams, TextGenerationRequest, TextResponse, TextResponseChunk, TextResponseAccumulator, \
+    TextChoiceChunk, TextFanoutVariant, TextFanoutResponse
+from .stop_predicates import StopPredicate
 from .services import BaseTextGenerationService, get_text_generation_service
 from ..base import BaseGenerator
+from ..coalescing import RequestCoalescer
+from ..resilience import ResiliencePolicy, aclose_stream
 
 TGenerationService = TypeVar("TGenerationService", bound=BaseTextGenerationService)
 
+text_request_coalescer: RequestCoalescer = RequestCoalescer()
+
 
 # @evaluate
 class TextGenerator(BaseGenerator[TextGenerationParams]):
@@ -19,6 +32,13 @@ class TextGenerator(BaseGenerator[TextGenerationParams]):
 
     generator_name: ClassVar[str] = 'text'
 
+    response_cache: Optional[BaseTextResponseCache] = Field(default=None)
+    """ An optional cache that run_async checks before calling the generation service. """
+
+    accumulate_stream: bool = Field(default=True)
+    """ Whether run_stream assembles the full response for the end callbacks. If False, the end callbacks
+    receive response=None and no output is kept in memory while streaming. """
+
     def cleanup(self):
         del self.generation_params
         super().cleanup()
@@ -31,15 +51,17 @@ class TextGenerator(BaseGenerator[TextGenerationParams]):
         used += self.generation_params.try_set(**data)
         return used
 
-    def _get_generation_service(self) -> TGenerationService:
+    def _get_generation_service(self, service_name: Optional[str] = None) -> TGenerationService:
+        service_name = service_name or self.service_name
         try:
-            return get_text_generation_service(self.service_name)
+            return get_text_generation_service(service_name)
         except NotImplementedError as e:
             raise GenerationException(
-                message=f'Text Generation service {self.service_name} is not implemented',
+                message=f'Text Generation service {service_name} is not implemented',
                 inner_exception=e
             )
 
+    @run_scope
     def run(
             self,
             request: TextGenerationRequest,
@@ -68,7 +90,115 @@ class TextGenerator(BaseGenerator[TextGenerationParams]):
 
         return response
 
+    async def _get_cached_response(
+            self,
+            request: TextGenerationRequest,
+            generation_params: TextGenerationParams,
+            generation_service: BaseTextGenerationService,
+    ) -> Optional[TextResponse]:
+        if self.response_cache is None:
+            return None
+        try:
+            return await self.response_cache.get(
+                request,
+                generation_params,
+                self.service_name,
+                default_model=getattr(generation_service, 'default_model', None)
+            )
+        except Exception as e:
+            logger.warning(f'Error while reading from the text response cache: {e}')
+            return None
+
+    async def _set_cached_response(
+            self,
+            request: TextGenerationRequest,
+            generation_params: TextGenerationParams,
+            generation_service: BaseTextGenerationService,
+            response: TextResponse,
+    ) -> None:
+        if self.response_cache is None:
+            return
+        try:
+            await self.response_cache.set(
+                request,
+                generation_params,
+                self.service_name,
+                response,
+                default_model=getattr(generation_service, 'default_model', None)
+            )
+        except Exception as e:
+            logger.warning(f'Error while writing to the text response cache: {e}')
+
+    def _get_coalescing_key(
+            self,
+            request: TextGenerationRequest,
+            generation_params: TextGenerationParams,
+            generation_service: BaseTextGenerationService,
+            service_name: Optional[str] = None,
+    ) -> str:
+        return get_text_request_key(
+            request,
+            generation_params,
+            service_name or self.service_name,
+            default_model=getattr(generation_service, 'default_model', None)
+        )
+
+    def _get_service_policy(
+            self,
+            generation_params: TextGenerationParams,
+            generation_service: BaseTextGenerationService,
+            service_name: Optional[str] = None,
+    ) -> ResiliencePolicy:
+        model = generation_params.model or getattr(generation_service, 'default_model', None)
+        return self._get_resilience_policy(service_name or self.service_name, str(model))
+
+    async def _generate(
+            self,
+            request: TextGenerationRequest,
+            generation_params: TextGenerationParams,
+            generation_service: BaseTextGenerationService,
+            service_name: Optional[str] = None,
+    ) -> TextResponse:
+        policy = self._get_service_policy(generation_params, generation_service, service_name)
+
+        async def generate() -> TextResponse:
+            return await policy.run(
+                lambda: generation_service.run_async(request=request, generation_params=generation_params)
+            )
+
+        if not self.coalesce_requests:
+            return await generate()
+
+        return await text_request_coalescer.run(
+            self._get_coalescing_key(request, generation_params, generation_service, service_name),
+            generate,
+            copy=lambda response: response.model_copy(deep=True)
+        )
+
+    async def _generate_stream(
+            self,
+            request: TextGenerationRequest,
+            generation_params: TextGenerationParams,
+            generation_service: BaseTextGenerationService,
+    ) -> AsyncGenerator[TextResponseChunk, None]:
+        policy = self._get_service_policy(generation_params, generation_service)
+
+        async def generate() -> AsyncGenerator[TextResponseChunk, None]:
+            return await policy.open_stream(
+                lambda: generation_service.run_stream(request=request, generation_params=generation_params)
+            )
+
+        if not self.coalesce_requests:
+            return await generate()
+
+        return await text_request_coalescer.stream(
+            self._get_coalescing_key(request, generation_params, generation_service),
+            generate,
+            max_replay_chunks=framework_settings.runnables.generators.text.coalescing_replay_chunks
+        )
+
     # @evaluate_async('_eval_run')
+    @run_scope
     async def run_async(
             self,
             request: TextGenerationRequest,
@@ -81,14 +211,17 @@ class TextGenerator(BaseGenerator[TextGenerationParams]):
         context = self._begin_run(run_id=run_id, generation_params=generation_params)
         generation_service = self._get_generation_service()
 
+        cached_response = await self._get_cached_response(request, generation_params, generation_service)
+        if cached_response is not None:
+            await self._invoke_callback_async('on_text_generation_start', request=request, cache_hit=True, **context)
+            await self._invoke_callback_async('on_text_generation_end', response=cached_response, cache_hit=True, **context)
+            return cached_response
+
         await self._invoke_callback_async('on_text_generation_start', request=request, **context)
 
         try:
             # service_call = ServiceCall(service_name=self.service_name, service_type='text_generation')
-            response: TextResponse = await generation_service.run_async(
-                request=request,
-                generation_params=generation_params
-            )
+            response: TextResponse = await self._generate(request, generation_params, generation_service)
             # service_call.end(response=response)
         except Exception as e:
             await self._invoke_callback_async('on_text_generation_error', error=e, **context)
@@ -97,31 +230,44 @@ class TextGenerator(BaseGenerator[TextGenerationParams]):
                 inner_exception=e
             )
 
+        await self._set_cached_response(request, generation_params, generation_service, response)
+
         await self._invoke_callback_async('on_text_generation_end', response=response, **context)
 
         return response
 
+    @run_scope
     async def run_stream(
             self,
             request: TextGenerationRequest,
             *,
             override_params: Optional[TextGenerationParams] = None,
             run_id: Optional[UUID] = None,
+            stop_when: Optional[Union[StopPredicate, List[StopPredicate]]] = None,
     ) -> AsyncGenerator[TextResponseChunk, None]:
+        """
+        Streams the response to a request.
+
+        :param request: The request to generate a response for.
+        :param override_params: Params that override the generator's params.
+        :param run_id: The run id of the generation.
+        :param stop_when: Predicates called with the text of the first choice after every chunk. Once one returns
+            True, the upstream stream is closed (so no more tokens are generated or billed) and a final chunk with
+            finish_reason 'client_stop' is yielded.
+        """
         generation_params = self.generation_params.merge(override_params)
+        if callable(stop_when):
+            stop_when = [stop_when]
 
         context = self._begin_run(run_id=run_id, generation_params=generation_params)
         generation_service = self._get_generation_service()
 
         await self._invoke_callback_async('on_text_generation_start', request=request, **context)
 
-        start_time = time.time()
+        timer = StreamTimer()
 
         try:
-            generator = await generation_service.run_stream(
-                request=request,
-                generation_params=generation_params
-            )
+            generator = await self._generate_stream(request, generation_params, generation_service)
         except Exception as e:
             await self._invoke_callback_async('on_text_generation_error', error=e, **context)
             raise GenerationException(
@@ -129,18 +275,259 @@ class TextGenerator(BaseGenerator[TextGenerationParams]):
                 inner_exception=e
             )
 
-        chunks: List[TextResponseChunk] = []
+        accumulator = TextResponseAccumulator() if self.accumulate_stream else None
+        token_usage = None
+        text = ''
+
+        try:
+            async for chunk in generator:
+                if accumulator is not None:
+                    accumulator.add(chunk)
+                if chunk.token_usage is not None:
+                    token_usage = chunk.token_usage
+                timer.chunk(any(choice.content for choice in chunk.choices))
+                await self._invoke_callback_async('on_text_generation_chunk', chunk=chunk, **context)
+                yield chunk
+
+                if not stop_when:
+                    continue
+                content = ''.join(choice.content for choice in chunk.choices if choice.index == 0 and choice.content)
+                if not content:
+                    continue
+                text += content
+                if any(predicate(text) for predicate in stop_when):
+                    await aclose_stream(generator)
+                    chunk = TextResponseChunk(
+                        id=chunk.id,
+                        index=chunk.index + 1,
+                        choices=[TextChoiceChunk(index=0, finish_reason='client_stop')],
+                        created_at=chunk.created_at,
+                        model=chunk.model,
+                        is_final=True,
+                        # The usage reported before the stop, since the upstream's final usage chunk never arrives.
+                        token_usage=token_usage,
+                    )
+                    if accumulator is not None:
+                        accumulator.add(chunk)
+                    await self._invoke_callback_async('on_text_generation_chunk', chunk=chunk, **context)
+                    yield chunk
+                    break
+        except Exception as e:
+            await self._invoke_callback_async('on_text_generation_error', error=e, **context)
+            raise
+        except (GeneratorExit, asyncio.CancelledError):
+            # The consumer stopped iterating or was cancelled. End the run, so it is not left open.
+            await aclose_stream(generator)
+            timings = timer.finish(token_usage.completion if token_usage is not None else None)
+            await self._invoke_callback_async(
+                'on_text_generation_end', response=None, timings=timings, abandoned=True, **context
+            )
+            raise
+
+        timings = timer.finish(token_usage.completion if token_usage is not None else None)
+        response = accumulator.build() if accumulator is not None else None
+        if response is not None:
+            response.timings = timings
+        logger.info(
+            f'Called TextGeneration service {self.service_name} in {round(timings.total_time, 2)} seconds '
+            f'(first token after {round(timings.time_to_first_token or 0, 2)} seconds). Usage {token_usage}'
+        )
+
+        await self._invoke_callback_async('on_text_generation_end', response=response, timings=timings, **context)
 
-        async for chunk in generator:
-            chunks.append(chunk)
-            await self._invoke_callback_async('on_text_generation_chunk', chunk=chunk, **context)
-            yield chunk
+    @run_scope
+    async def run_fanout(
+            self,
+            request: TextGenerationRequest,
+            variants: List[Union[TextFanoutVariant, TextGenerationParams, str]],
+            *,
+            select: Optional[Callable[[TextResponse], bool]] = None,
+            score: Optional[Callable[[TextResponse], float]] = None,
+            override_params: Optional[TextGenerationParams] = None,
+            run_id: Optional[UUID] = None,
+    ) -> TextFanoutResponse:
+        """
+        Sends the same request for every variant concurrently and returns a single winner.
+
+        - Without select or score, the first response to arrive wins.
+        - With select, the first response that passes select wins.
+        - With score, every variant is awaited and the highest scoring response wins. If select is also given,
+          only responses that pass it are scored.
+
+        Variants that are still running once the winner is decided are cancelled. Variants that fail are skipped.
+
+        :param request: The request to send to every variant.
+        :param variants: The variants to run. A variant can be given as TextGenerationParams that override the
+            generator's params, as a service name, or as a TextFanoutVariant for both.
+        :param select: A predicate a response has to pass to win.
+        :param score: Ranks the responses. Higher is better.
+        :param override_params: Params that override the generator's params for every variant.
+        :param run_id: The run id of the fanout.
+        :return: The winning response, with the combined token usage of every variant that completed.
+        :raises GenerationException: If every variant failed, or no response passed select.
+        """
+        if not variants:
+            raise ValueError('run_fanout needs at least one variant')
+
+        generation_params = self.generation_params.merge(override_params)
+        context = self._begin_run(run_id=run_id, generation_params=generation_params)
+
+        await self._invoke_callback_async('on_text_generation_start', request=request, **context)
 
-        response = TextResponse.from_chunks(chunks)
-        logger.info(f'Called TextGeneration service {self.service_name} in {round(time.time() - start_time, 2)} seconds. Usage {response.token_usage}')
+        try:
+            response = await self._run_fanout(request, variants, generation_params, select, score)
+        except Exception as e:
+            await self._invoke_callback_async('on_text_generation_error', error=e, **context)
+            if isinstance(e, GenerationException):
+                raise
+            raise GenerationException(
+                message=f'Error while generating text: {e}',
+                inner_exception=e
+            )
 
         await self._invoke_callback_async('on_text_generation_end', response=response, **context)
 
+        return response
+
+    @staticmethod
+    def _get_service_params(service_name: str, generation_params: TextGenerationParams) -> TextGenerationParams:
+        """
+        Returns the params for calling a service other than the generator's. The generator's model belongs to its
+        own service, so it is dropped, and the generation_params configured for the service in the text settings
+        (services.<service_name>.generation_params) are applied. Without a configured model the service uses its
+        default model.
+        """
+        params = generation_params.model_copy()
+        params.model = None
+        service_params = framework_settings.runnables.generators.text.get_service_value(service_name, 'generation_params')
+        if service_params:
+            params = params.merge(TextGenerationParams.model_validate(service_params))
+        return params
+
+    async def _run_fanout(
+            self,
+            request: TextGenerationRequest,
+            variants: List[Union[TextFanoutVariant, TextGenerationParams, str]],
+            generation_params: TextGenerationParams,
+            select: Optional[Callable[[TextResponse], bool]],
+            score: Optional[Callable[[TextResponse], float]],
+    ) -> TextFanoutResponse:
+        tasks: Dict[asyncio.Future, int] = {}
+        for index, variant in enumerate(variants):
+            if isinstance(variant, TextGenerationParams):
+                variant = TextFanoutVariant(generation_params=variant)
+            elif isinstance(variant, str):
+                variant = TextFanoutVariant(service_name=variant)
+
+            service_name = variant.service_name or self.service_name
+            generation_service = self._get_generation_service(service_name)
+            base_params = generation_params
+            if service_name != self.service_name:
+                base_params = self._get_service_params(service_name, generation_params)
+            variant_params = base_params.merge(variant.generation_params)
+            task = asyncio.ensure_future(self._generate(request, variant_params, generation_service, service_name))
+            tasks[task] = index
+
+        responses: List[Optional[TextResponse]] = [None] * len(variants)
+        errors: List[BaseException] = []
+        winner_index: Optional[int] = None
+        try:
+            pending = set(tasks)
+            while pending and winner_index is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Handle the finished tasks in variant order so ties resolve to the earlier variant.
+                for task in sorted(done, key=tasks.get):
+                    if task.cancelled():
+                        continue
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                        continue
+                    response = task.result()
+                    responses[tasks[task]] = response
+                    if score is None and winner_index is None and (select is None or select(response)):
+                        winner_index = tasks[task]
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            # Wait for the cancelled tasks so none of them outlive the fanout.
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if score is not None:
+            candidates = [
+                index for index, response in enumerate(responses)
+                if response is not None and (select is None or select(response))
+            ]
+            if candidates:
+                winner_index = max(candidates, key=lambda index: score(responses[index]))
+
+        if winner_index is None:
+            if all(response is None for response in responses):
+                raise GenerationException(
+                    message=f'Every fanout variant failed: {errors[0] if errors else None}',
+                    inner_exception=errors[0] if errors else None
+                )
+            raise GenerationException(message='No fanout response passed the selector')
+
+        winner = responses[winner_index]
+        return TextFanoutResponse(
+            **{name: getattr(winner, name) for name in TextResponse.model_fields if name != 'token_usage'},
+            token_usage=TokenUsage.sum([response.token_usage for response in responses if response is not None]),
+            winner_index=winner_index,
+            responses=responses,
+        )
+
+    @run_scope
+    async def run_batch(
+            self,
+            requests: List[TextGenerationRequest],
+            *,
+            override_params: Optional[TextGenerationParams] = None,
+            parent_run_id: Optional[UUID] = None,
+    ) -> List[Optional[TextResponse]]:
+        """
+        Generates responses for many requests through the service's batch API.
+
+        Batches are processed asynchronously by the provider (within hours rather than seconds) at a discount,
+        and do not count against the interactive rate limits. Each request gets its own run and callbacks.
+
+        :param requests: The requests to generate responses for.
+        :param override_params: Params that override the generator's params for every request.
+        :param parent_run_id: The run id the runs of the individual requests are nested under.
+        :return: The responses in input order. An entry is None if its request failed.
+        """
+        generation_params = self.generation_params.merge(override_params)
+        generation_service = self._get_generation_service()
+
+        contexts = [
+            self._begin_run(parent_run_id=parent_run_id, generation_params=generation_params, nested=False, batch=True)
+            for _ in requests
+        ]
+        for request, context in zip(requests, contexts):
+            await self._invoke_callback_async('on_text_generation_start', request=request, **context)
+
+        try:
+            results = await generation_service.run_batch(requests=requests, generation_params=generation_params)
+        except Exception as e:
+            for context in contexts:
+                await self._invoke_callback_async('on_text_generation_error', error=e, **context)
+            raise GenerationException(
+                message=f'Error while generating text batch: {e}',
+                inner_exception=e
+            )
+
+        responses: List[Optional[TextResponse]] = []
+        for result, context in zip(results, contexts):
+            if isinstance(result, TextResponse):
+                await self._invoke_callback_async('on_text_generation_end', response=result, **context)
+                responses.append(result)
+            else:
+                error = result if result is not None else TimeoutError('The batch ended before the request was processed')
+                await self._invoke_callback_async('on_text_generation_error', error=error, **context)
+                responses.append(None)
+
+        return responses
+
     def get_token_count(
             self,
             request: TextGenerationRequest
@@ -152,6 +539,18 @@ class TextGenerator(BaseGenerator[TextGenerationParams]):
             generation_info=self.generation_params
         )
 
+    async def get_token_count_async(
+            self,
+            request: TextGenerationRequest
+    ) -> int:
+        generation_service = self._get_generation_service()
+
+        return await generation_service.get_token_count_async(
+            request=request,
+            generation_info=self.generation_params
+        )
+
+    @run_scope
     async def _eval_run(self, *args, **kwargs):
         logger.error('eval run kwargs', kwargs)
         request: TextGenerationRequest = args[0]
@@ -1,4 +1,5 @@
-from .choice import TextChoice, TextChoiceChunk, LogProb, TopLogprob
+from .choice import TextChoice, TextChoiceChunk, TextChoiceAccumulator, LogProb, TopLogprob
 from .generation_params import TextGenerationParams, OpenAiModelType, OpenaiResponseFormat
 from .request import TextGenerationRequest
-from .response import TextResponse, TextResponseChunk
+from .response import TextResponse, TextResponseChunk, TextResponseAccumulator
+from .fanout import TextFanoutVariant, TextFanoutResponse
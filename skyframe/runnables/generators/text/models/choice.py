@@ -2,7 +2,8 @@ from typing import Union, Literal, Optional, List
 
 from pydantic import BaseModel, Field, ConfigDict
 
-FinishReason = Union[str, Literal["stop", "length", "content_filter"]]
+# 'client_stop' means a stop predicate of TextGenerator.run_stream ended the stream on the client.
+FinishReason = Union[str, Literal["stop", "length", "content_filter", "client_stop"]]
 
 
 class TopLogprob(BaseModel):
@@ -63,25 +64,43 @@ class TextChoice(BaseModel):
         if not chunks or len(chunks) == 0:
             raise ValueError("Cannot create an LLMResponse from an empty list of chunks.")
 
-        index = chunks[0].index
-        content = ""
-        finish_reason = chunks[-1].finish_reason
-
-        role = chunks[0].role
-        logprobs = []
-
+        accumulator = TextChoiceAccumulator(chunks[0].index)
         for chunk in chunks:
-            if chunk.index != index:
-                raise ValueError("Cannot create an LLMResponse from LLMResponseChunks with different indices.")
-            if chunk.content is not None:
-                content += chunk.content
-            if chunk.logprobs is not None:
-                logprobs += chunk.logprobs
-
-        return cls(
-            index=index,
-            content=content,
-            finish_reason=finish_reason,
-            role=role,
-            logprobs=logprobs
+            accumulator.add(chunk)
+        return accumulator.build()
+
+
+class TextChoiceAccumulator:
+    """
+    Builds a TextChoice from its chunks as they arrive, in linear time and without keeping the chunks.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.role: Optional[str] = None
+        self.finish_reason: Optional[FinishReason] = None
+        self._content: List[str] = []
+        self._logprobs: List[LogProb] = []
+        self._has_chunks = False
+
+    def add(self, chunk: TextChoiceChunk) -> None:
+        if chunk.index != self.index:
+            raise ValueError("Cannot create an LLMResponse from LLMResponseChunks with different indices.")
+        if not self._has_chunks:
+            self.role = chunk.role
+            self._has_chunks = True
+        # Like before, the finish reason is taken from the last chunk.
+        self.finish_reason = chunk.finish_reason
+        if chunk.content is not None:
+            self._content.append(chunk.content)
+        if chunk.logprobs is not None:
+            self._logprobs.extend(chunk.logprobs)
+
+    def build(self) -> TextChoice:
+        return TextChoice(
+            index=self.index,
+            content=''.join(self._content),
+            finish_reason=self.finish_reason,
+            role=self.role,
+            logprobs=list(self._logprobs)
         )
@@ -0,0 +1,34 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from .generation_params import TextGenerationParams
+from .response import TextResponse
+
+
+class TextFanoutVariant(BaseModel):
+    """
+    One of the concurrent requests made by TextGenerator.run_fanout.
+    """
+
+    service_name: Optional[str] = Field(default=None)
+    """The text generation service to call. Defaults to the generator's service. For another service the
+    generator's model is not used; the service's params from the text settings or its default model are."""
+
+    generation_params: Optional[TextGenerationParams] = Field(default=None)
+    """Params merged on top of the generator's params for this variant. Use n for several choices per call."""
+
+
+class TextFanoutResponse(TextResponse):
+    """
+    The winning response of TextGenerator.run_fanout.
+
+    The id, choices and model are those of the winner. token_usage is the combined usage of every variant that
+    completed, since all of them are billed.
+    """
+
+    winner_index: int
+    """The index of the variant that produced the winning response."""
+
+    responses: List[Optional[TextResponse]] = Field(default_factory=list)
+    """The response of each variant, in variant order. None if the variant failed or was cancelled."""
@@ -111,6 +111,16 @@ class TextGenerationParams(BaseParams):
     user: Optional[str] = Field(default=None)
     """ The user name to use for the request. """
 
+    prompt_caching: Optional[bool] = Field(default=None)  # Anthropic only
+    """ Whether to mark the system prompt (and the conversation prefix set by cache_prefix_messages) for the
+    provider's prompt cache. Later requests that start with the same prefix read it from the cache, which is faster
+    and billed at a discount. Prefixes shorter than the model's minimum cacheable length are not cached. """
+
+    cache_prefix_messages: Optional[int] = Field(default=None)  # Anthropic only
+    """ The number of conversation messages after the system message that form a stable, cacheable prefix.
+    A negative value caches every message except the last ones, e.g. -1 caches the whole conversation except the
+    newest message. Only used if prompt_caching is enabled. """
+
     def merge(self, other: 'TextGenerationParams') -> 'TextGenerationParams':
         """
         Merges another TextGenerationParams into this one.
@@ -126,12 +136,14 @@ class TextGenerationParams(BaseParams):
         if other is None:
             return new_model
 
-        for k, v in other.model_dump(exclude_unset=True, exclude_defaults=True, exclude_none=True).items():
+        overrides = other.get_overrides()
+        for k, v in overrides.items():
             if k == 'stop':
                 new_model.add_stop(v)
             else:
                 setattr(new_model, k, v)
 
+        self._merge_dict(new_model, overrides)
         return new_model
 
     def add_stop(self, stop: Union[str, List[str]]):
@@ -141,10 +153,11 @@ class TextGenerationParams(BaseParams):
         """
         if self.stop is not None:
             if isinstance(self.stop, list):
+                # Build a new list: merged params share the list with the params they were copied from.
                 if isinstance(stop, list):
-                    self.stop += stop
+                    self.stop = self.stop + stop
                 else:
-                    self.stop.append(stop)
+                    self.stop = self.stop + [stop]
             else:
                 if isinstance(stop, list):
                     self.stop = [self.stop] + stop
@@ -2,8 +2,9 @@ from typing import List, Optional, Dict
 
 from pydantic import BaseModel, Field
 
+from skyframe.models.stream_timings import StreamTimings
 from skyframe.models.token_usage import TokenUsage
-from .choice import TextChoice, TextChoiceChunk
+from .choice import TextChoice, TextChoiceChunk, TextChoiceAccumulator
 
 
 class TextResponseChunk(BaseModel):
@@ -34,6 +35,9 @@ class TextResponseChunk(BaseModel):
     is_final: bool = Field(default=False)
     """ Whether or not this is the final chunk in the stream of chunks. """
 
+    token_usage: Optional[TokenUsage] = Field(default=None)
+    """ Usage information for the whole stream. Only set on the final chunk. """
+
     @property
     def response(self) -> Optional[TextChoiceChunk]:
         """ Returns the first choice from the list of choices. (Usually the only choice.) """
@@ -74,6 +78,12 @@ class TextResponse(BaseModel):
     token_usage: Optional[TokenUsage] = Field(default=None)
     """Usage information for the completion. Token counts, etc."""
 
+    cache_hit: bool = Field(default=False)
+    """Whether this response was served from a response cache instead of the service."""
+
+    timings: Optional[StreamTimings] = Field(default=None)
+    """Timing information of the stream the response was built from. Only set for streamed responses."""
+
     @property
     def choice(self) -> Optional[TextChoice]:
         """Returns the first choice from the completion. (Usually the only choice.)"""
@@ -96,30 +106,53 @@ class TextResponse(BaseModel):
         if not chunks or len(chunks) == 0:
             raise ValueError("Cannot create a Completion from an empty list of chunks.")
 
-        id = chunks[0].id
-        choices = []
-        created_at = chunks[-1].created_at
-        model = chunks[0].model
-        system_fingerprint = chunks[0].system_fingerprint
-        usage = None
-
-        # First we need to group the chunks by their index.
-        indexed_response_chunks: Dict[int, List[TextChoiceChunk]] = {}
+        accumulator = TextResponseAccumulator()
         for chunk in chunks:
-            if chunk.is_final:
-                continue
-            for response_chunk in chunk.choices:
-                indexed_response_chunks.setdefault(response_chunk.index, []).append(response_chunk)
-
-        # Now we can create the responses.
-        for index, response_chunks in indexed_response_chunks.items():
-            choices.append(TextChoice.from_chunks(response_chunks))
-
-        return cls(
-            id=id,
-            choices=choices,
-            created_at=created_at,
-            model=model,
-            system_fingerprint=system_fingerprint,
-            token_usage=usage
+            accumulator.add(chunk)
+        return accumulator.build()
+
+
+class TextResponseAccumulator:
+    """
+    Builds a TextResponse from a stream of chunks as they arrive.
+
+    Content is collected per choice and joined once at the end, so building is linear in the length of the
+    output, and chunk objects can be dropped as soon as they have been added.
+    """
+
+    def __init__(self):
+        self.id: Optional[str] = None
+        self.created_at: Optional[int] = None
+        self.model: Optional[str] = None
+        self.system_fingerprint: Optional[str] = None
+        self.token_usage: Optional[TokenUsage] = None
+        self._choices: Dict[int, TextChoiceAccumulator] = {}
+
+    def add(self, chunk: TextResponseChunk) -> None:
+        if self.id is None:
+            self.id = chunk.id
+            self.model = chunk.model
+            self.system_fingerprint = chunk.system_fingerprint
+        self.created_at = chunk.created_at
+        if chunk.token_usage is not None:
+            self.token_usage = chunk.token_usage
+
+        # Final chunks from the services have no choices. The one emitted for a client stop carries the finish reason.
+        for choice_chunk in chunk.choices:
+            choice = self._choices.get(choice_chunk.index)
+            if choice is None:
+                choice = self._choices[choice_chunk.index] = TextChoiceAccumulator(choice_chunk.index)
+            choice.add(choice_chunk)
+
+    def build(self) -> TextResponse:
+        if self.id is None:
+            raise ValueError("Cannot create a Completion from an empty list of chunks.")
+
+        return TextResponse(
+            id=self.id,
+            choices=[choice.build() for choice in self._choices.values()],
+            created_at=self.created_at,
+            model=self.model,
+            system_fingerprint=self.system_fingerprint,
+            token_usage=self.token_usage
         )
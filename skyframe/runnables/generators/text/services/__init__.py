@@ -1,2 +1,3 @@
 from .base import BaseTextGenerationService
 from .get import get_text_generation_service
+from .tokenizer import TokenizerService, tokenizer_service
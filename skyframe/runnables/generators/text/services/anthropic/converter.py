@@ -2,7 +2,7 @@ import time
 from typing import Optional, List, Literal, AsyncGenerator
 
 from anthropic import AsyncStream, AsyncMessageStreamManager
-from anthropic.types import RawMessageStreamEvent
+from anthropic.types import RawMessageStreamEvent, TextBlockParam
 from anthropic.types.message import Message as AnthropicMessage, ContentBlock
 from anthropic.types.message_create_params import (
     MessageCreateParams,
@@ -13,17 +13,23 @@ from anthropic.types.usage import Usage
 from devtools import debug
 from skyframe.utils import logger
 
-from skyframe import Message, MessageRole, TokenUsage, TextResponseChunk, TextChoiceChunk
+from skyframe.models import Message, MessageRole, TokenUsage
 from skyframe.exceptions import ConversionException
 from ...models import (
     TextResponse,
+    TextResponseChunk,
     TextChoice,
+    TextChoiceChunk,
     TextGenerationParams,
     TextGenerationRequest,
 )
+from ..message_cache import MessageParamCache
 
 STOP_REASON = Literal["end_turn", "max_tokens", "stop_sequence", "tool_use"]
 
+# Marks the end of a prompt prefix that Anthropic should cache.
+CACHE_CONTROL = {"type": "ephemeral"}
+
 
 class AnthropicGenerationConverter:
     @staticmethod
@@ -38,14 +44,9 @@ class AnthropicGenerationConverter:
         """
         try:
             if isinstance(request, Message):
-                return [
-                    AnthropicGenerationConverter.to_anthropic_message_param(request)
-                ]
+                return [_message_params.get(request)]
             elif isinstance(request, list):
-                return [
-                    AnthropicGenerationConverter.to_anthropic_message_param(message)
-                    for message in request
-                ]
+                return [_message_params.get(message) for message in request]
             elif isinstance(request, str):
                 return [{"content": request, "role": "user"}]
             else:
@@ -80,6 +81,31 @@ class AnthropicGenerationConverter:
                 inner_exception=e,
             )
 
+    @staticmethod
+    def to_cached_content(content: str) -> List[TextBlockParam]:
+        """
+        Converts message content to a text block that ends a cached prompt prefix
+
+        :param content: The content of the system prompt or message
+        :return: The content as a list with a single text block marked with cache_control
+        """
+        return [{"type": "text", "text": content, "cache_control": CACHE_CONTROL}]
+
+    @staticmethod
+    def get_cache_prefix_length(message_count: int, cache_prefix_messages: Optional[int]) -> int:
+        """
+        Returns the number of leading messages to cache, resolving a negative cache_prefix_messages from the end
+
+        :param message_count: The number of messages in the request, without the system message
+        :param cache_prefix_messages: The cache_prefix_messages generation param
+        :return: The number of leading messages that form the cached prefix
+        """
+        if cache_prefix_messages is None:
+            return 0
+        if cache_prefix_messages < 0:
+            return max(message_count + cache_prefix_messages, 0)
+        return min(cache_prefix_messages, message_count)
+
     @staticmethod
     def to_completion_create_params(
         request: TextGenerationRequest,
@@ -120,13 +146,13 @@ class AnthropicGenerationConverter:
             else:
                 stop = [generation_params.stop]
 
+            messages = AnthropicGenerationConverter.to_anthropic_message_params(request)
+
             params: MessageCreateParamsBase = {
                 "max_tokens": generation_params.max_tokens
                 if generation_params.max_tokens is not None
                 else 1024,
-                "messages": AnthropicGenerationConverter.to_anthropic_message_params(
-                    request
-                ),
+                "messages": messages,
                 "model": model or str(generation_params.model),
             }
 
@@ -134,6 +160,19 @@ class AnthropicGenerationConverter:
                 params["stop_sequences"] = stop
             if system:
                 params["system"] = system
+            if generation_params.prompt_caching:
+                # Everything up to and including a block with cache_control is cached, so only the last block of
+                # each prefix is marked.
+                if system:
+                    params["system"] = AnthropicGenerationConverter.to_cached_content(system)
+                prefix_length = AnthropicGenerationConverter.get_cache_prefix_length(
+                    len(messages), generation_params.cache_prefix_messages
+                )
+                if prefix_length > 0 and isinstance(messages[prefix_length - 1]["content"], str):
+                    messages[prefix_length - 1] = {
+                        **messages[prefix_length - 1],
+                        "content": AnthropicGenerationConverter.to_cached_content(messages[prefix_length - 1]["content"]),
+                    }
             if generation_params.temperature:
                 params["temperature"] = generation_params.temperature
             if generation_params.top_k:
@@ -218,14 +257,23 @@ class AnthropicGenerationConverter:
         """
         try:
             from .service import AnthropicGenerationService
+            # Anthropic reports cached prompt tokens separately from input_tokens.
+            cache_read = usage.cache_read_input_tokens or 0
+            cache_write = usage.cache_creation_input_tokens or 0
+            prompt = usage.input_tokens + cache_read + cache_write
             token_usage = TokenUsage(
-                total=usage.input_tokens + usage.output_tokens,
-                prompt=usage.input_tokens,
+                total=prompt + usage.output_tokens,
+                prompt=prompt,
                 completion=usage.output_tokens,
+                cache_read=cache_read,
+                cache_write=cache_write,
+            )
+            token_usage.calculate_cost(
+                AnthropicGenerationService.get_cost_per_input_token(model_name),
+                AnthropicGenerationService.get_cost_per_output_token(model_name),
+                AnthropicGenerationService.get_cost_per_cache_read_token(model_name),
+                AnthropicGenerationService.get_cost_per_cache_write_token(model_name),
             )
-            cost_per_input_token = AnthropicGenerationService.get_cost_per_input_token(model_name)
-            cost_per_output_token = AnthropicGenerationService.get_cost_per_output_token(model_name)
-            token_usage.calculate_cost(cost_per_input_token, cost_per_output_token)
             return token_usage
         except Exception as e:
             raise ConversionException(
@@ -248,12 +296,28 @@ class AnthropicGenerationConverter:
                 id = ''
                 model = ''
                 index = 0
+                input_tokens = 0
+                output_tokens = 0
+                cache_read_tokens = None
+                cache_write_tokens = None
                 async for event in stream:
                     # debug(event)
                     if event.type == 'message_start':
                         message: AnthropicMessage = event.message
                         id = message.id
                         model = message.model
+                        input_tokens = message.usage.input_tokens
+                        output_tokens = message.usage.output_tokens
+                        cache_read_tokens = message.usage.cache_read_input_tokens
+                        cache_write_tokens = message.usage.cache_creation_input_tokens
+
+                    if event.type == 'message_delta' and event.usage is not None:
+                        # message_delta usage is cumulative for the whole message.
+                        output_tokens = event.usage.output_tokens
+                        if event.usage.cache_read_input_tokens is not None:
+                            cache_read_tokens = event.usage.cache_read_input_tokens
+                        if event.usage.cache_creation_input_tokens is not None:
+                            cache_write_tokens = event.usage.cache_creation_input_tokens
 
                     if event.type == 'text':
                         yield TextResponseChunk(
@@ -275,6 +339,15 @@ class AnthropicGenerationConverter:
                     created_at=int(time.time()),
                     model=model,
                     is_final=True,
+                    token_usage=AnthropicGenerationConverter.from_usage(
+                        Usage(
+                            input_tokens=input_tokens,
+                            output_tokens=output_tokens,
+                            cache_read_input_tokens=cache_read_tokens,
+                            cache_creation_input_tokens=cache_write_tokens,
+                        ),
+                        model
+                    ),
                 )
         except Exception as e:
             debug(e)
@@ -283,4 +356,9 @@ class AnthropicGenerationConverter:
                 from_type=AsyncStream[RawMessageStreamEvent],
                 to_type=AsyncGenerator[TextResponseChunk, None],
                 inner_exception=e,
-            )
\ No newline at end of file
+            )
+
+
+_message_params: MessageParamCache[MessageParam] = MessageParamCache(
+    AnthropicGenerationConverter.to_anthropic_message_param
+)
@@ -1,16 +1,14 @@
-from typing import AsyncGenerator, Optional, Union
+from typing import AsyncGenerator, Optional
 
-import tiktoken
 from anthropic import Anthropic, AsyncAnthropic, AsyncMessageStreamManager
 from anthropic.types import Message as AnthropicMessage
 from anthropic.types.message_create_params import MessageCreateParamsBase
-from dotenv import load_dotenv
 
 from skyframe import framework_settings
-from skyframe import Message
 from skyframe.utils import logger
 from .converter import AnthropicGenerationConverter
 from ..base import BaseTextGenerationService
+from ....clients import get_anthropic_client, get_anthropic_client_sync
 from ...models import (
     TextGenerationParams,
     TextGenerationRequest,
@@ -18,20 +16,36 @@ from ...models import (
     TextResponseChunk,
 )
 
+# Prompt cache writes and reads are billed relative to the regular input token price.
+CACHE_WRITE_PRICE_MULTIPLIER = 1.25
+CACHE_READ_PRICE_MULTIPLIER = 0.1
+
 
 class AnthropicGenerationService(BaseTextGenerationService):
-    client: AsyncAnthropic
-    client_sync: Anthropic
     converter: AnthropicGenerationConverter
+    provider: str = 'anthropic'
     default_model: str = framework_settings.runnables.generators.text.get_service_value('anthropic', 'default_model') or "claude-3-5-sonnet-20240620"
 
     def __init__(self):
         super().__init__()
-        load_dotenv()
-        self.client = AsyncAnthropic()
-        self.client_sync = Anthropic()
         self.converter = AnthropicGenerationConverter()
 
+    @property
+    def client(self) -> AsyncAnthropic:
+        return get_anthropic_client(framework_settings.runnables.generators.text.http_client)
+
+    @property
+    def client_sync(self) -> Anthropic:
+        return get_anthropic_client_sync(framework_settings.runnables.generators.text.http_client)
+
+    @staticmethod
+    def get_cost_per_cache_read_token(model_name: str) -> float:
+        return BaseTextGenerationService.get_cost_per_input_token(model_name) * CACHE_READ_PRICE_MULTIPLIER
+
+    @staticmethod
+    def get_cost_per_cache_write_token(model_name: str) -> float:
+        return BaseTextGenerationService.get_cost_per_input_token(model_name) * CACHE_WRITE_PRICE_MULTIPLIER
+
     @staticmethod
     def _get_model_name(params: Optional[TextGenerationParams]) -> str:
         if params is None or params.model is None:
@@ -39,35 +53,6 @@ class AnthropicGenerationService(BaseTextGenerationService):
         else:
             return params.model
 
-    @staticmethod
-    def get_token_count(
-        request: TextGenerationRequest,
-        generation_info: Optional[Union[str, TextGenerationParams]],
-    ) -> int:
-        if isinstance(generation_info, str):
-            model = generation_info
-        elif isinstance(generation_info, TextGenerationParams):
-            model = generation_info.model
-        else:
-            logger.warning(
-                f"get_token_count called without a model name. Using default model '{AnthropicGenerationService.default_model}'."
-            )
-            model = AnthropicGenerationService.default_model
-
-        if isinstance(request, str):
-            request_str = request
-        elif isinstance(request, list):
-            request_str = Message.join_as_string(request)
-        elif isinstance(request, Message):
-            request_str = request.to_string()
-        else:
-            logger.warning(f"Cannot get token count for request: {request}")
-            return 0
-
-        encoder = tiktoken.encoding_for_model(model_name=str(model))
-        encoding = encoder.encode(request_str)
-        return len(encoding)
-
     def _get_anthropic_params(
             self,
             request: TextGenerationRequest,
@@ -113,15 +98,26 @@ class AnthropicGenerationService(BaseTextGenerationService):
         generation_params: TextGenerationParams,
     ) -> TextResponse:
         anthropic_params = self._get_anthropic_params(request, generation_params)
+        lease = await self._acquire_rate_limit(request, generation_params, anthropic_params['model'])
 
-        anthropic_response: AnthropicMessage = await self.client.messages.create(
-            **anthropic_params
-        )
+        try:
+            raw_response = await self.client.messages.with_raw_response.create(
+                **anthropic_params
+            )
+        except Exception as e:
+            self._release_rate_limit(lease, e)
+            raise
+
+        anthropic_response: AnthropicMessage = raw_response.parse()
         logger.dev_debug(anthropic_response)
 
         response = self.converter.from_anthropic_response(anthropic_response)
         logger.dev_debug(response)
 
+        if lease is not None:
+            lease.update(raw_response.headers)
+            lease.reconcile(response.token_usage.total if response.token_usage else None)
+
         return response
 
     async def run_stream(
@@ -130,11 +126,14 @@ class AnthropicGenerationService(BaseTextGenerationService):
         generation_params: TextGenerationParams,
     ) -> AsyncGenerator[TextResponseChunk, None]:
         anthropic_params = self._get_anthropic_params(request, generation_params)
+        # The stream only opens once the converter starts iterating, so the headers are not available here, and
+        # errors opening it (e.g. a 429) are raised from the first iteration. _reconcile_stream releases the lease then.
+        lease = await self._acquire_rate_limit(request, generation_params, anthropic_params['model'])
 
         stream: AsyncMessageStreamManager = self.client.messages.stream(
             **anthropic_params
         )
 
-        gen = self.converter.from_async_stream(stream)
+        gen = self._reconcile_stream(self.converter.from_async_stream(stream), lease)
 
         return gen
@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
 from typing import Optional, AsyncGenerator, List, Union, Callable, Awaitable, Literal
 
+from skyframe.settings import framework_settings
 from skyframe.utils import logger
+from .tokenizer import tokenizer_service
+from ...rate_limit import RateLimitLease, get_rate_limiter
+from ...resilience import unwrap_error
 from ..models import TextGenerationRequest, TextResponse, \
     TextGenerationParams, TextResponseChunk
 
@@ -70,20 +74,59 @@ PRICING_DICT = {
     }
 }
 
+# Requests submitted through a provider batch API are billed at this fraction of the regular price.
+BATCH_DISCOUNT = 0.5
+
 
 class BaseTextGenerationService(ABC):
-    @staticmethod
-    @abstractmethod
+    default_model: str
+    provider: str
+    """ The provider the service calls. Services of the same provider share rate limits. """
+
+    @classmethod
+    def _get_token_count_model(
+            cls,
+            generation_info: Optional[Union[str, TextGenerationParams]]
+    ) -> str:
+        if isinstance(generation_info, str):
+            return generation_info
+        elif isinstance(generation_info, TextGenerationParams) and generation_info.model is not None:
+            return str(generation_info.model)
+        elif generation_info is None:
+            logger.warning(
+                f"get_token_count called without a model name. Using default model '{cls.default_model}'."
+            )
+        return cls.default_model
+
+    @classmethod
     def get_token_count(
+            cls,
             request: TextGenerationRequest,
             generation_info: Optional[Union[str, TextGenerationParams]]
     ) -> int:
-        pass
+        return tokenizer_service.count(request, cls._get_token_count_model(generation_info))
+
+    @classmethod
+    async def get_token_count_async(
+            cls,
+            request: TextGenerationRequest,
+            generation_info: Optional[Union[str, TextGenerationParams]]
+    ) -> int:
+        return await tokenizer_service.count_async(request, cls._get_token_count_model(generation_info))
+
+    @classmethod
+    def get_token_counts(
+            cls,
+            requests: List[TextGenerationRequest],
+            generation_info: Optional[Union[str, TextGenerationParams]]
+    ) -> List[int]:
+        return tokenizer_service.count_batch(requests, cls._get_token_count_model(generation_info))
 
     @staticmethod
     def _get_cost_per_token(
             model_name: str,
-            cost_type: Literal['input', 'output']
+            cost_type: Literal['input', 'output'],
+            batch: bool = False,
     ):
         cost_per_token = None
         try:
@@ -101,28 +144,107 @@ class BaseTextGenerationService(ABC):
                 f"Could not find cost for model '{model_name}'. Using default cost of {cost_per_token} per token."
             )
 
+        if batch:
+            cost_per_token *= BATCH_DISCOUNT
+
         return cost_per_token
 
     @staticmethod
     def get_cost_per_input_token(
             model_name: str,
+            batch: bool = False,
     ) -> float:
-        return BaseTextGenerationService._get_cost_per_token(model_name, 'input')
+        return BaseTextGenerationService._get_cost_per_token(model_name, 'input', batch)
 
     @staticmethod
     def get_cost_per_output_token(
             model_name: str,
+            batch: bool = False,
     ) -> float:
-        return BaseTextGenerationService._get_cost_per_token(model_name, 'output')
+        return BaseTextGenerationService._get_cost_per_token(model_name, 'output', batch)
 
     @staticmethod
     def calculate_cost(
             token_count: int,
             model_name: str,
+            batch: bool = False,
     ) -> float:
-        cost_per_token = BaseTextGenerationService.get_cost_per_output_token(model_name)
+        cost_per_token = BaseTextGenerationService.get_cost_per_output_token(model_name, batch)
         return round(token_count * cost_per_token, 6)
 
+    async def _estimate_tokens(
+            self,
+            request: TextGenerationRequest,
+            generation_params: TextGenerationParams,
+            model: str,
+    ) -> int:
+        try:
+            prompt_tokens = await tokenizer_service.count_async(request, model)
+        except Exception as e:
+            logger.warning(f"Could not count prompt tokens for rate limiting, estimating from length: {e}")
+            prompt_tokens = len(tokenizer_service.request_to_string(request) or '') // 4
+
+        max_output_tokens = generation_params.max_tokens
+        if max_output_tokens is None:
+            max_output_tokens = framework_settings.runnables.generators.text.rate_limit.default_max_output_tokens
+        return prompt_tokens + max_output_tokens * (generation_params.n or 1)
+
+    async def _acquire_rate_limit(
+            self,
+            request: TextGenerationRequest,
+            generation_params: TextGenerationParams,
+            model: str,
+    ) -> Optional[RateLimitLease]:
+        """
+        Waits for the shared rate limiter of the provider and model. The request is charged its estimated tokens
+        up front; reconcile the returned lease with the real usage once the response arrives.
+        """
+        if not framework_settings.runnables.generators.text.rate_limit.enabled:
+            return None
+
+        limiter = get_rate_limiter(self.provider, model)
+        tokens = await self._estimate_tokens(request, generation_params, model) if limiter.limits_tokens else 0
+        return await limiter.acquire(tokens)
+
+    @staticmethod
+    def _release_rate_limit(lease: Optional[RateLimitLease], error: Optional[BaseException]) -> None:
+        if lease is None:
+            return
+        lease.release()
+        error = unwrap_error(error) if error is not None else None
+        if getattr(error, 'status_code', None) == 429:
+            response = getattr(error, 'response', None)
+            lease.rate_limited(getattr(response, 'headers', None))
+
+    @classmethod
+    async def _reconcile_stream(
+            cls,
+            stream: AsyncGenerator[TextResponseChunk, None],
+            lease: Optional[RateLimitLease],
+    ) -> AsyncGenerator[TextResponseChunk, None]:
+        """
+        Passes the stream through and reconciles the rate limit lease with the usage on the final chunk.
+        If the stream ends before its first chunk, the lease is released, and a 429 pauses the limiter.
+        """
+        received = False
+        error: Optional[BaseException] = None
+        try:
+            async for chunk in stream:
+                received = True
+                if lease is not None and chunk.token_usage is not None:
+                    lease.reconcile(chunk.token_usage.total)
+                yield chunk
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            if not received:
+                # Nothing was generated: the stream failed to open (some SDKs only send the request once
+                # iteration starts), or the consumer stopped before the first chunk.
+                cls._release_rate_limit(lease, error)
+            # Close the converter (and with it the HTTP stream) right away if the consumer stops early.
+            await stream.aclose()
+
     @abstractmethod
     def run(
             self,
@@ -146,3 +268,17 @@ class BaseTextGenerationService(ABC):
             generation_params: TextGenerationParams,
     ) -> AsyncGenerator[TextResponseChunk, None]:
         pass
+
+    async def run_batch(
+            self,
+            requests: List[TextGenerationRequest],
+            generation_params: TextGenerationParams,
+    ) -> List[Optional[Union[TextResponse, Exception]]]:
+        """
+        Generates responses for many requests through the provider's batch API.
+
+        :return: One entry per request, in input order. An entry is the exception instead of a response if that
+            request failed, or None if the batch ended before the request was processed.
+        :raises NotImplementedError: If the service does not support batch generation.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support batch generation')
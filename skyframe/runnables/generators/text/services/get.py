@@ -1,16 +1,27 @@
 from typing import TypeVar
 
 from .base import BaseTextGenerationService
+from ...registry import ServiceRegistry
 
 TTextGenerationService = TypeVar("TTextGenerationService", bound=BaseTextGenerationService)
 
 
-def get_text_generation_service(service_name: str) -> TTextGenerationService:
+def _create_text_generation_service(service_name: str) -> BaseTextGenerationService:
     if service_name == 'openai':
         from .openai import OpenAiGenerationService
         return OpenAiGenerationService()
     elif service_name == 'anthropic':
         from .anthropic import AnthropicGenerationService
         return AnthropicGenerationService()
+    elif service_name == 'router':
+        from .router import RouterGenerationService
+        return RouterGenerationService()
     else:
         raise NotImplementedError(f'Generation service: {service_name} is not implemented')
+
+
+text_generation_services: ServiceRegistry[BaseTextGenerationService] = ServiceRegistry(_create_text_generation_service)
+
+
+def get_text_generation_service(service_name: str) -> TTextGenerationService:
+    return text_generation_services.get(service_name)
@@ -0,0 +1,47 @@
+from typing import Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+from skyframe.models.message import Message, MessageRole
+
+TParam = TypeVar("TParam")
+
+_Entry = Tuple[MessageRole, str, Optional[str], TParam]
+
+
+class MessageParamCache(Generic[TParam]):
+    """
+    Memoizes the provider params converted from each Message, keyed by message id.
+
+    A conversation is resent with every turn, so only the new messages have to be converted. An entry is only
+    reused while the message's role, content and author name are unchanged; edited messages are converted again.
+    Cached params are shared between requests and must not be modified.
+
+    Lookups are lock-free. Concurrent misses for the same message may both convert it, which is harmless.
+
+    :param convert: Converts a single message to the provider's param.
+    :param max_size: The maximum number of messages to keep. The oldest entries are evicted first.
+    """
+
+    def __init__(self, convert: Callable[[Message], TParam], max_size: int = 4096):
+        self._convert = convert
+        self._max_size = max_size
+        self._entries: Dict[str, _Entry] = {}
+
+    def get(self, message: Message) -> TParam:
+        content = message.content
+        entry = self._entries.get(message.id)
+        if entry is not None and entry[1] == content and entry[0] == message.role and entry[2] == message.author_name:
+            return entry[3]
+
+        param = self._convert(message)
+        self._entries.pop(message.id, None)
+        self._entries[message.id] = (message.role, content, message.author_name, param)
+        if len(self._entries) > self._max_size:
+            try:
+                self._entries.pop(next(iter(self._entries)), None)
+            except (StopIteration, RuntimeError):
+                # Another thread changed the dict while iterating. The next insert evicts instead.
+                pass
+        return param
+
+    def clear(self) -> None:
+        self._entries.clear()
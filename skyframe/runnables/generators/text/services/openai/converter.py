@@ -14,9 +14,13 @@ from skyframe.models.message import Message, MessageRole
 from skyframe.models.token_usage import TokenUsage
 from ...models import TextResponse, TextChoice, TextGenerationParams, \
     TextResponseChunk, TextChoiceChunk, TextGenerationRequest, LogProb, TopLogprob
+from ..message_cache import MessageParamCache
 
 _T = TypeVar('_T')
 
+# TextGenerationParams that the OpenAI API does not accept.
+_UNSUPPORTED_PARAMS = {'top_k', 'prompt_caching', 'cache_prefix_messages'}
+
 
 class OpenAiGenerationConverter:
     """
@@ -35,9 +39,9 @@ class OpenAiGenerationConverter:
         """
         try:
             if isinstance(request, Message):
-                return [OpenAiGenerationConverter.to_chat_completion_message(request)]
+                return [_message_params.get(request)]
             elif isinstance(request, list):
-                return [OpenAiGenerationConverter.to_chat_completion_message(message) for message in request]
+                return [_message_params.get(message) for message in request]
             elif isinstance(request, str):
                 return [ChatCompletionUserMessageParam(
                     content=request,
@@ -111,7 +115,7 @@ class OpenAiGenerationConverter:
             if model is None and generation_params.model is None:
                 raise ValueError("Must provide either generation_params or model_name")
 
-            params_dict = generation_params.model_dump(exclude_none=True)
+            params_dict = {k: v for k, v in generation_params.to_dict().items() if k not in _UNSUPPORTED_PARAMS}
 
             response_format = params_dict.get('response_format', None)
             if response_format is not None:
@@ -133,11 +137,12 @@ class OpenAiGenerationConverter:
             )
 
     @staticmethod
-    def from_chat_completion(chat_completion: ChatCompletion) -> TextResponse:
+    def from_chat_completion(chat_completion: ChatCompletion, batch: bool = False) -> TextResponse:
         """
         Converts an OpenAI ChatCompletion object to a Quiply TextResponse object
 
         :param chat_completion: The OpenAI ChatCompletion object to convert
+        :param batch: Whether the completion was generated through the Batch API (Used for cost calculation)
         :return: The converted Quiply TextResponse object
         """
         try:
@@ -147,7 +152,7 @@ class OpenAiGenerationConverter:
                 created_at=chat_completion.created,
                 model=chat_completion.model,
                 system_fingerprint=chat_completion.system_fingerprint,
-                token_usage=OpenAiGenerationConverter.from_usage(chat_completion.usage, chat_completion.model),
+                token_usage=OpenAiGenerationConverter.from_usage(chat_completion.usage, chat_completion.model, batch),
             )
         except Exception as e:
             raise ConversionException(
@@ -229,20 +234,21 @@ class OpenAiGenerationConverter:
             )
 
     @staticmethod
-    def from_usage(usage: OpenAiCompletionUsage, model_name: Optional[str] = None) -> TokenUsage:
+    def from_usage(usage: OpenAiCompletionUsage, model_name: Optional[str] = None, batch: bool = False) -> TokenUsage:
         """
         Converts an OpenAI CompletionUsage object to a Quiply TokenUsage object
 
         :param usage: The OpenAI CompletionUsage object to convert
         :param model_name: The name of the model used for the conversion (Used for cost calculation)
+        :param batch: Whether the usage was billed at Batch API prices
         :return: The converted Quiply TextResponseUsage object
         """
         try:
             if model_name is not None:
                 from .service import OpenAiGenerationService
-                total_cost = OpenAiGenerationService.calculate_cost(usage.total_tokens, model_name)
-                prompt_cost = OpenAiGenerationService.calculate_cost(usage.prompt_tokens, model_name)
-                completion_cost = OpenAiGenerationService.calculate_cost(usage.completion_tokens, model_name)
+                total_cost = OpenAiGenerationService.calculate_cost(usage.total_tokens, model_name, batch)
+                prompt_cost = OpenAiGenerationService.calculate_cost(usage.prompt_tokens, model_name, batch)
+                completion_cost = OpenAiGenerationService.calculate_cost(usage.completion_tokens, model_name, batch)
             else:
                 total_cost = 0
                 prompt_cost = 0
@@ -278,10 +284,16 @@ class OpenAiGenerationConverter:
             model = ''
             index = 0
             created = 0
+            usage = None
             async for item in stream:
                 id = item.id
                 model = item.model
                 created = item.created
+                if item.usage is not None:
+                    usage = OpenAiGenerationConverter.from_usage(item.usage, item.model)
+                # With include_usage the usage arrives on an extra chunk that has no choices.
+                if not item.choices:
+                    continue
                 yield OpenAiGenerationConverter.from_chat_completion_chunk(item, index)
                 index += 1
 
@@ -290,7 +302,8 @@ class OpenAiGenerationConverter:
                 index=index,
                 created_at=created,
                 model=model,
-                is_final=True
+                is_final=True,
+                token_usage=usage,
             )
         except Exception as e:
             print(e)
@@ -300,6 +313,8 @@ class OpenAiGenerationConverter:
                 to_type=AsyncGenerator[TextResponseChunk, None],
                 inner_exception=e
             )
+        finally:
+            await stream.close()
 
     @staticmethod
     def from_chat_completion_chunk(chat_chunk: ChatCompletionChunk, index: int) -> TextResponseChunk:
@@ -349,4 +364,9 @@ class OpenAiGenerationConverter:
                 from_type=ChunkChoice,
                 to_type=TextChoiceChunk,
                 inner_exception=e
-            )
\ No newline at end of file
+            )
+
+
+_message_params: MessageParamCache[ChatCompletionMessageParam] = MessageParamCache(
+    OpenAiGenerationConverter.to_chat_completion_message
+)
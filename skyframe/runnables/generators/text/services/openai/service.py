@@ -1,17 +1,18 @@
-import os
-from typing import AsyncGenerator, Optional, Union
+import asyncio
+import json
+import time
+from typing import AsyncGenerator, Dict, List, Optional, Union
 
-import tiktoken
-from dotenv import load_dotenv
 from openai import AsyncOpenAI, AsyncStream, OpenAI
+from openai.types import Batch
 from openai.types.chat import ChatCompletion, ChatCompletionChunk
 from openai.types.chat.completion_create_params import CompletionCreateParamsBase
 
 from skyframe import framework_settings
-from skyframe.models.message import Message
 from skyframe.utils import logger
 from .converter import OpenAiGenerationConverter
 from ..base import BaseTextGenerationService
+from ....clients import get_openai_client, get_openai_client_sync
 from ...models import (
     TextGenerationParams,
     TextGenerationRequest,
@@ -21,21 +22,28 @@ from ...models import (
 
 MAX_OUTPUT_TOKENS: int = 1024
 
+BATCH_ENDPOINT = '/v1/chat/completions'
+# Batch statuses after which the batch will not change anymore.
+BATCH_TERMINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
 
 class OpenAiGenerationService(BaseTextGenerationService):
-    client: AsyncOpenAI
-    client_sync: OpenAI
     converter: OpenAiGenerationConverter
+    provider: str = 'openai'
     default_model: str = framework_settings.runnables.generators.text.get_service_value('openai', 'default_model') or "gpt-4o"
 
     def __init__(self):
         super().__init__()
-        load_dotenv()
-        api_key = os.environ.get("OPENAI_API_KEY")
-        self.client = AsyncOpenAI(api_key=api_key)
-        self.client_sync = OpenAI(api_key=api_key)
         self.converter = OpenAiGenerationConverter()
 
+    @property
+    def client(self) -> AsyncOpenAI:
+        return get_openai_client(framework_settings.runnables.generators.text.http_client)
+
+    @property
+    def client_sync(self) -> OpenAI:
+        return get_openai_client_sync(framework_settings.runnables.generators.text.http_client)
+
     @staticmethod
     def _get_model_name(params: Optional[TextGenerationParams]) -> str:
         if params is None or params.model is None:
@@ -43,35 +51,6 @@ class OpenAiGenerationService(BaseTextGenerationService):
         else:
             return params.model
 
-    @staticmethod
-    def get_token_count(
-        request: TextGenerationRequest,
-        generation_info: Optional[Union[str, TextGenerationParams]],
-    ) -> int:
-        if isinstance(generation_info, str):
-            model = generation_info
-        elif isinstance(generation_info, TextGenerationParams):
-            model = generation_info.model
-        else:
-            logger.warning(
-                f"get_token_count called without a model name. Using default model '{OpenAiGenerationService.default_model}'."
-            )
-            model = OpenAiGenerationService.default_model
-
-        if isinstance(request, str):
-            request_str = request
-        elif isinstance(request, list):
-            request_str = Message.join_as_string(request)
-        elif isinstance(request, Message):
-            request_str = request.to_string()
-        else:
-            logger.warning(f"Cannot get token count for request: {request}")
-            return 0
-
-        encoder = tiktoken.encoding_for_model(model_name=str(model))
-        encoding = encoder.encode(request_str)
-        return len(encoding)
-
     def _get_openai_params(
             self,
             request: TextGenerationRequest,
@@ -119,10 +98,17 @@ class OpenAiGenerationService(BaseTextGenerationService):
         generation_params: TextGenerationParams,
     ) -> TextResponse:
         openai_params = self._get_openai_params(request, generation_params)
+        lease = await self._acquire_rate_limit(request, generation_params, openai_params['model'])
 
-        chat_completion: ChatCompletion = await self.client.chat.completions.create(
-            **openai_params
-        )
+        try:
+            raw_response = await self.client.chat.completions.with_raw_response.create(
+                **openai_params
+            )
+        except Exception as e:
+            self._release_rate_limit(lease, e)
+            raise
+
+        chat_completion: ChatCompletion = raw_response.parse()
 
         logger.dev_debug(chat_completion)
 
@@ -130,6 +116,10 @@ class OpenAiGenerationService(BaseTextGenerationService):
 
         logger.dev_debug(response)
 
+        if lease is not None:
+            lease.update(raw_response.headers)
+            lease.reconcile(response.token_usage.total if response.token_usage else None)
+
         return response
 
     async def run_stream(
@@ -139,15 +129,110 @@ class OpenAiGenerationService(BaseTextGenerationService):
     ) -> AsyncGenerator[TextResponseChunk, None]:
         generation_params.stream = True
         openai_params = self._get_openai_params(request, generation_params)
+        openai_params['stream_options'] = {'include_usage': True}
+        lease = await self._acquire_rate_limit(request, generation_params, openai_params['model'])
+
+        try:
+            raw_response = await self.client.chat.completions.with_raw_response.create(**openai_params)
+        except Exception as e:
+            self._release_rate_limit(lease, e)
+            raise
 
-        stream: AsyncStream[
-            ChatCompletionChunk
-        ] = await self.client.chat.completions.create(**openai_params)
+        if lease is not None:
+            lease.update(raw_response.headers)
+
+        stream: AsyncStream[ChatCompletionChunk] = raw_response.parse()
 
         logger.dev_debug(stream)
 
-        gen = self.converter.from_async_stream(stream)
+        gen = self._reconcile_stream(self.converter.from_async_stream(stream), lease)
 
         logger.dev_debug(gen)
 
         return gen
+
+    def _to_batch_file(
+            self,
+            requests: List[TextGenerationRequest],
+            generation_params: TextGenerationParams,
+    ) -> bytes:
+        lines = []
+        for index, request in enumerate(requests):
+            body = self._get_openai_params(request, generation_params)
+            # The Batch API does not support streaming.
+            body.pop('stream', None)
+            body.pop('stream_options', None)
+            lines.append(json.dumps({
+                'custom_id': str(index),
+                'method': 'POST',
+                'url': BATCH_ENDPOINT,
+                'body': body,
+            }))
+        return '\n'.join(lines).encode('utf-8')
+
+    async def _wait_for_batch(self, batch: Batch) -> Batch:
+        batch_settings = framework_settings.runnables.generators.text.batch
+        deadline = time.monotonic() + batch_settings.timeout if batch_settings.timeout is not None else None
+        interval = batch_settings.poll_interval
+
+        while batch.status not in BATCH_TERMINAL_STATUSES:
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning(f"OpenAI batch {batch.id} did not finish in {batch_settings.timeout} seconds. Cancelling it.")
+                await self.client.batches.cancel(batch.id)
+                raise TimeoutError(f"OpenAI batch {batch.id} did not finish in {batch_settings.timeout} seconds")
+
+            await asyncio.sleep(interval if deadline is None else min(interval, max(deadline - time.monotonic(), 0)))
+            interval = min(interval * 2, batch_settings.max_poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+
+        return batch
+
+    async def _read_batch_file(self, file_id: Optional[str]) -> List[Dict]:
+        if file_id is None:
+            return []
+        content = await self.client.files.content(file_id)
+        return [json.loads(line) for line in content.text.splitlines() if line.strip()]
+
+    async def run_batch(
+        self,
+        requests: List[TextGenerationRequest],
+        generation_params: TextGenerationParams,
+    ) -> List[Optional[Union[TextResponse, Exception]]]:
+        if not requests:
+            return []
+
+        batch_file = await self.client.files.create(
+            file=('batch.jsonl', self._to_batch_file(requests, generation_params)),
+            purpose='batch'
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=framework_settings.runnables.generators.text.batch.completion_window,
+        )
+        logger.info(f"Submitted OpenAI batch {batch.id} with {len(requests)} requests")
+
+        batch = await self._wait_for_batch(batch)
+        if batch.status == 'failed':
+            errors = [error.message for error in (batch.errors.data or [])] if batch.errors else []
+            raise RuntimeError(f"OpenAI batch {batch.id} failed: {'; '.join(str(e) for e in errors) or 'unknown error'}")
+
+        results: List[Optional[Union[TextResponse, Exception]]] = [None] * len(requests)
+        for line in await self._read_batch_file(batch.output_file_id) + await self._read_batch_file(batch.error_file_id):
+            index = int(line['custom_id'])
+            response = line.get('response') or {}
+            if line.get('error') is not None or response.get('status_code') != 200:
+                error = line.get('error') or response.get('body', {}).get('error')
+                results[index] = RuntimeError(f"Batch request {index} failed: {error}")
+                continue
+            try:
+                results[index] = self.converter.from_chat_completion(
+                    ChatCompletion.model_validate(response['body']),
+                    batch=True
+                )
+            except Exception as e:
+                results[index] = e
+
+        logger.info(f"OpenAI batch {batch.id} finished with status '{batch.status}'")
+
+        return results
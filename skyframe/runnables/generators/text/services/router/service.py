@@ -0,0 +1,232 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncGenerator, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+from skyframe import framework_settings
+from skyframe.exceptions.generation import GenerationException
+from skyframe.settings.runnables.generators.router import RouterBackend, RouterSettings
+from skyframe.utils import logger
+from ..base import BaseTextGenerationService
+from ....resilience import LatencyTracker, is_retryable, open_stream_prefetched, resume_stream
+from ...models import (
+    TextGenerationParams,
+    TextGenerationRequest,
+    TextResponse,
+    TextResponseChunk,
+)
+
+T = TypeVar("T")
+
+
+class BackendStats:
+    """
+    Rolling latency and error statistics of one router backend. Latencies of full responses and of the first
+    chunk of streams are tracked separately.
+    """
+
+    def __init__(self, window_size: int):
+        self.latencies = LatencyTracker(window_size)
+        self.first_chunk_latencies = LatencyTracker(window_size)
+        self.outcomes: Deque[bool] = deque(maxlen=window_size)
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.latencies.percentile(0.5)
+
+    @property
+    def p50_first_chunk(self) -> Optional[float]:
+        return self.first_chunk_latencies.percentile(0.5)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.cooldown_until
+
+    def record_success(self, latency: float, stream: bool = False) -> None:
+        with self._lock:
+            (self.first_chunk_latencies if stream else self.latencies).add(latency)
+            self.outcomes.append(True)
+            self.consecutive_failures = 0
+
+    def record_failure(self, failure_threshold: int, cooldown_seconds: float) -> bool:
+        """
+        :return: True if the failure took the backend out of rotation.
+        """
+        with self._lock:
+            self.outcomes.append(False)
+            self.consecutive_failures += 1
+            if self.consecutive_failures < failure_threshold:
+                return False
+            self.consecutive_failures = 0
+            self.cooldown_until = time.monotonic() + cooldown_seconds
+            return True
+
+
+class RouterGenerationService(BaseTextGenerationService):
+    """
+    Routes each request to one of several text generation backends (service and model pairs).
+
+    Backends are ranked per request by the configured policy, then tried in order: a backend that fails with a
+    retryable error (see resilience.is_retryable) or exceeds its latency budget fails over to the next one.
+    Other errors, e.g. an invalid request, are raised without failing over. Backends that keep failing are taken
+    out of rotation for a cooldown. Configure the backends under text.router in the settings.
+    """
+
+    default_model: str = 'gpt-4o'
+    provider: str = 'router'
+
+    def __init__(self, settings: Optional[RouterSettings] = None):
+        super().__init__()
+        self.settings = settings or framework_settings.runnables.generators.text.router
+        if not self.settings.backends:
+            raise GenerationException(
+                message="The router text generation service has no backends configured (text.router.backends)"
+            )
+
+        self.default_model = self.settings.backends[0].model
+        self.stats: Dict[str, BackendStats] = {
+            backend.name: BackendStats(self.settings.window_size) for backend in self.settings.backends
+        }
+        # Price per token of input and output together, used by the lowest_cost policy.
+        self._prices: Dict[str, float] = {
+            backend.name: self.get_cost_per_input_token(backend.model) + self.get_cost_per_output_token(backend.model)
+            for backend in self.settings.backends
+        }
+
+    @staticmethod
+    def _get_backend_params(generation_params: TextGenerationParams, backend: RouterBackend) -> TextGenerationParams:
+        # Set through the attribute, so the cached to_dict of the copy picks up the backend's model.
+        params = generation_params.model_copy()
+        params.model = backend.model
+        return params
+
+    def _rank_backends(self, generation_params: TextGenerationParams, stream: bool = False) -> List[RouterBackend]:
+        backends = self.settings.backends
+        if generation_params.model is not None:
+            # An explicitly requested model narrows the candidates, if any backend serves it.
+            backends = [b for b in backends if b.model == generation_params.model] or backends
+
+        now = time.monotonic()
+        available = [b for b in backends if self.stats[b.name].is_available(now)]
+        if not available:
+            logger.warning("All router backends are cooling down after failures. Trying them anyway.")
+            available = list(backends)
+
+        policy = self.settings.policy
+        if policy == 'lowest_latency':
+            # Backends without samples yet sort first, so each gets measured. Streams rank by time to first chunk.
+            if stream:
+                return sorted(available, key=lambda b: self.stats[b.name].p50_first_chunk or 0.0)
+            return sorted(available, key=lambda b: self.stats[b.name].p50 or 0.0)
+        elif policy == 'lowest_cost':
+            return sorted(available, key=lambda b: (self._prices[b.name], self.stats[b.name].error_rate))
+        else:
+            return self._weighted_order(available)
+
+    def _weighted_order(self, backends: List[RouterBackend]) -> List[RouterBackend]:
+        # Weighted sampling without replacement, with weights discounted by recent error rates.
+        remaining = list(backends)
+        ordered = []
+        while remaining:
+            weights = [b.weight * (1 - self.stats[b.name].error_rate) + 1e-9 for b in remaining]
+            choice = random.choices(range(len(remaining)), weights=weights)[0]
+            ordered.append(remaining.pop(choice))
+        return ordered
+
+    async def _route(
+            self,
+            generation_params: TextGenerationParams,
+            call: Callable[[BaseTextGenerationService, TextGenerationParams], Awaitable[T]],
+            stream: bool = False,
+    ) -> T:
+        from ..get import get_text_generation_service
+
+        last_error: Optional[Exception] = None
+        for backend in self._rank_backends(generation_params, stream):
+            stats = self.stats[backend.name]
+            budget = backend.latency_budget or self.settings.latency_budget
+            backend_params = self._get_backend_params(generation_params, backend)
+
+            start = time.monotonic()
+            try:
+                service = get_text_generation_service(backend.service_name)
+                result = await asyncio.wait_for(call(service, backend_params), budget)
+            except Exception as e:
+                if not is_retryable(e):
+                    # The request itself is at fault, so another backend would fail too. It says nothing about the
+                    # health of this backend either.
+                    raise
+                last_error = e
+                if stats.record_failure(self.settings.failure_threshold, self.settings.cooldown_seconds):
+                    logger.warning(f"Router backend '{backend.name}' is cooling down for {self.settings.cooldown_seconds} seconds.")
+                over_budget = budget is not None and isinstance(e, asyncio.TimeoutError) and time.monotonic() - start >= budget
+                reason = f'exceeded its latency budget of {budget} seconds' if over_budget else f'failed: {e}'
+                logger.warning(f"Router backend '{backend.name}' {reason}. Failing over.")
+                continue
+
+            stats.record_success(time.monotonic() - start, stream)
+            return result
+
+        raise last_error or RuntimeError("The router has no backends to route to")
+
+    def run(
+        self,
+        request: TextGenerationRequest,
+        generation_params: TextGenerationParams,
+    ) -> TextResponse:
+        from ..get import get_text_generation_service
+
+        backend = self._rank_backends(generation_params)[0]
+        service = get_text_generation_service(backend.service_name)
+        return service.run(request, self._get_backend_params(generation_params, backend))
+
+    async def run_async(
+        self,
+        request: TextGenerationRequest,
+        generation_params: TextGenerationParams,
+    ) -> TextResponse:
+        return await self._route(
+            generation_params,
+            lambda service, params: service.run_async(request=request, generation_params=params)
+        )
+
+    async def run_stream(
+        self,
+        request: TextGenerationRequest,
+        generation_params: TextGenerationParams,
+    ) -> AsyncGenerator[TextResponseChunk, None]:
+        # A backend counts as answering once its first chunk arrives, so failover only happens before any output.
+        iterator, first = await self._route(
+            generation_params,
+            lambda service, params: open_stream_prefetched(
+                lambda: service.run_stream(request=request, generation_params=params)
+            ),
+            stream=True
+        )
+        return resume_stream(iterator, first)
+
+    def get_backend_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the current p50 latency of full responses and of first chunks, the error rate and the availability
+        of every backend.
+        """
+        now = time.monotonic()
+        return {
+            name: {
+                'p50': stats.p50,
+                'p50_first_chunk': stats.p50_first_chunk,
+                'error_rate': stats.error_rate,
+                'available': stats.is_available(now),
+            }
+            for name, stats in self.stats.items()
+        }
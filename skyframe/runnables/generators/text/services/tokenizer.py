@@ -0,0 +1,157 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from skyframe.models.message import Message
+from skyframe.utils import logger
+from ..models import TextGenerationRequest
+
+if TYPE_CHECKING:
+    import tiktoken
+
+_DEFAULT_ENCODING = 'cl100k_base'
+
+# Claude models do not have a published tiktoken encoding. cl100k_base is the closest approximation.
+_CLAUDE_ENCODING = 'cl100k_base'
+
+# Model name prefixes that tiktoken may not know about yet, mapped to their encoding.
+_ENCODING_PREFIXES = (
+    ('claude', _CLAUDE_ENCODING),
+    ('gpt-4o', 'o200k_base'),
+    ('gpt-4.1', 'o200k_base'),
+    ('gpt-5', 'o200k_base'),
+    ('o1', 'o200k_base'),
+    ('o3', 'o200k_base'),
+    ('o4', 'o200k_base'),
+    ('gpt-4', 'cl100k_base'),
+    ('gpt-3.5', 'cl100k_base'),
+)
+
+# Texts shorter than this are encoded inline. Longer texts are encoded on the executor so the event loop is not blocked.
+_DEFAULT_ASYNC_THRESHOLD_CHARS = 2048
+
+
+class TokenizerService:
+    """
+    Counts tokens for text generation requests.
+
+    Encoders are resolved once per model family and cached, so counting only pays for the encode itself.
+    Large or batched encodes can be run on a thread pool (tiktoken releases the GIL while encoding).
+    """
+
+    def __init__(
+            self,
+            *,
+            max_workers: Optional[int] = None,
+            async_threshold_chars: int = _DEFAULT_ASYNC_THRESHOLD_CHARS,
+    ):
+        self.max_workers = max_workers
+        self.async_threshold_chars = async_threshold_chars
+
+        self._encoding_names: Dict[str, str] = {}
+        self._encoders: Dict[str, 'tiktoken.Encoding'] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def _resolve_encoding_name(model: Optional[str]) -> str:
+        if not model:
+            return _DEFAULT_ENCODING
+
+        model = model.lower()
+        if model.startswith('claude'):
+            return _CLAUDE_ENCODING
+
+        from tiktoken.model import encoding_name_for_model
+        try:
+            return encoding_name_for_model(model)
+        except KeyError:
+            pass
+
+        for prefix, encoding_name in _ENCODING_PREFIXES:
+            if model.startswith(prefix):
+                return encoding_name
+
+        logger.warning(f"Could not find a tokenizer for model '{model}'. Using '{_DEFAULT_ENCODING}'.")
+        return _DEFAULT_ENCODING
+
+    def get_encoding_name(self, model: Optional[str]) -> str:
+        key = model or ''
+        encoding_name = self._encoding_names.get(key)
+        if encoding_name is None:
+            encoding_name = self._resolve_encoding_name(model)
+            self._encoding_names[key] = encoding_name
+        return encoding_name
+
+    def get_encoder(self, model: Optional[str]) -> 'tiktoken.Encoding':
+        encoding_name = self.get_encoding_name(model)
+        encoder = self._encoders.get(encoding_name)
+        if encoder is not None:
+            return encoder
+
+        with self._lock:
+            encoder = self._encoders.get(encoding_name)
+            if encoder is None:
+                import tiktoken
+                encoder = tiktoken.get_encoding(encoding_name)
+                self._encoders[encoding_name] = encoder
+            return encoder
+
+    @staticmethod
+    def request_to_string(request: TextGenerationRequest) -> Optional[str]:
+        if isinstance(request, str):
+            return request
+        elif isinstance(request, list):
+            return Message.join_as_string(request)
+        elif isinstance(request, Message):
+            return request.to_string()
+        else:
+            logger.warning(f"Cannot get token count for request: {request}")
+            return None
+
+    def count(self, request: TextGenerationRequest, model: Optional[str]) -> int:
+        text = self.request_to_string(request)
+        if not text:
+            return 0
+        return len(self.get_encoder(model).encode_ordinary(text))
+
+    def count_batch(self, requests: List[TextGenerationRequest], model: Optional[str]) -> List[int]:
+        """
+        Counts the tokens of many requests at once, encoding them across threads.
+        """
+        texts = [self.request_to_string(request) or '' for request in requests]
+        if not texts:
+            return []
+        encoder = self.get_encoder(model)
+        return [len(tokens) for tokens in encoder.encode_ordinary_batch(texts, num_threads=self._num_threads())]
+
+    async def count_async(self, request: TextGenerationRequest, model: Optional[str]) -> int:
+        text = self.request_to_string(request)
+        if not text:
+            return 0
+
+        if len(text) < self.async_threshold_chars and self._is_encoder_loaded(model):
+            return len(self.get_encoder(model).encode_ordinary(text))
+
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), self.count, text, model)
+
+    async def count_batch_async(self, requests: List[TextGenerationRequest], model: Optional[str]) -> List[int]:
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), self.count_batch, requests, model)
+
+    def _is_encoder_loaded(self, model: Optional[str]) -> bool:
+        # The first load of an encoder reads (and may download) its BPE file, so it must not happen on the loop.
+        return self.get_encoding_name(model) in self._encoders
+
+    def _num_threads(self) -> int:
+        return self.max_workers or 8
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='tokenizer')
+        return self._executor
+
+
+tokenizer_service: TokenizerService = TokenizerService()
@@ -0,0 +1,103 @@
+import re
+from typing import Callable, Pattern, Union
+
+StopPredicate = Callable[[str], bool]
+""" Called with the text generated so far. Returns True to stop the stream. """
+
+
+class _JsonScanner:
+    """
+    Finds the end of the first top-level JSON object or array in a growing text, scanning each character once.
+    """
+
+    def __init__(self):
+        self.offset = 0
+        self.started = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> bool:
+        """
+        Scans the part of text added since the last call. Returns True once the first JSON value is closed.
+        """
+        if len(text) < self.offset:
+            # A shorter text belongs to a new stream.
+            self.__init__()
+
+        for index in range(self.offset, len(text)):
+            char = text[index]
+            if not self.started:
+                if char in '{[':
+                    self.started = True
+                    self.depth = 1
+            elif self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in '{[':
+                self.depth += 1
+            elif char in '}]':
+                self.depth -= 1
+                if self.depth == 0:
+                    self.offset = index + 1
+                    return True
+        self.offset = len(text)
+        return False
+
+
+def stop_after_json() -> StopPredicate:
+    """
+    Stops the stream once the first top-level JSON object or array is closed.
+
+    The predicate only scans the text added since its last call, so create one per stream.
+    """
+    scanner = _JsonScanner()
+    return scanner.feed
+
+
+def stop_after_matches(
+        pattern: Union[str, Pattern[str]],
+        count: int,
+        flags: int = 0,
+        max_match_length: int = 1024,
+) -> StopPredicate:
+    """
+    Stops the stream once pattern has matched count times.
+
+    The predicate only searches the text added since its last call, plus the last max_match_length characters
+    before it for matches that span two chunks, so create one per stream.
+
+    :param pattern: The pattern to count. It should only match complete items, e.g. by requiring a trailing newline.
+    :param count: The number of matches to stop after.
+    :param flags: Regex flags used if pattern is a string.
+    :param max_match_length: The length of the longest match expected. Longer matches may be missed.
+    """
+    compiled = re.compile(pattern, flags) if isinstance(pattern, str) else pattern
+    matches = 0
+    # The end of the last match, and the length of the text at the last call.
+    match_end = 0
+    scanned = 0
+
+    def predicate(text: str) -> bool:
+        nonlocal matches, match_end, scanned
+        if len(text) < scanned:
+            # A shorter text belongs to a new stream.
+            matches = match_end = scanned = 0
+
+        position = max(match_end, scanned - max_match_length)
+        scanned = len(text)
+        for match in compiled.finditer(text, position):
+            matches += 1
+            # An empty match ends where it starts, so it is not counted again on the next call.
+            match_end = max(match.end(), match.start() + 1)
+            if matches >= count:
+                return True
+        return False
+
+    return predicate
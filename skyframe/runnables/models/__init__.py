@@ -2,11 +2,14 @@ from .metadata import RunnableMetadata
 from .params import RunnableParams
 from .callback import BaseAsyncCallback
 from .run_info import RunInfo, RunContext
+from .bulk import BulkItemResult, BulkStats
 
 __all__ = [
     "RunnableMetadata",
     "RunnableParams",
     "BaseAsyncCallback",
     "RunInfo",
-    "RunContext"
+    "RunContext",
+    "BulkItemResult",
+    "BulkStats",
 ]
@@ -0,0 +1,69 @@
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class BulkItemResult(BaseModel):
+    """
+    The outcome of one input of a bulk run.
+    """
+
+    index: int
+    """ The position of the input in the inputs. """
+
+    input: Any = Field(default=None)
+    """ The input the runnable was called with. """
+
+    output: Any = Field(default=None)
+    """ The output of the runnable, None if every attempt failed. """
+
+    error: Optional[Exception] = Field(default=None)
+    """ The error of the last attempt, if every attempt failed. """
+
+    attempts: int = Field(default=1)
+    """ The number of times the runnable was called for the input. """
+
+    latency: float = Field(default=0)
+    """ Seconds from the first attempt until the last attempt finished, including retry backoff. """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BulkStats(BaseModel):
+    """
+    Throughput and latency of a bulk run.
+    """
+
+    count: int = Field(default=0)
+    """ The number of inputs that finished. """
+
+    succeeded: int = Field(default=0)
+    failed: int = Field(default=0)
+
+    retries: int = Field(default=0)
+    """ The number of attempts beyond the first, over all inputs. """
+
+    total_time: float = Field(default=0)
+    """ Seconds from the start of the run until the last input finished. """
+
+    throughput: float = Field(default=0)
+    """ Finished inputs per second. """
+
+    latency_mean: Optional[float] = Field(default=None)
+    latency_p50: Optional[float] = Field(default=None)
+    latency_p90: Optional[float] = Field(default=None)
+    latency_p99: Optional[float] = Field(default=None)
+    latency_max: Optional[float] = Field(default=None)
+
+    def __str__(self) -> str:
+        if not self.count:
+            return 'no inputs'
+        return (
+            f'{self.count} inputs ({self.failed} failed, {self.retries} retries) in {self.total_time:.2f}s, '
+            f'{self.throughput:.2f}/s, latency p50 {self.latency_p50:.3f}s p90 {self.latency_p90:.3f}s '
+            f'p99 {self.latency_p99:.3f}s max {self.latency_max:.3f}s'
+        )
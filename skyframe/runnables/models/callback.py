@@ -1,18 +1,105 @@
 from abc import ABC
-from typing import Any, Optional, TYPE_CHECKING, List
+from typing import Any, ClassVar, Dict, Literal, Optional, TYPE_CHECKING, List, Tuple, Type
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 from skyframe.models.message import Message
+from skyframe.settings.runnables.callbacks import CallbackOverflow
+from skyframe.utils import logger
 
 if TYPE_CHECKING:
     from .run_info import RunInfo
     from ..base import Runnable
     from ..agents.agent import Agent
+    from ..pipeline import Pipeline, PipelineResult
     from .. import generators as gen
 
+# A hook is the name of the method to call and whether it receives the callback name (the on_any_* methods do).
+CallbackHooks = Tuple[Tuple[str, bool], ...]
+
+_hook_tables: Dict[Tuple[Type['BaseAsyncCallback'], str], CallbackHooks] = {}
+
+
+def _get_any_hook(name: str) -> Optional[str]:
+    if 'start' in name:
+        return 'on_any_start'
+    elif 'error' in name:
+        return 'on_any_error'
+    elif 'end' in name:
+        return 'on_any_end'
+    return None
+
+
+CallbackDelivery = Literal['inline', 'background']
+
+
+async def run_callback_hooks(
+        callback: 'BaseAsyncCallback',
+        hooks: CallbackHooks,
+        name: str,
+        kwargs: Dict[str, Any],
+) -> None:
+    """
+    Calls the hooks of a callback for one event in order. Errors are logged, never raised.
+    """
+    try:
+        for hook, receives_name in hooks:
+            if receives_name:
+                await getattr(callback, hook)(callback_name=name, **kwargs)
+            else:
+                await getattr(callback, hook)(**kwargs)
+    except Exception as e:
+        logger.exception(f"Error invoking callback {name} on {type(callback).__name__}: {e}")
+
 
 class BaseAsyncCallback(BaseModel, ABC):
+    delivery: ClassVar[CallbackDelivery] = 'inline'
+    """ 'inline' awaits the callback in the run that emits the event. 'background' puts events on a bounded
+    queue that a background task delivers in order, so a slow callback does not delay the run. End and error
+    events still wait until the events before them are delivered. """
+
+    queue_size: ClassVar[Optional[int]] = None
+    """ The queue size for background delivery. None uses the callback settings. """
+
+    overflow: ClassVar[Optional[CallbackOverflow]] = None
+    """ The overflow policy for background delivery. None uses the callback settings. """
+
+    _queues: Any = PrivateAttr(default=None)
+    """ The background delivery queues of the callback, per event loop. """
+
+    @classmethod
+    def _is_overridden(cls, method_name: str) -> bool:
+        return getattr(cls, method_name, None) is not getattr(BaseAsyncCallback, method_name, None)
+
+    @classmethod
+    def get_hooks(cls, name: str) -> CallbackHooks:
+        """
+        Returns the methods to call for the callback event name, in order: the method of the event itself and
+        the matching on_any_* method. Methods that are not overridden are no-ops and left out.
+
+        The table is resolved once per callback class and event, so dispatching to a callback that does not
+        handle an event costs a dictionary lookup.
+        """
+        key = (cls, name)
+        hooks = _hook_tables.get(key)
+        if hooks is not None:
+            return hooks
+
+        if not callable(getattr(cls, name, None)):
+            logger.error(f"Callback {cls.__name__} does not have method {name}")
+            hooks = ()
+        else:
+            resolved = []
+            if cls._is_overridden(name):
+                resolved.append((name, False))
+            any_hook = _get_any_hook(name)
+            if any_hook is not None and cls._is_overridden(any_hook):
+                resolved.append((any_hook, True))
+            hooks = tuple(resolved)
+
+        _hook_tables[key] = hooks
+        return hooks
+
     async def on_any_start(
             self,
             callback_name: str,
@@ -252,3 +339,33 @@ class BaseAsyncCallback(BaseModel, ABC):
             **kwargs,
     ):
         pass
+
+    async def on_pipeline_start(
+            self,
+            info: 'RunInfo',
+            *,
+            data: Dict[str, Any],
+            pipeline: Optional['Pipeline'] = None,
+            **kwargs,
+    ):
+        pass
+
+    async def on_pipeline_end(
+            self,
+            info: 'RunInfo',
+            *,
+            response: 'PipelineResult',
+            pipeline: Optional['Pipeline'] = None,
+            **kwargs,
+    ):
+        pass
+
+    async def on_pipeline_error(
+            self,
+            info: 'RunInfo',
+            *,
+            error: Exception,
+            pipeline: Optional['Pipeline'] = None,
+            **kwargs,
+    ):
+        pass
@@ -1 +1,3 @@
 from .pipeline import Pipeline
+from .models import PipelineParams, PipelineNode, NodeTiming, PipelineResult, PipelineStage, collect_chunks
+from .checkpoints import BasePipelineCheckpointStore, PipelineCheckpoint, MemoryPipelineCheckpointStore, SqlitePipelineCheckpointStore
@@ -0,0 +1,13 @@
+from .base import BasePipelineCheckpointStore, PipelineCheckpoint
+from .memory import MemoryPipelineCheckpointStore
+from .sqlite import SqlitePipelineCheckpointStore
+from .key import get_node_key, fingerprint_runnable
+
+__all__ = [
+    "BasePipelineCheckpointStore",
+    "PipelineCheckpoint",
+    "MemoryPipelineCheckpointStore",
+    "SqlitePipelineCheckpointStore",
+    "get_node_key",
+    "fingerprint_runnable",
+]
@@ -0,0 +1,37 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+
+class PipelineCheckpoint(BaseModel):
+    key: str
+    """ The chained hash of the node's config and inputs. """
+
+    node_name: str
+    """ The node that produced the output. """
+
+    output: Any = Field(default=None)
+    """ The output of the node. """
+
+    created_at: float = Field(default_factory=time.time)
+    """ The Unix time when the output was stored. """
+
+
+class BasePipelineCheckpointStore(BaseModel, ABC):
+    """
+    Base class for stores that keep the outputs of memoized pipeline nodes.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[PipelineCheckpoint]:
+        """ Returns the checkpoint stored under key, or None on a miss. """
+
+    @abstractmethod
+    async def set(self, checkpoint: PipelineCheckpoint) -> None:
+        """ Stores a checkpoint under its key. """
+
+    @abstractmethod
+    async def clear(self, node_name: Optional[str] = None) -> None:
+        """ Removes the checkpoints of a node, or every checkpoint if node_name is None. """
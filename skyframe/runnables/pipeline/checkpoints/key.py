@@ -0,0 +1,110 @@
+import functools
+import hashlib
+import json
+import types
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+from ...base import Runnable
+
+# Fields of a runnable that do not change what it outputs.
+_IGNORED_FIELDS = {'process_id', 'runnable_params'}
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode='json')
+    return str(value)
+
+
+def hash_canonical(data: Any) -> str:
+    dumped = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=_to_json)
+    return hashlib.sha256(dumped.encode('utf-8')).hexdigest()
+
+
+def _canonical_const(value: Any) -> Any:
+    # Constants are written out by value, since the repr of a nested code object contains its memory address
+    # and the repr of a frozenset depends on the hash seed of the process.
+    if isinstance(value, types.CodeType):
+        return {'code': hash_code(value)}
+    if isinstance(value, tuple):
+        return [_canonical_const(item) for item in value]
+    if isinstance(value, frozenset):
+        return {'set': sorted((_canonical_const(item) for item in value), key=json.dumps)}
+    if isinstance(value, bytes):
+        return {'bytes': value.hex()}
+    if isinstance(value, float):
+        return {'float': value.hex()}
+    if isinstance(value, complex):
+        return {'complex': [value.real.hex(), value.imag.hex()]}
+    if value is Ellipsis:
+        return {'ellipsis': True}
+    return {type(value).__name__: value}
+
+
+def hash_code(code: types.CodeType) -> str:
+    """
+    Returns a hash of what a code object does: its bytecode, the names and constants it uses, and the code of
+    the lambdas, generator expressions and functions nested in it. The hash is the same in every process.
+    """
+    return hash_canonical({
+        'code': code.co_code.hex(),
+        'names': code.co_names,
+        'varnames': code.co_varnames,
+        'freevars': code.co_freevars,
+        'consts': [_canonical_const(const) for const in code.co_consts],
+    })
+
+
+def fingerprint_runnable(runnable: Any) -> Dict[str, Any]:
+    """
+    Returns what identifies the config of a node's runnable: the fields of a Runnable, or the code of a function.
+    Values captured by a function's closure are not part of it; bump the node's version when they change.
+    """
+    if isinstance(runnable, Runnable):
+        return {
+            'type': f'{type(runnable).__module__}.{type(runnable).__qualname__}',
+            'config': runnable.model_dump(exclude=_IGNORED_FIELDS),
+        }
+
+    if isinstance(runnable, functools.partial):
+        return {
+            'type': 'functools.partial',
+            'func': fingerprint_runnable(runnable.func),
+            'args': runnable.args,
+            'keywords': runnable.keywords,
+        }
+
+    code = getattr(runnable, '__code__', None)
+    if code is None:
+        # A callable object. Its __call__ identifies it, the instance's state does not.
+        code = getattr(getattr(type(runnable), '__call__', None), '__code__', None)
+        return {
+            'type': f'{type(runnable).__module__}.{type(runnable).__qualname__}',
+            'code': hash_code(code) if code is not None else None,
+        }
+    return {
+        'type': f'{getattr(runnable, "__module__", None)}.{getattr(runnable, "__qualname__", None)}',
+        'code': hash_code(code),
+    }
+
+
+def get_node_key(
+        node_name: str,
+        version: Optional[str],
+        runnable_fingerprint: Dict[str, Any],
+        inputs: Dict[str, Any],
+) -> str:
+    """
+    Returns the checkpoint key of a node run.
+
+    :param inputs: The inputs of the node by argument name. Inputs produced by memoized nodes are given as the
+        keys of those nodes, so a key changes whenever anything upstream of the node changes.
+    """
+    return hash_canonical({
+        'node': node_name,
+        'version': version,
+        'runnable': runnable_fingerprint,
+        'inputs': inputs,
+    })
@@ -0,0 +1,26 @@
+from typing import Dict, Optional
+
+from pydantic import PrivateAttr
+
+from .base import BasePipelineCheckpointStore, PipelineCheckpoint
+
+
+class MemoryPipelineCheckpointStore(BasePipelineCheckpointStore):
+    """
+    Keeps checkpoints in memory, for memoizing nodes within one process.
+    """
+
+    _checkpoints: Dict[str, PipelineCheckpoint] = PrivateAttr(default_factory=dict)
+
+    async def get(self, key: str) -> Optional[PipelineCheckpoint]:
+        return self._checkpoints.get(key)
+
+    async def set(self, checkpoint: PipelineCheckpoint) -> None:
+        self._checkpoints[checkpoint.key] = checkpoint
+
+    async def clear(self, node_name: Optional[str] = None) -> None:
+        if node_name is None:
+            self._checkpoints.clear()
+            return
+        for key in [key for key, checkpoint in self._checkpoints.items() if checkpoint.node_name == node_name]:
+            del self._checkpoints[key]
@@ -0,0 +1,77 @@
+import asyncio
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from pydantic import PrivateAttr
+
+from .base import BasePipelineCheckpointStore, PipelineCheckpoint
+
+
+class SqlitePipelineCheckpointStore(BasePipelineCheckpointStore):
+    """
+    Keeps checkpoints in a sqlite database, so a pipeline that is run again skips the nodes and inputs it has
+    already completed.
+
+    Outputs are pickled. Only open databases written by your own pipelines.
+    """
+
+    path: str
+    """ Path of the sqlite database. """
+
+    _db: Optional[sqlite3.Connection] = PrivateAttr(default=None)
+    _db_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def _get_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS pipeline_checkpoints '
+                '(key TEXT PRIMARY KEY, node_name TEXT NOT NULL, output BLOB, created_at REAL NOT NULL)'
+            )
+            self._db.execute(
+                'CREATE INDEX IF NOT EXISTS pipeline_checkpoints_node_name ON pipeline_checkpoints (node_name)'
+            )
+            self._db.commit()
+        return self._db
+
+    def _get(self, key: str) -> Optional[PipelineCheckpoint]:
+        with self._db_lock:
+            row = self._get_db().execute(
+                'SELECT node_name, output, created_at FROM pipeline_checkpoints WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        node_name, output, created_at = row
+        return PipelineCheckpoint(key=key, node_name=node_name, output=pickle.loads(output), created_at=created_at)
+
+    def _set(self, checkpoint: PipelineCheckpoint) -> None:
+        output = pickle.dumps(checkpoint.output)
+        with self._db_lock:
+            db = self._get_db()
+            db.execute(
+                'INSERT OR REPLACE INTO pipeline_checkpoints (key, node_name, output, created_at) VALUES (?, ?, ?, ?)',
+                (checkpoint.key, checkpoint.node_name, output, checkpoint.created_at)
+            )
+            db.commit()
+
+    def _clear(self, node_name: Optional[str]) -> None:
+        with self._db_lock:
+            db = self._get_db()
+            if node_name is None:
+                db.execute('DELETE FROM pipeline_checkpoints')
+            else:
+                db.execute('DELETE FROM pipeline_checkpoints WHERE node_name = ?', (node_name,))
+            db.commit()
+
+    async def get(self, key: str) -> Optional[PipelineCheckpoint]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, checkpoint: PipelineCheckpoint) -> None:
+        await asyncio.to_thread(self._set, checkpoint)
+
+    async def clear(self, node_name: Optional[str] = None) -> None:
+        await asyncio.to_thread(self._clear, node_name)
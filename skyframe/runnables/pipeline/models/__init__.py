@@ -1,5 +1,16 @@
 from .params import PipelineParams
+from .node import PipelineNode, PipelineNodeFunction
+from .result import NodeStatus, NodeTiming, PipelineResult
+from .stage import StageMode, PipelineStage, collect_chunks
 
 __all__ = [
     'PipelineParams',
+    'PipelineNode',
+    'PipelineNodeFunction',
+    'NodeStatus',
+    'NodeTiming',
+    'PipelineResult',
+    'StageMode',
+    'PipelineStage',
+    'collect_chunks',
 ]
@@ -0,0 +1,77 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from pydantic import BaseModel, Field, ConfigDict
+
+from ...base import Runnable
+
+PipelineNodeFunction = Callable[..., Awaitable[Any]]
+
+
+class PipelineNode(BaseModel):
+    """
+    A step of a graph pipeline. A node runs once all of its dependencies have finished, with its inputs read
+    from the pipeline context, and its output is written back to the context.
+    """
+
+    name: str
+    """ The unique name of the node. """
+
+    runnable: Union[Runnable, PipelineNodeFunction]
+    """ What the node runs. A Runnable is called with run_async(**inputs), an async function with **inputs. """
+
+    inputs: Optional[Union[List[str], Dict[str, str]]] = Field(default=None)
+    """ The context keys passed to the node as keyword arguments. A list passes each key under its own name, a
+    dict maps argument names to context keys. None passes the whole context. """
+
+    depends_on: List[str] = Field(default_factory=list)
+    """ Names of nodes that must finish before this node starts. Nodes that produce one of the inputs are
+    dependencies without being listed here. Inputs that come from a node with merge_output must list that node
+    (or a node downstream of it), since the keys a merge writes are only known once it has run. """
+
+    output_key: Optional[str] = Field(default=None)
+    """ The context key the output is written to. Defaults to the name of the node. """
+
+    merge_output: bool = Field(default=False)
+    """ Whether the items of a dict output are merged into the context instead of being written to output_key. """
+
+    timeout: Optional[float] = Field(default=None, gt=0)
+    """ Seconds the node may run. None uses the pipeline's node_timeout. """
+
+    memoize: bool = Field(default=False)
+    """ Whether the output is stored in the pipeline's checkpoint store and reused by later runs with the same
+    inputs and config. The key covers the node's runnable, its inputs and the keys of the nodes upstream of it. """
+
+    version: Optional[str] = Field(default=None)
+    """ Part of the checkpoint key. Change it to invalidate stored outputs, e.g. after changing a value a
+    function node captures in its closure. """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @property
+    def key(self) -> str:
+        """ The context key the output is written to. """
+        return self.output_key or self.name
+
+    def get_input_keys(self) -> List[str]:
+        if self.inputs is None:
+            return []
+        if isinstance(self.inputs, dict):
+            return list(self.inputs.values())
+        return list(self.inputs)
+
+    def get_inputs(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Reads the inputs of the node from the pipeline context.
+        """
+        if self.inputs is None:
+            return dict(context)
+        arguments = self.inputs if isinstance(self.inputs, dict) else {key: key for key in self.inputs}
+        missing = [key for key in arguments.values() if key not in context]
+        if missing:
+            raise KeyError(f"Inputs {missing} of pipeline node '{self.name}' are not in the pipeline context")
+        return {argument: context[key] for argument, key in arguments.items()}
+
+    async def call(self, inputs: Dict[str, Any]) -> Any:
+        if isinstance(self.runnable, Runnable):
+            return await self.runnable.run_async(**inputs)
+        return await self.runnable(**inputs)
@@ -1,5 +1,21 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
 class PipelineParams(BaseModel):
     verbose: bool = Field(default=False)
+
+    max_concurrency: Optional[int] = Field(default=None, gt=0)
+    """ The maximum number of nodes that run at the same time. None runs every ready node at once. """
+
+    node_timeout: Optional[float] = Field(default=None, gt=0)
+    """ Seconds a node may run before it fails with a timeout. Nodes can override it. None waits forever. """
+
+    fail_fast: bool = Field(default=True)
+    """ Whether a failing node cancels the nodes that are still running and raises a PipelineException.
+    If False, only the nodes that depend on the failed node are skipped and the failure is reported in the result. """
+
+    stream_buffer_size: int = Field(default=16, gt=0)
+    """ The number of items buffered between two stages of a streaming pipeline. A stage that gets this far ahead
+    of the next one waits, so a slow consumer slows down the producers instead of growing memory. """
@@ -0,0 +1,42 @@
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+NodeStatus = Literal['ok', 'cached', 'error', 'timeout', 'cancelled', 'skipped']
+
+
+class NodeTiming(BaseModel):
+    status: NodeStatus
+    """ How the node finished. 'cached' nodes reused a stored output, 'skipped' nodes never ran because a
+    dependency failed. """
+
+    started_at: Optional[float] = Field(default=None)
+    """ Seconds from the start of the pipeline until the node started running. """
+
+    queued_time: float = Field(default=0)
+    """ Seconds the node waited for a concurrency slot after its dependencies finished. """
+
+    duration: Optional[float] = Field(default=None)
+    """ Seconds the node ran. """
+
+    error: Optional[str] = Field(default=None)
+    """ The error the node failed with. """
+
+
+class PipelineResult(BaseModel):
+    context: Dict[str, Any] = Field(default_factory=dict)
+    """ The input data merged with the outputs of every node. """
+
+    outputs: Dict[str, Any] = Field(default_factory=dict)
+    """ The output of each node that succeeded, by node name. """
+
+    timings: Dict[str, NodeTiming] = Field(default_factory=dict)
+    """ The timing and status of each node, by node name. """
+
+    total_time: float = Field(default=0)
+    """ Seconds the whole pipeline ran. """
+
+    @property
+    def succeeded(self) -> bool:
+        return all(timing.status in ('ok', 'cached') for timing in self.timings.values())
+
@@ -0,0 +1,80 @@
+import inspect
+from typing import Any, Callable, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+
+from ...base import Runnable
+
+StageMode = Literal['stream', 'value', 'map']
+
+
+def collect_chunks(items: List[Any]) -> Any:
+    """
+    Combines the items of a stream into one value: strings are joined, text and audio response chunks are built
+    into a response and anything else is returned as a list.
+    """
+    from ...generators.audio.models import AudioResponse, AudioResponseChunk
+    from ...generators.text.models import TextResponse, TextResponseChunk
+
+    if items and all(isinstance(item, str) for item in items):
+        return ''.join(items)
+    if items and all(isinstance(item, TextResponseChunk) for item in items):
+        return TextResponse.from_chunks(items)
+    if items and all(isinstance(item, AudioResponseChunk) for item in items):
+        return AudioResponse.from_chunks(items)
+    return items
+
+
+class PipelineStage(BaseModel):
+    """
+    A step of a streaming pipeline. Each stage is called with the output of the stage before it.
+    """
+
+    name: str
+    """ The name of the stage. """
+
+    runnable: Union[Runnable, Callable[[Any], Any]]
+    """ What the stage runs. A Runnable is called with run_stream (if it has one and stream_output is set) or
+    run_async, a function is called directly. Either may return a value, an awaitable or an async iterator. """
+
+    mode: Optional[StageMode] = Field(default=None)
+    """ How the stage takes its input. 'stream' passes the input as an async iterator, so the stage starts while
+    the stage before it is still producing. 'value' waits for the whole input, combining a stream with collect.
+    'map' calls the stage once per input item and streams the results, dropping None.
+    None picks 'stream' for functions and for runnables whose accepts_stream_input is set, e.g. AudioGenerator,
+    and 'value' for other runnables, e.g. TextGenerator, whose run_stream takes a complete request. """
+
+    stream_output: bool = Field(default=True)
+    """ Whether a Runnable with a run_stream method is called with run_stream instead of run_async. """
+
+    collect: Callable[[List[Any]], Any] = Field(default=collect_chunks)
+    """ Combines a streamed input into one value for 'value' stages. """
+
+    buffer_size: Optional[int] = Field(default=None, gt=0)
+    """ The number of output items buffered before the stage waits for the next stage to catch up.
+    None uses the pipeline's stream_buffer_size. """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @model_validator(mode='after')
+    def resolve_mode(self) -> 'PipelineStage':
+        if self.mode is None:
+            accepts_stream = not isinstance(self.runnable, Runnable) or self.runnable.accepts_stream_input
+            self.mode = 'stream' if accepts_stream else 'value'
+        return self
+
+    async def call(self, value: Any) -> Any:
+        """
+        Calls the stage with one input and returns its output, which is an async iterator for streaming stages.
+        """
+        if isinstance(self.runnable, Runnable):
+            if self.stream_output and hasattr(self.runnable, 'run_stream'):
+                output = self.runnable.run_stream(value)
+            else:
+                output = self.runnable.run_async(value)
+        else:
+            output = self.runnable(value)
+
+        if inspect.isawaitable(output):
+            output = await output
+        return output
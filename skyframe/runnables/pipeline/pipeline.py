@@ -1,22 +1,444 @@
-from typing import Any, List
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Union
 
 from pydantic import Field
 
+from skyframe.exceptions import PipelineException
+from skyframe.utils import logger
+from .checkpoints import BasePipelineCheckpointStore, PipelineCheckpoint, fingerprint_runnable, get_node_key
+from .models.node import PipelineNode, PipelineNodeFunction
 from .models.params import PipelineParams
+from .models.result import NodeTiming, PipelineResult
+from .models.stage import PipelineStage, StageMode
+from .streaming import run_stages
 from ..base import Runnable
+from ..bulk import BulkInputs, BulkRun
+from ..tracing import run_scope, trace_span
 
 
 class Pipeline(Runnable):
+    """
+    Runs runnables in order, or as a graph of nodes.
+
+    Without nodes, the runnables are chained: each is called with the output of the one before it as keyword
+    arguments, and the output of the last one is returned.
+
+    With nodes, the pipeline runs as a DAG. Every node starts as soon as its dependencies have finished, so
+    independent nodes run concurrently (up to max_concurrency). Each node reads its inputs from a shared
+    context that starts as the input data, and writes its output back to it. run_async returns a PipelineResult.
+    Nodes marked memoize store their outputs in the checkpoint store, so a run that is repeated, or resumed after
+    a failure, reuses the outputs of nodes whose config and inputs have not changed.
+
+    With stages, run_stream runs the pipeline as a streaming chain, e.g. generate -> clean -> speak. Stages run
+    concurrently and pass chunks on as they are produced, through bounded buffers.
+    """
+
     pipeline_params: PipelineParams = Field(default_factory=PipelineParams)
 
     runnables: List[Runnable] = Field(default_factory=list)
 
+    nodes: List[PipelineNode] = Field(default_factory=list)
+
+    stages: List[PipelineStage] = Field(default_factory=list)
+
+    checkpoint_store: Optional[BasePipelineCheckpointStore] = Field(default=None)
+    """ Where memoized nodes store their outputs. Memoization is off without one. """
+
     def add_runnable(self, runnable: Runnable):
         self.runnables.append(runnable)
 
+    def add_node(
+            self,
+            name: str,
+            runnable: Union[Runnable, PipelineNodeFunction],
+            *,
+            inputs: Optional[Union[List[str], Dict[str, str]]] = None,
+            depends_on: Optional[List[str]] = None,
+            output_key: Optional[str] = None,
+            merge_output: bool = False,
+            timeout: Optional[float] = None,
+            memoize: bool = False,
+            version: Optional[str] = None,
+    ) -> PipelineNode:
+        """
+        Adds a node to the pipeline graph. See PipelineNode for the parameters.
+
+        :return: The added node.
+        """
+        if any(node.name == name for node in self.nodes):
+            raise ValueError(f"Pipeline already has a node named '{name}'")
+
+        node = PipelineNode(
+            name=name,
+            runnable=runnable,
+            inputs=inputs,
+            depends_on=depends_on or [],
+            output_key=output_key,
+            merge_output=merge_output,
+            timeout=timeout,
+            memoize=memoize,
+            version=version,
+        )
+        self.nodes.append(node)
+        return node
+
+    def add_stage(
+            self,
+            name: str,
+            runnable: Union[Runnable, Callable[[Any], Any]],
+            *,
+            mode: Optional[StageMode] = None,
+            stream_output: bool = True,
+            collect: Optional[Callable[[List[Any]], Any]] = None,
+            buffer_size: Optional[int] = None,
+    ) -> PipelineStage:
+        """
+        Adds a stage to the streaming chain. See PipelineStage for the parameters.
+
+        :return: The added stage.
+        """
+        stage = PipelineStage(
+            name=name,
+            runnable=runnable,
+            mode=mode,
+            stream_output=stream_output,
+            buffer_size=buffer_size,
+            **({'collect': collect} if collect is not None else {}),
+        )
+        self.stages.append(stage)
+        return stage
+
+    def get_producers(self) -> Dict[str, str]:
+        """
+        Returns the name of the node that writes each context key, for nodes that do not merge their output.
+        """
+        producers: Dict[str, str] = {}
+        for node in self.nodes:
+            if not node.merge_output:
+                if node.key in producers:
+                    raise ValueError(f"Nodes '{producers[node.key]}' and '{node.name}' both write to '{node.key}'")
+                producers[node.key] = node.name
+        return producers
+
+    def get_dependencies(self) -> Dict[str, Set[str]]:
+        """
+        Returns the names of the nodes each node depends on, listed or through its inputs.
+        Raises a ValueError if a dependency does not exist or the graph has a cycle.
+        """
+        producers = self.get_producers()
+        names = {node.name for node in self.nodes}
+        dependencies: Dict[str, Set[str]] = {}
+        for node in self.nodes:
+            unknown = [name for name in node.depends_on if name not in names]
+            if unknown:
+                raise ValueError(f"Node '{node.name}' depends on unknown nodes {unknown}")
+            node_dependencies = set(node.depends_on)
+            for key in node.get_input_keys():
+                producer = producers.get(key)
+                if producer is not None and producer != node.name:
+                    node_dependencies.add(producer)
+            dependencies[node.name] = node_dependencies
+
+        # Kahn's algorithm. Nodes left over are part of a cycle.
+        remaining = {name: set(node_dependencies) for name, node_dependencies in dependencies.items()}
+        ready = [name for name, node_dependencies in remaining.items() if not node_dependencies]
+        while ready:
+            name = ready.pop()
+            del remaining[name]
+            for other, node_dependencies in remaining.items():
+                if name in node_dependencies:
+                    node_dependencies.discard(name)
+                    if not node_dependencies:
+                        ready.append(other)
+        if remaining:
+            raise ValueError(f"Pipeline graph has a cycle between nodes {sorted(remaining)}")
+
+        return dependencies
+
+    def validate_inputs(self, data: Dict[str, Any], dependencies: Dict[str, Set[str]]) -> None:
+        """
+        Checks that every input of every node is in the data the pipeline runs with or written by a node.
+        Raises a ValueError otherwise.
+
+        Keys written by a node with merge_output are only known once it has run, so an input that is neither in
+        the data nor written by a node is accepted if the node depends on a merging node, directly or through
+        other nodes.
+
+        :param data: The data the pipeline runs with.
+        :param dependencies: The dependencies of each node, as returned by get_dependencies.
+        """
+        producers = self.get_producers()
+        merging = {node.name for node in self.nodes if node.merge_output}
+
+        def get_upstream(name: str) -> Set[str]:
+            upstream: Set[str] = set()
+            pending = list(dependencies[name])
+            while pending:
+                other = pending.pop()
+                if other not in upstream:
+                    upstream.add(other)
+                    pending.extend(dependencies[other])
+            return upstream
+
+        for node in self.nodes:
+            missing = [key for key in node.get_input_keys() if key not in data and key not in producers]
+            if missing and not get_upstream(node.name) & merging:
+                raise ValueError(
+                    f"Inputs {missing} of node '{node.name}' are not in the pipeline data and no node writes them. "
+                    f"If a node with merge_output writes them, add it to the depends_on of '{node.name}'."
+                )
+
+    @run_scope
     async def run_async(self, **data) -> Any:
-        cur_data = data
+        if not self.nodes:
+            return await self._run_chain(data)
+
+        run_ctx = self._begin_run(data=data)
+        await self._invoke_callback_async('on_pipeline_start', pipeline=self, **run_ctx)
+        try:
+            result = await self._run_graph(data)
+        except BaseException as e:
+            await self._invoke_callback_async('on_pipeline_error', pipeline=self, error=e, **run_ctx)
+            raise
+        await self._invoke_callback_async('on_pipeline_end', pipeline=self, response=result, **run_ctx)
+        return result
+
+    def run_stream(self, request: Any) -> AsyncIterator[Any]:
+        """
+        Runs the stages as a streaming chain.
+
+        Errors raised by a stage are raised to the consumer as a PipelineException once the items before them
+        have been yielded. Stopping iteration early cancels every stage.
 
+        For example, to speak a response while it is being generated:
+
+            pipeline.add_stage('generate', text_generator)
+            pipeline.add_stage('clean', lambda chunk: chunk.content or None, mode='map')
+            pipeline.add_stage('speak', audio_generator)
+            async for audio_chunk in pipeline.run_stream(messages):
+                ...
+
+        The text generator gets the whole request (its stage defaults to 'value'), the clean stage turns each
+        text chunk into a string and drops empty ones, and the audio generator speaks the strings as they arrive
+        (its stage defaults to 'stream').
+
+        :param request: The input of the first stage. A value or an async iterator.
+        :return: An iterator over the output of the last stage. A value output is yielded once.
+        """
+        if not self.stages:
+            raise ValueError("Pipeline has no stages to stream")
+        return run_stages(self.stages, request, self.pipeline_params.stream_buffer_size)
+
+    def run_many(
+            self,
+            inputs: BulkInputs,
+            *,
+            concurrency: int = 8,
+            ordered: bool = False,
+            max_retries: int = 0,
+            retry_backoff: float = 0.5,
+    ) -> BulkRun:
+        """
+        Runs the pipeline for every input, with at most concurrency runs in flight. Each input is a dict of the
+        data to run the pipeline with. See Runnable.map_async.
+
+        :return: An async iterable of a BulkItemResult per input. Its stats are set once iteration has finished.
+        """
+        return self.map_async(
+            inputs,
+            concurrency=concurrency,
+            ordered=ordered,
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+        )
+
+    async def _run_chain(self, data: Dict[str, Any]) -> Any:
+        cur_data = data
         for runnable in self.runnables:
             cur_data = await runnable.run_async(**cur_data)
-        return data
+        return cur_data
+
+    async def clear_checkpoints(self, node_name: Optional[str] = None) -> None:
+        """
+        Removes the stored outputs of a node, or of every node if node_name is None.
+        """
+        if self.checkpoint_store is not None:
+            await self.checkpoint_store.clear(node_name)
+
+    def _get_checkpoint_key(
+            self,
+            node: PipelineNode,
+            context: Dict[str, Any],
+            dependencies: Set[str],
+            producers: Dict[str, str],
+            keys: Dict[str, str],
+    ) -> str:
+        # Inputs written by a memoized node are identified by that node's key instead of their value, so the
+        # key of a node changes with the config of anything upstream of it, and only then.
+        nodes = {other.name: other for other in self.nodes}
+        inputs = {}
+        for argument, value in node.get_inputs(context).items():
+            context_key = node.inputs.get(argument, argument) if isinstance(node.inputs, dict) else argument
+            producer = producers.get(context_key)
+            if producer is not None and producer != node.name and nodes[producer].memoize:
+                inputs[argument] = {'node': producer}
+            else:
+                inputs[argument] = value
+
+        return get_node_key(
+            node.name,
+            node.version,
+            {'runnable': fingerprint_runnable(node.runnable), 'upstream': sorted(keys[name] for name in dependencies)},
+            inputs,
+        )
+
+    async def _get_checkpoint(self, node: PipelineNode, checkpoint_key: str) -> Optional[PipelineCheckpoint]:
+        try:
+            return await self.checkpoint_store.get(checkpoint_key)
+        except Exception as e:
+            logger.warning(f"Failed to read the checkpoint of pipeline node '{node.name}': {e}")
+            return None
+
+    async def _set_checkpoint(self, node: PipelineNode, checkpoint_key: str, output: Any) -> None:
+        try:
+            await self.checkpoint_store.set(PipelineCheckpoint(key=checkpoint_key, node_name=node.name, output=output))
+        except Exception as e:
+            logger.warning(f"Failed to write the checkpoint of pipeline node '{node.name}': {e}")
+
+    async def _run_node(
+            self,
+            node: PipelineNode,
+            inputs: Dict[str, Any],
+            semaphore: Optional[asyncio.Semaphore],
+            timing: NodeTiming,
+            pipeline_start: float,
+            checkpoint_key: Optional[str] = None,
+    ) -> Any:
+        queued_at = time.perf_counter()
+        memoize = checkpoint_key is not None and node.memoize
+        if memoize:
+            checkpoint = await self._get_checkpoint(node, checkpoint_key)
+            if checkpoint is not None:
+                timing.status = 'cached'
+                timing.started_at = queued_at - pipeline_start
+                timing.duration = time.perf_counter() - queued_at
+                return checkpoint.output
+
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            start = time.perf_counter()
+            timing.queued_time = start - queued_at
+            timing.started_at = start - pipeline_start
+            timeout = node.timeout or self.pipeline_params.node_timeout
+            try:
+                with trace_span('pipeline_node', **{'skyframe.pipeline.node': node.name}):
+                    if timeout is not None:
+                        output = await asyncio.wait_for(node.call(inputs), timeout)
+                    else:
+                        output = await node.call(inputs)
+            finally:
+                timing.duration = time.perf_counter() - start
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+        if memoize:
+            await self._set_checkpoint(node, checkpoint_key, output)
+        return output
+
+    async def _run_graph(self, data: Dict[str, Any]) -> PipelineResult:
+        dependencies = self.get_dependencies()
+        self.validate_inputs(data, dependencies)
+        producers = self.get_producers()
+        nodes = {node.name: node for node in self.nodes}
+        checkpoint_keys: Dict[str, str] = {}
+        use_checkpoints = self.checkpoint_store is not None and any(node.memoize for node in self.nodes)
+        max_concurrency = self.pipeline_params.max_concurrency
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+
+        result = PipelineResult(context=dict(data))
+        context = result.context
+        finished: Set[str] = set()
+        failed: Set[str] = set()
+        running: Dict[asyncio.Task, str] = {}
+        start = time.perf_counter()
+
+        async def start_node(node: PipelineNode, timing: NodeTiming) -> Any:
+            # Inputs are read in the node's task, so a missing input fails the node instead of the scheduler.
+            inputs = node.get_inputs(context)
+            checkpoint_key = None
+            if use_checkpoints:
+                checkpoint_key = self._get_checkpoint_key(
+                    node, context, dependencies[node.name], producers, checkpoint_keys
+                )
+                checkpoint_keys[node.name] = checkpoint_key
+            return await self._run_node(node, inputs, semaphore, timing, start, checkpoint_key)
+
+        def skip_dependents() -> None:
+            # Skipping a node can make its own dependents skippable, so repeat until nothing changes.
+            changed = True
+            while changed:
+                changed = False
+                for name, node_dependencies in dependencies.items():
+                    if name not in finished and name not in failed and node_dependencies & failed:
+                        result.timings[name] = NodeTiming(status='skipped')
+                        failed.add(name)
+                        changed = True
+
+        try:
+            while True:
+                started = set(running.values())
+                for name, node_dependencies in dependencies.items():
+                    if name in finished or name in failed or name in started:
+                        continue
+                    if node_dependencies <= finished:
+                        node = nodes[name]
+                        timing = NodeTiming(status='ok')
+                        result.timings[name] = timing
+                        running[asyncio.ensure_future(start_node(node, timing))] = name
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    node = nodes[name]
+                    timing = result.timings[name]
+                    error = task.exception() if not task.cancelled() else asyncio.CancelledError()
+                    if error is None:
+                        output = task.result()
+                        result.outputs[name] = output
+                        if node.merge_output and isinstance(output, dict):
+                            context.update(output)
+                        else:
+                            context[node.key] = output
+                        finished.add(name)
+                        continue
+
+                    timing.status = 'timeout' if isinstance(error, asyncio.TimeoutError) else 'error'
+                    timing.error = f'{type(error).__name__}: {error}'
+                    failed.add(name)
+                    if self.pipeline_params.fail_fast:
+                        raise PipelineException(
+                            message=f"Pipeline node '{name}' failed: {timing.error}",
+                            node_name=name,
+                            inner_exception=error,
+                        ) from error
+                    logger.warning(f"Pipeline node '{name}' failed: {timing.error}. Skipping the nodes that depend on it.")
+                    skip_dependents()
+        finally:
+            # Reached with tasks still running only if a node failed with fail_fast or the pipeline was cancelled.
+            for task, name in running.items():
+                task.cancel()
+                result.timings[name].status = 'cancelled'
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            result.total_time = time.perf_counter() - start
+
+        if self.pipeline_params.verbose:
+            for name, timing in result.timings.items():
+                logger.info(f"Pipeline node '{name}': {timing.status} in {timing.duration or 0:.3f}s (queued {timing.queued_time:.3f}s)")
+        return result
@@ -0,0 +1,149 @@
+import asyncio
+from typing import Any, AsyncIterator, List, Optional
+
+from skyframe.exceptions import PipelineException
+from .models.stage import PipelineStage
+from ..generators.resilience import aclose_stream
+
+_END = object()
+
+
+class _Failure:
+    def __init__(self, error: PipelineException):
+        self.error = error
+
+
+def _is_stream(value: Any) -> bool:
+    return hasattr(value, '__aiter__')
+
+
+class _Link:
+    """
+    The bounded buffer between two stages. The producer decides whether it carries one value or a stream.
+    """
+
+    def __init__(self, size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(size)
+        self.is_stream: Optional[bool] = None
+        self.ready = asyncio.Event()
+
+    def open(self, is_stream: bool) -> None:
+        self.is_stream = is_stream
+        self.ready.set()
+
+    async def fail(self, error: PipelineException) -> None:
+        self.ready.set()
+        await self.queue.put(_Failure(error))
+
+    async def stream(self) -> AsyncIterator[Any]:
+        """
+        Iterates the items on the link. A value is a stream of one item.
+        """
+        await self.ready.wait()
+        while True:
+            item = await self.queue.get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+
+    async def get(self, stage: PipelineStage) -> Any:
+        """
+        Returns the value on the link, collecting a stream into one value with the stage's collect.
+        """
+        items = [item async for item in self.stream()]
+        if self.is_stream:
+            return stage.collect(items)
+        return items[0]
+
+
+async def _map(stage: PipelineStage, inputs: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    async for item in inputs:
+        output = await stage.call(item)
+        if _is_stream(output):
+            try:
+                async for output_item in output:
+                    if output_item is not None:
+                        yield output_item
+            finally:
+                await aclose_stream(output)
+        elif output is not None:
+            yield output
+
+
+async def _run_stage(stage: PipelineStage, inbound: _Link, outbound: _Link) -> None:
+    output = None
+    try:
+        if stage.mode == 'value':
+            output = await stage.call(await inbound.get(stage))
+        elif stage.mode == 'map':
+            output = _map(stage, inbound.stream())
+        else:
+            output = await stage.call(inbound.stream())
+
+        if _is_stream(output):
+            outbound.open(True)
+            async for item in output:
+                await outbound.queue.put(item)
+        else:
+            outbound.open(False)
+            await outbound.queue.put(output)
+        await outbound.queue.put(_END)
+    except PipelineException as e:
+        # Raised by an earlier stage and passed through this one.
+        await outbound.fail(e)
+    except Exception as e:
+        await outbound.fail(PipelineException(
+            message=f"Pipeline stage '{stage.name}' failed: {type(e).__name__}: {e}",
+            node_name=stage.name,
+            inner_exception=e,
+        ))
+    finally:
+        if _is_stream(output):
+            await aclose_stream(output)
+
+
+async def _feed(request: Any, link: _Link) -> None:
+    if not _is_stream(request):
+        link.open(False)
+        await link.queue.put(request)
+        await link.queue.put(_END)
+        return
+
+    link.open(True)
+    try:
+        async for item in request:
+            await link.queue.put(item)
+        await link.queue.put(_END)
+    except Exception as e:
+        await link.queue.put(_Failure(PipelineException(
+            message=f"Pipeline input failed: {type(e).__name__}: {e}",
+            inner_exception=e,
+        )))
+
+
+async def run_stages(stages: List[PipelineStage], request: Any, buffer_size: int) -> AsyncIterator[Any]:
+    """
+    Runs stages as a streaming chain. Every stage runs on its own task and hands its output to the next stage
+    through a bounded buffer, so stages overlap and a slow stage applies backpressure to the stages before it.
+
+    :param stages: The stages, in order.
+    :param request: The input of the first stage. A value or an async iterator.
+    :param buffer_size: The default buffer size between two stages.
+    :return: An iterator over the output of the last stage. A value output is yielded once.
+    """
+    links = [_Link(buffer_size)]
+    tasks = [asyncio.ensure_future(_feed(request, links[0]))]
+    for stage in stages:
+        links.append(_Link(stage.buffer_size or buffer_size))
+        tasks.append(asyncio.ensure_future(_run_stage(stage, links[-2], links[-1])))
+
+    try:
+        async for item in links[-1].stream():
+            yield item
+    finally:
+        # Stops every stage once the consumer is done, including when it stops early.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -4,6 +4,7 @@ from typing import List
 from .base import BasePostProcessor, TInput
 from skyframe.models.message import Message
 from ..generators.text.models import TextResponse
+from ..generators.text.stop_predicates import StopPredicate, stop_after_matches
 
 
 class CommaSeperatedListPostProcessor(BasePostProcessor[str]):
@@ -36,6 +37,14 @@ class NumberedListPostProcessor(BasePostProcessor[str]):
             "For example: \n\n1. foo\n\n2. bar\n\n3. baz"
         )
 
+    @staticmethod
+    def get_stop_predicate(max_items: int) -> StopPredicate:
+        """
+        Returns a predicate for TextGenerator.run_stream that stops the stream once max_items items are complete.
+        An item is complete once the line it is on ends.
+        """
+        return stop_after_matches(r"\d+\.\s[^\n]+\n", max_items)
+
     async def run_async(self, generator_output: TInput) -> List[str]:
         return self.run(generator_output)
 
@@ -57,6 +66,14 @@ class MarkdownListPostProcessor(BasePostProcessor[str]):
     def get_generator_instructions_str(self) -> str:
         return "Your response should be a markdown list, " "eg: `- foo\n- bar\n- baz`"
 
+    @staticmethod
+    def get_stop_predicate(max_items: int) -> StopPredicate:
+        """
+        Returns a predicate for TextGenerator.run_stream that stops the stream once max_items items are complete.
+        An item is complete once the line it is on ends.
+        """
+        return stop_after_matches(r"^\s*[-*]\s[^\n]+\n", max_items, re.MULTILINE)
+
     async def run_async(self, generator_output: TInput) -> List[str]:
         return self.run(generator_output)
 
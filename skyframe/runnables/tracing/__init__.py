@@ -0,0 +1,50 @@
+from typing import Optional
+
+from .context import current_run_id, trace_span, run_scope
+from .span import Span, SpanStatus
+from .exporters import BaseSpanExporter, OtlpJsonFileExporter, OtlpHttpExporter
+from .tracer import TracingCallback, create_span_exporter
+
+_tracer: Optional[TracingCallback] = None
+_tracer_loaded = False
+
+
+def get_tracer() -> Optional[TracingCallback]:
+    """
+    Returns the process-wide tracer every run reports to, or None if tracing is disabled.
+    The tracer is created from the tracing settings on first use.
+    """
+    global _tracer, _tracer_loaded
+    if not _tracer_loaded:
+        from skyframe.settings import framework_settings
+
+        settings = framework_settings.runnables.tracing
+        if settings.enabled:
+            _tracer = TracingCallback(exporter=create_span_exporter(), batch_size=settings.batch_size)
+        _tracer_loaded = True
+    return _tracer
+
+
+def set_tracer(tracer: Optional[TracingCallback]) -> None:
+    """
+    Sets the process-wide tracer, overriding the tracing settings. Pass None to disable tracing.
+    """
+    global _tracer, _tracer_loaded
+    _tracer = tracer
+    _tracer_loaded = True
+
+
+__all__ = [
+    "current_run_id",
+    "trace_span",
+    "run_scope",
+    "Span",
+    "SpanStatus",
+    "BaseSpanExporter",
+    "OtlpJsonFileExporter",
+    "OtlpHttpExporter",
+    "TracingCallback",
+    "create_span_exporter",
+    "get_tracer",
+    "set_tracer",
+]
@@ -0,0 +1,98 @@
+import functools
+import inspect
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional, TypeVar
+from uuid import UUID, uuid4
+
+TCallable = TypeVar('TCallable', bound=Callable)
+
+current_run_id: ContextVar[Optional[UUID]] = ContextVar('skyframe_current_run_id', default=None)
+""" The run that is currently executing. Runs started without an explicit parent_run_id are nested under it. """
+
+
+@contextmanager
+def trace_span(name: str, **attributes: Any) -> Iterator[UUID]:
+    """
+    Opens a span for a block of code that is not a run itself, e.g. memory summarization. Runs started inside
+    the block are nested under the span.
+
+    :param name: The name of the span.
+    :param attributes: Attributes to set on the span.
+    :return: The run id of the span.
+    """
+    from . import get_tracer
+
+    run_id = uuid4()
+    parent_run_id = current_run_id.get()
+    tracer = get_tracer()
+    if tracer is not None:
+        tracer.start_span(name, run_id, parent_run_id, attributes)
+
+    token = current_run_id.set(run_id)
+    try:
+        yield run_id
+    except BaseException as e:
+        if tracer is not None:
+            tracer.end_span(run_id, error=e)
+        raise
+    else:
+        if tracer is not None:
+            tracer.end_span(run_id)
+    finally:
+        current_run_id.reset(token)
+
+
+def run_scope(method: TCallable) -> TCallable:
+    """
+    Decorates the methods of a runnable that start a run with _begin_run.
+
+    The run is the current run only while the method executes. current_run_id is reset when the method returns
+    or raises, so a run that fails before its end or error callbacks does not become the parent of later runs.
+    For async generators the caller's run is also restored while the caller handles each item.
+    """
+    if inspect.isasyncgenfunction(method):
+        @functools.wraps(method)
+        async def generator_wrapper(*args, **kwargs):
+            generator = method(*args, **kwargs)
+            run_id = current_run_id.get()
+            try:
+                while True:
+                    token = current_run_id.set(run_id)
+                    try:
+                        item = await generator.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    finally:
+                        run_id = current_run_id.get()
+                        current_run_id.reset(token)
+                    yield item
+            finally:
+                token = current_run_id.set(run_id)
+                try:
+                    await generator.aclose()
+                finally:
+                    current_run_id.reset(token)
+
+        return generator_wrapper
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def coroutine_wrapper(*args, **kwargs):
+            token = current_run_id.set(current_run_id.get())
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                current_run_id.reset(token)
+
+        return coroutine_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        token = current_run_id.set(current_run_id.get())
+        try:
+            return method(*args, **kwargs)
+        finally:
+            current_run_id.reset(token)
+
+    return wrapper
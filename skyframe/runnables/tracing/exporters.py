@@ -0,0 +1,90 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .span import Span, to_otlp_attributes
+
+SCOPE_NAME = 'skyframe'
+
+
+def to_otlp_request(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """
+    Wraps spans in an OTLP ExportTraceServiceRequest, the JSON body an OTLP/HTTP collector accepts.
+    """
+    return {
+        'resourceSpans': [{
+            'resource': {'attributes': to_otlp_attributes({'service.name': service_name})},
+            'scopeSpans': [{
+                'scope': {'name': SCOPE_NAME},
+                'spans': [span.to_otlp() for span in spans],
+            }],
+        }]
+    }
+
+
+class BaseSpanExporter(ABC):
+    def __init__(self, service_name: str = 'skyframe'):
+        self.service_name = service_name
+
+    @abstractmethod
+    async def export(self, spans: List[Span]) -> None:
+        """ Exports a batch of finished spans. """
+
+    async def shutdown(self) -> None:
+        """ Releases the resources of the exporter. """
+
+
+class OtlpJsonFileExporter(BaseSpanExporter):
+    """
+    Appends each batch of spans to a file as one line of OTLP JSON, the format of the OpenTelemetry collector's
+    file exporter. The file can be replayed into a collector or read directly.
+    """
+
+    def __init__(self, path: str, service_name: str = 'skyframe'):
+        super().__init__(service_name)
+        self.path = Path(path)
+
+    def _write(self, line: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(line + '\n')
+
+    async def export(self, spans: List[Span]) -> None:
+        line = json.dumps(to_otlp_request(spans, self.service_name), separators=(',', ':'))
+        await asyncio.to_thread(self._write, line)
+
+
+class OtlpHttpExporter(BaseSpanExporter):
+    """
+    Posts each batch of spans as OTLP JSON to an OTLP/HTTP traces endpoint, e.g. a local OpenTelemetry collector.
+    """
+
+    def __init__(
+            self,
+            endpoint: str = 'http://localhost:4318/v1/traces',
+            headers: Optional[Dict[str, str]] = None,
+            service_name: str = 'skyframe',
+    ):
+        super().__init__(service_name)
+        self.endpoint = endpoint
+        self.headers = {'Content-Type': 'application/json', **(headers or {})}
+        self._client = None
+
+    async def export(self, spans: List[Span]) -> None:
+        import httpx
+
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=10)
+        response = await self._client.post(
+            self.endpoint,
+            content=json.dumps(to_otlp_request(spans, self.service_name)),
+            headers=self.headers,
+        )
+        response.raise_for_status()
+
+    async def shutdown(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
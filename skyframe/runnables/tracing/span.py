@@ -0,0 +1,102 @@
+import time
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+SpanStatus = Literal['unset', 'ok', 'error']
+
+_OTLP_STATUS_CODES = {'unset': 0, 'ok': 1, 'error': 2}
+_OTLP_SPAN_KIND_INTERNAL = 1
+
+
+def _to_otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        # OTLP JSON encodes 64 bit integers as strings.
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    if isinstance(value, (list, tuple)):
+        return {'arrayValue': {'values': [_to_otlp_value(item) for item in value]}}
+    return {'stringValue': str(value)}
+
+
+def to_otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {'key': key, 'value': _to_otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+class Span(BaseModel):
+    """
+    A timed step of a trace. Every run is one span; its span id is derived from the run id.
+    """
+
+    trace_id: str
+    """ 32 hex characters identifying the trace. """
+
+    span_id: str
+    """ 16 hex characters identifying the span. """
+
+    parent_span_id: Optional[str] = Field(default=None)
+    """ The span id of the parent span, None for the root span of a trace. """
+
+    name: str
+    """ What the span measures, e.g. 'text_generation' or 'agent_generation'. """
+
+    start_time_ns: int = Field(default_factory=time.time_ns)
+    """ The Unix time in nanoseconds when the span started. """
+
+    end_time_ns: Optional[int] = Field(default=None)
+    """ The Unix time in nanoseconds when the span ended. """
+
+    attributes: Dict[str, Any] = Field(default_factory=dict)
+    """ Details of the step, e.g. the model, token counts, cost and time to first token. """
+
+    status: SpanStatus = Field(default='unset')
+    """ Whether the step succeeded. """
+
+    status_message: Optional[str] = Field(default=None)
+    """ The error message if the step failed. """
+
+    @property
+    def duration(self) -> Optional[float]:
+        """ The duration of the span in seconds, or None while it is running. """
+        if self.end_time_ns is None:
+            return None
+        return (self.end_time_ns - self.start_time_ns) / 1e9
+
+    def end(self, error: Optional[BaseException] = None, abandoned: bool = False) -> None:
+        self.end_time_ns = time.time_ns()
+        if error is not None:
+            self.status = 'error'
+            self.status_message = f'{type(error).__name__}: {error}'
+        elif abandoned:
+            # Stopped by the caller before it finished, which is neither a success nor a failure of the step.
+            self.status = 'unset'
+            self.status_message = 'abandoned'
+        else:
+            self.status = 'ok'
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """
+        Returns the span in the OTLP JSON encoding.
+        """
+        span: Dict[str, Any] = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': _OTLP_SPAN_KIND_INTERNAL,
+            'startTimeUnixNano': str(self.start_time_ns),
+            'endTimeUnixNano': str(self.end_time_ns or self.start_time_ns),
+            'attributes': to_otlp_attributes(self.attributes),
+            'status': {'code': _OTLP_STATUS_CODES[self.status]},
+        }
+        if self.parent_span_id is not None:
+            span['parentSpanId'] = self.parent_span_id
+        if self.status_message is not None:
+            span['status']['message'] = self.status_message
+        return span
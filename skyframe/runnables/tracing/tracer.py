@@ -0,0 +1,208 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Set
+from uuid import UUID
+
+from pydantic import PrivateAttr
+
+from skyframe.utils import logger
+from ..models.callback import BaseAsyncCallback
+from .exporters import BaseSpanExporter
+from .span import Span
+
+
+def _get_span_name(callback_name: str) -> str:
+    name = callback_name.removeprefix('on_')
+    for suffix in ('_start', '_end', '_error'):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def _get_start_attributes(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    attributes: Dict[str, Any] = {}
+
+    generator = kwargs.get('generator') or kwargs.get('runnable')
+    service_name = getattr(generator, 'service_name', None)
+    if service_name is not None:
+        attributes['skyframe.service'] = service_name
+
+    generation_params = kwargs.get('generation_params')
+    model = getattr(generation_params, 'model', None)
+    if model is not None:
+        attributes['gen_ai.request.model'] = model
+
+    agent = kwargs.get('agent')
+    if agent is not None:
+        attributes['skyframe.agent'] = type(agent).__name__
+
+    if kwargs.get('batch'):
+        attributes['skyframe.batch'] = True
+    if kwargs.get('eval_run'):
+        attributes['skyframe.eval_run'] = True
+    return attributes
+
+
+def _get_end_attributes(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    attributes: Dict[str, Any] = {}
+    if kwargs.get('abandoned'):
+        attributes['skyframe.abandoned'] = True
+
+    response = kwargs.get('response')
+
+    model = getattr(response, 'model', None)
+    if model is not None:
+        attributes['gen_ai.response.model'] = model
+
+    usage = getattr(response, 'token_usage', None)
+    if usage is not None:
+        attributes['gen_ai.usage.input_tokens'] = usage.prompt
+        attributes['gen_ai.usage.output_tokens'] = usage.completion
+        attributes['skyframe.usage.cache_read_tokens'] = usage.cache_read
+        attributes['skyframe.usage.cache_write_tokens'] = usage.cache_write
+        attributes['skyframe.cost.total'] = usage.total_cost
+
+    cache_hit = kwargs.get('cache_hit', getattr(response, 'cache_hit', None))
+    if cache_hit is not None:
+        attributes['skyframe.cache_hit'] = bool(cache_hit)
+
+    timings = kwargs.get('timings') or getattr(response, 'timings', None)
+    if timings is not None:
+        attributes['skyframe.stream.time_to_first_token'] = timings.time_to_first_token
+        attributes['skyframe.stream.total_time'] = timings.total_time
+        attributes['skyframe.stream.chunk_count'] = timings.chunk_count
+        attributes['skyframe.stream.tokens_per_second'] = timings.tokens_per_second
+    return attributes
+
+
+class TracingCallback(BaseAsyncCallback):
+    """
+    Turns runs into spans. Every start event opens a span keyed by the run id, nested under the span of the
+    parent run, and the matching end or error event closes it. Finished spans are buffered and exported in
+    batches; call flush() before the process exits to export the rest.
+
+    Spans of one trace share the trace id of the root run, so a nested agent turn (memory summarization,
+    generation, speech) is exported as one tree.
+    """
+
+    exporter: Any
+    """ The BaseSpanExporter finished spans are exported to. """
+
+    batch_size: int = 64
+    """ The number of finished spans that are buffered before they are exported. """
+
+    _spans: Dict[UUID, Span] = PrivateAttr(default_factory=dict)
+    _finished: List[Span] = PrivateAttr(default_factory=list)
+    _exports: Set[asyncio.Task] = PrivateAttr(default_factory=set)
+
+    def start_span(
+            self,
+            name: str,
+            run_id: UUID,
+            parent_run_id: Optional[UUID] = None,
+            attributes: Optional[Dict[str, Any]] = None,
+    ) -> Span:
+        """
+        Opens the span of a run.
+
+        :param name: The name of the span.
+        :param run_id: The run the span measures.
+        :param parent_run_id: The run the run was started in, if any.
+        :param attributes: Attributes to set on the span.
+        :return: The opened span.
+        """
+        parent = self._spans.get(parent_run_id) if parent_run_id is not None else None
+        if parent is not None:
+            trace_id = parent.trace_id
+        else:
+            # A parent that is not traced by this callback still groups its children into one trace.
+            trace_id = (parent_run_id or run_id).hex
+
+        span = Span(
+            trace_id=trace_id,
+            span_id=run_id.hex[:16],
+            parent_span_id=parent_run_id.hex[:16] if parent_run_id is not None else None,
+            name=name,
+            attributes=attributes or {},
+        )
+        self._spans[run_id] = span
+        return span
+
+    def end_span(
+            self,
+            run_id: UUID,
+            attributes: Optional[Dict[str, Any]] = None,
+            error: Optional[BaseException] = None,
+            abandoned: bool = False,
+    ) -> Optional[Span]:
+        """
+        Closes the span of a run and queues it for export.
+
+        :param run_id: The run the span measures.
+        :param attributes: Attributes to add to the span.
+        :param error: The error the run failed with, if it failed.
+        :param abandoned: Whether the caller stopped the run before it finished, e.g. by abandoning a stream.
+        :return: The closed span, or None if no span is open for the run.
+        """
+        span = self._spans.pop(run_id, None)
+        if span is None:
+            return None
+        if attributes:
+            span.attributes.update(attributes)
+        span.end(error, abandoned)
+
+        self._finished.append(span)
+        if len(self._finished) >= self.batch_size:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                task = loop.create_task(self._export(self._take_finished()))
+                self._exports.add(task)
+                task.add_done_callback(self._exports.discard)
+        return span
+
+    def _take_finished(self) -> List[Span]:
+        spans, self._finished = self._finished, []
+        return spans
+
+    async def _export(self, spans: List[Span]) -> None:
+        try:
+            await self.exporter.export(spans)
+        except Exception as e:
+            logger.exception(f"Error exporting {len(spans)} spans with {type(self.exporter).__name__}: {e}")
+
+    async def flush(self) -> None:
+        """
+        Exports every finished span and waits for exports that are in progress.
+        """
+        if self._finished:
+            await self._export(self._take_finished())
+        if self._exports:
+            await asyncio.gather(*self._exports)
+
+    async def shutdown(self) -> None:
+        await self.flush()
+        await self.exporter.shutdown()
+
+    async def on_any_start(self, callback_name: str, info, *, runnable=None, **kwargs) -> Any:
+        self.start_span(_get_span_name(callback_name), info.run_id, info.parent_run_id, _get_start_attributes(kwargs))
+
+    async def on_any_end(self, callback_name: str, info, *, runnable=None, **kwargs) -> Any:
+        self.end_span(info.run_id, _get_end_attributes(kwargs), abandoned=bool(kwargs.get('abandoned')))
+
+    async def on_any_error(self, callback_name: str, info, *, error: Exception, runnable=None, **kwargs) -> Any:
+        self.end_span(info.run_id, error=error)
+
+
+def create_span_exporter() -> BaseSpanExporter:
+    """
+    Creates the span exporter configured in the tracing settings.
+    """
+    from skyframe.settings import framework_settings
+    from .exporters import OtlpHttpExporter, OtlpJsonFileExporter
+
+    settings = framework_settings.runnables.tracing
+    if settings.exporter == 'otlp_http':
+        return OtlpHttpExporter(settings.endpoint, settings.headers, settings.service_name)
+    return OtlpJsonFileExporter(settings.file_path, settings.service_name)
@@ -1,7 +1,6 @@
 from pathlib import Path
 from typing import Dict, Any
 
-import yaml
 from pydantic import Field
 from pydantic_settings import BaseSettings
 from .prompting import PromptingSettings
@@ -25,6 +24,7 @@ class SkyFrameworkSettings(BaseSettings):
 
         data: Dict[str, Any] = {}
         if path.exists():
+            import yaml
             with open(path, 'r') as file:
                 data = yaml.safe_load(file)
         else:
@@ -40,6 +40,7 @@ class SkyFrameworkSettings(BaseSettings):
 
         data: Dict[str, Any] = {}
         if path.exists():
+            import yaml
             with open(path, 'r') as file:
                 data = yaml.safe_load(file)
 
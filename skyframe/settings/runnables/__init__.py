@@ -2,13 +2,17 @@ from pydantic import Field
 from pydantic_settings import BaseSettings
 
 from .agents import AgentSettings
+from .callbacks import CallbackSettings
 from .classifiers import ClassifierSettings
 from .post_processors import PostProcessorSettings
 from .generators import GeneratorSettings
+from .tracing import TracingSettings
 
 
 class RunnableSettings(BaseSettings):
     agents: AgentSettings = Field(default_factory=AgentSettings)
+    callbacks: CallbackSettings = Field(default_factory=CallbackSettings)
     classifiers: ClassifierSettings = Field(default_factory=ClassifierSettings)
     post_processors: PostProcessorSettings = Field(default_factory=PostProcessorSettings)
     generators: GeneratorSettings = Field(default_factory=GeneratorSettings)
+    tracing: TracingSettings = Field(default_factory=TracingSettings)
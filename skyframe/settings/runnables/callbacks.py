@@ -0,0 +1,23 @@
+from typing import Literal, Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+CallbackOverflow = Literal['block', 'drop_oldest', 'coalesce_chunks']
+
+
+class CallbackSettings(BaseSettings):
+    """
+    Defaults for callbacks with background delivery. A callback class can override them.
+    """
+
+    queue_size: int = Field(default=1024, gt=0)
+    """ The maximum number of events queued per callback. """
+
+    overflow: CallbackOverflow = Field(default='block')
+    """ What happens when an event is emitted while the queue is full.
+    'block' waits for room, 'drop_oldest' drops the oldest queued event, 'coalesce_chunks' keeps only the newest
+    queued chunk event per run and event name (and waits for room if there are none to coalesce). """
+
+    flush_timeout: Optional[float] = Field(default=10.0, gt=0)
+    """ Seconds an end or error event waits for the events queued before it to be delivered. None waits forever. """
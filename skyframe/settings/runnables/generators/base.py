@@ -1,5 +1,9 @@
 from typing import Any, Dict, Optional
 
+from pydantic import Field
+
+from .http_client import HttpClientSettings
+from .resilience import ResilienceSettings
 from ..base import BaseRunnableSettings
 
 
@@ -8,6 +12,8 @@ class BaseGeneratorSettings(BaseRunnableSettings):
     service_name: Optional[str] = None
     generation_params: Optional[Dict[str, Any]] = None
     services: Optional[Dict[str, Any]] = None
+    http_client: HttpClientSettings = Field(default_factory=HttpClientSettings)
+    resilience: ResilienceSettings = Field(default_factory=ResilienceSettings)
 
     def get_service_value(self, *keys: str) -> Any:
         if self.services is None:
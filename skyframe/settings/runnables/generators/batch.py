@@ -0,0 +1,22 @@
+from typing import Literal, Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class BatchSettings(BaseSettings):
+    """
+    Settings for submitting requests through a provider's batch API.
+    """
+
+    completion_window: Literal['24h'] = Field(default='24h')
+    """ The time frame within which the provider should process the batch. """
+
+    poll_interval: float = Field(default=5.0, gt=0)
+    """ Seconds to wait before the first status check. The wait doubles after every check. """
+
+    max_poll_interval: float = Field(default=60.0, gt=0)
+    """ The maximum number of seconds to wait between status checks. """
+
+    timeout: Optional[float] = Field(default=None, gt=0)
+    """ Seconds to wait for the batch to finish before it is cancelled. None waits for the completion window. """
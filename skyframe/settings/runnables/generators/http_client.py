@@ -0,0 +1,29 @@
+from typing import Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class HttpClientSettings(BaseSettings):
+    """
+    Connection pool settings for the HTTP clients shared by a generator's services.
+    """
+
+    max_connections: Optional[int] = Field(default=100, ge=1)
+    """ The maximum number of concurrent connections in the pool. None means no limit. """
+
+    max_keepalive_connections: Optional[int] = Field(default=20, ge=0)
+    """ The maximum number of idle connections kept alive in the pool. None means no limit. """
+
+    keepalive_expiry: Optional[float] = Field(default=30.0, ge=0)
+    """ Seconds an idle connection is kept alive before it is closed. """
+
+    http2: bool = Field(default=False)
+    """ Whether to negotiate HTTP/2. Requires the optional 'h2' package. """
+
+    timeout: Optional[float] = Field(default=None, gt=0)
+    """ Request timeout in seconds. None uses the SDK default. """
+
+    max_retries: Optional[int] = Field(default=None, ge=0)
+    """ Retries done by the provider SDK itself. None turns them off for the async clients, whose calls are
+    retried by the generator's resilience settings, and uses the SDK default for the sync clients. """
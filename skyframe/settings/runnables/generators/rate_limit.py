@@ -0,0 +1,40 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+from pydantic_settings import BaseSettings
+
+
+class RateLimit(BaseModel):
+    requests_per_minute: Optional[int] = Field(default=None, ge=1)
+    """ The maximum number of requests per minute. None means no limit until the provider reports one. """
+
+    tokens_per_minute: Optional[int] = Field(default=None, ge=1)
+    """ The maximum number of tokens per minute. None means no limit until the provider reports one. """
+
+
+class RateLimitSettings(BaseSettings):
+    """
+    Client-side rate limiting of requests to generation providers.
+    A limiter is shared by every generator that calls the same provider and model.
+    """
+
+    enabled: bool = Field(default=True)
+    """ Whether requests wait for the rate limiter before they are sent. """
+
+    default: RateLimit = Field(default_factory=RateLimit)
+    """ The limits used when none are configured for the provider or model. """
+
+    limits: Dict[str, RateLimit] = Field(default_factory=dict)
+    """ Limits keyed by '<provider>/<model>' or '<provider>'. The most specific key wins. """
+
+    adapt_from_headers: bool = Field(default=True)
+    """ Whether the limits and remaining budget are updated from the provider's rate limit response headers. """
+
+    default_retry_after: float = Field(default=1.0, gt=0)
+    """ Seconds to pause a limiter after a 429 response without a retry-after header. """
+
+    default_max_output_tokens: int = Field(default=1024, ge=0)
+    """ The output tokens charged up front for requests that do not set max_tokens. """
+
+    def get_limit(self, provider: str, model: str) -> RateLimit:
+        return self.limits.get(f'{provider}/{model}') or self.limits.get(provider) or self.default
@@ -0,0 +1,45 @@
+from typing import Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class ResilienceSettings(BaseSettings):
+    """
+    Retry, timeout and hedging policy for calls to a generator's services.
+    """
+
+    max_retries: int = Field(default=2, ge=0)
+    """ How many times a call that failed with a retryable error is retried. """
+
+    initial_backoff: float = Field(default=0.5, ge=0)
+    """ Seconds to wait before the first retry. """
+
+    max_backoff: float = Field(default=8.0, ge=0)
+    """ The maximum number of seconds to wait between retries. """
+
+    backoff_multiplier: float = Field(default=2.0, ge=1)
+    """ The factor the backoff grows by after every retry. """
+
+    jitter: bool = Field(default=True)
+    """ Whether to wait a random time up to the backoff (full jitter) instead of the backoff itself. """
+
+    attempt_timeout: Optional[float] = Field(default=None, gt=0)
+    """ Seconds a single attempt may take before it is abandoned and retried. For streams this covers opening
+    the stream and receiving the first chunk. None means no timeout. """
+
+    hedge: bool = Field(default=False)
+    """ Whether to send a duplicate request when an attempt is slower than usual. The first to finish wins and
+    the other is cancelled. """
+
+    hedge_delay: Optional[float] = Field(default=None, gt=0)
+    """ Seconds to wait before hedging. None uses the hedge_percentile of recent latencies. """
+
+    hedge_percentile: float = Field(default=0.95, gt=0, lt=1)
+    """ The latency percentile after which a hedge is sent when hedge_delay is not set. """
+
+    hedge_min_samples: int = Field(default=20, ge=1)
+    """ The number of latencies that must be recorded before percentile based hedging starts. """
+
+    max_hedges: int = Field(default=1, ge=1)
+    """ The maximum number of duplicate requests per attempt. """
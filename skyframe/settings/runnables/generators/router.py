@@ -0,0 +1,63 @@
+from typing import Any, List, Literal, Optional
+
+from pydantic import BaseModel, Field, field_validator
+from pydantic_settings import BaseSettings
+
+RoutingPolicy = Literal['lowest_latency', 'lowest_cost', 'weighted']
+
+
+class RouterBackend(BaseModel):
+    service_name: str
+    """ The text generation service to route to, for example 'openai'. """
+
+    model: str
+    """ The model to request from the service. """
+
+    weight: float = Field(default=1.0, ge=0)
+    """ The relative share of requests this backend gets under the weighted policy. """
+
+    latency_budget: Optional[float] = Field(default=None, gt=0)
+    """ Seconds this backend may take before the request fails over to the next one. Overrides the router's
+    latency budget. """
+
+    @property
+    def name(self) -> str:
+        return f'{self.service_name}:{self.model}'
+
+
+class RouterSettings(BaseSettings):
+    """
+    Settings for the 'router' text generation service, which spreads requests across several backends.
+    """
+
+    backends: List[RouterBackend] = Field(default_factory=list)
+    """ The backends to route between. Can be given as '<service_name>:<model>' strings. """
+
+    policy: RoutingPolicy = Field(default='lowest_latency')
+    """ How a backend is picked: lowest median latency, lowest price per token, or randomly by weight. """
+
+    latency_budget: Optional[float] = Field(default=None, gt=0)
+    """ Seconds a backend may take before the request fails over to the next one. For streams this covers the
+    time to the first chunk. None means no budget. """
+
+    window_size: int = Field(default=100, ge=1)
+    """ How many recent calls per backend the latency and error statistics are computed from. """
+
+    failure_threshold: int = Field(default=3, ge=1)
+    """ Consecutive failures after which a backend is taken out of rotation. """
+
+    cooldown_seconds: float = Field(default=30.0, ge=0)
+    """ How long a failing backend stays out of rotation before it is tried again. """
+
+    @field_validator('backends', mode='before')
+    @classmethod
+    def parse_backends(cls, value: Any) -> Any:
+        if not isinstance(value, list):
+            return value
+        backends = []
+        for backend in value:
+            if isinstance(backend, str):
+                service_name, _, model = backend.partition(':')
+                backend = {'service_name': service_name, 'model': model}
+            backends.append(backend)
+        return backends
@@ -1,5 +1,18 @@
+from typing import Optional
+
+from pydantic import Field
+
 from .base import BaseGeneratorSettings
+from .batch import BatchSettings
+from .rate_limit import RateLimitSettings
+from .router import RouterSettings
 
 
 class TextSettings(BaseGeneratorSettings):
-    pass
+    batch: BatchSettings = Field(default_factory=BatchSettings)
+    rate_limit: RateLimitSettings = Field(default_factory=RateLimitSettings)
+    router: RouterSettings = Field(default_factory=RouterSettings)
+
+    coalescing_replay_chunks: Optional[int] = Field(default=256, ge=0)
+    """ The number of chunks a coalesced stream keeps for identical requests that join late. Once a stream has more
+    chunks, identical requests start their own stream. None keeps every chunk until the stream ends. """
@@ -0,0 +1,32 @@
+from typing import Dict, Literal
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class TracingSettings(BaseSettings):
+    """
+    Process-wide tracing of runs. When enabled, every run emits a span, nested under the run it was started in.
+    """
+
+    enabled: bool = Field(default=False)
+    """ Whether runs are traced. """
+
+    exporter: Literal['file', 'otlp_http'] = Field(default='file')
+    """ Where finished spans go. 'file' appends OTLP JSON lines to file_path, 'otlp_http' posts OTLP JSON to
+    endpoint (e.g. a local OpenTelemetry collector). """
+
+    file_path: str = Field(default='traces.jsonl')
+    """ The file the 'file' exporter appends to. """
+
+    endpoint: str = Field(default='http://localhost:4318/v1/traces')
+    """ The OTLP/HTTP traces endpoint the 'otlp_http' exporter posts to. """
+
+    headers: Dict[str, str] = Field(default_factory=dict)
+    """ Extra headers for the 'otlp_http' exporter. """
+
+    service_name: str = Field(default='skyframe')
+    """ The service.name resource attribute of the exported spans. """
+
+    batch_size: int = Field(default=64, gt=0)
+    """ The number of finished spans that are buffered before they are exported. """
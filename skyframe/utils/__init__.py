@@ -1,9 +1,72 @@
-from .list import get_duplicates, get_duplicate_counts, has_index
-from .audio import audio_file_to_wav, CustomTempFile, CreateWavFile
-from .dict import find_nonexistent_keys, change_key
-from .files import get_framework_path, get_framework_data_path, get_project_path_str, get_project_path, get_parent_dir_path, get_file_path, get_file_content, get_data_path_str, get_data_path
-from .math import weighted_average
-from .stopwatch_context import StopwatchContext
-from .path import find_project_root
-from .logging import BaseSkyLogger, FrameworkLogger, logger
-from .string_manipulation import add_tab_to_each_line
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+# Imported on first access (PEP 562). The settings import find_project_root from here, while the logger
+# imports the settings, so the package must not import the logger eagerly.
+_exports = {
+    'get_duplicates': '.list',
+    'get_duplicate_counts': '.list',
+    'has_index': '.list',
+    'audio_file_to_wav': '.audio',
+    'CustomTempFile': '.audio',
+    'CreateWavFile': '.audio',
+    'find_nonexistent_keys': '.dict',
+    'change_key': '.dict',
+    'get_framework_path': '.files',
+    'get_framework_data_path': '.files',
+    'get_project_path_str': '.files',
+    'get_project_path': '.files',
+    'get_parent_dir_path': '.files',
+    'get_file_path': '.files',
+    'get_file_content': '.files',
+    'get_data_path_str': '.files',
+    'get_data_path': '.files',
+    'weighted_average': '.math',
+    'StopwatchContext': '.stopwatch_context',
+    'find_project_root': '.path',
+    'BaseSkyLogger': '.logging',
+    'FrameworkLogger': '.logging',
+    'logger': '.logging',
+    'add_tab_to_each_line': '.string_manipulation',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
+
+if TYPE_CHECKING:
+    from .list import get_duplicates, get_duplicate_counts, has_index
+    from .audio import audio_file_to_wav, CustomTempFile, CreateWavFile
+    from .dict import find_nonexistent_keys, change_key
+    from .files import get_framework_path, get_framework_data_path, get_project_path_str, get_project_path, get_parent_dir_path, get_file_path, get_file_content, get_data_path_str, get_data_path
+    from .math import weighted_average
+    from .stopwatch_context import StopwatchContext
+    from .path import find_project_root
+    from .logging import BaseSkyLogger, FrameworkLogger, logger
+    from .string_manipulation import add_tab_to_each_line
+
+__all__ = [
+    "get_duplicates",
+    "get_duplicate_counts",
+    "has_index",
+    "audio_file_to_wav",
+    "CustomTempFile",
+    "CreateWavFile",
+    "find_nonexistent_keys",
+    "change_key",
+    "get_framework_path",
+    "get_framework_data_path",
+    "get_project_path_str",
+    "get_project_path",
+    "get_parent_dir_path",
+    "get_file_path",
+    "get_file_content",
+    "get_data_path_str",
+    "get_data_path",
+    "weighted_average",
+    "StopwatchContext",
+    "find_project_root",
+    "BaseSkyLogger",
+    "FrameworkLogger",
+    "logger",
+    "add_tab_to_each_line",
+]
@@ -3,7 +3,6 @@ import logging
 import sys
 from abc import ABC
 from typing import TypeVar, Generic
-import devtools
 from skyframe.settings import framework_settings, LoggingSettings
 
 
@@ -37,6 +36,7 @@ class BaseSkyLogger(logging.Logger, ABC, Generic[TLoggingSettings]):
             # Get the caller's file and line number
             filename = frame.f_code.co_filename
 
+            import devtools
             devtools.debug(msg, **kwargs, frame_depth_=3)
 
 